@@ -3,23 +3,45 @@
 import asyncio
 import json
 import logging
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
 
 import os
 
+import httpx
+
 logger = logging.getLogger("agent_finder.app")
 
-from fastapi import FastAPI, APIRouter, File, UploadFile, HTTPException
+from fastapi import FastAPI, APIRouter, File, Form, UploadFile, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.responses import StreamingResponse
 
-from .input_handler import read_input
-from .output_handler import export_results_csv, generate_summary
-from .pipeline import run_pipeline
+from . import executors
+from .executors import ExecutorFull
+from .http_cache import transport as http_cache_transport
+from .input_handler import estimate_rows, iter_batches
+from .job_runner import TERMINAL_EVENTS, execute_job, terminal_event
+from .job_store import JobStore
+from .lookup import DEFAULT_BUDGET as DEFAULT_LOOKUP_BUDGET, MAX_BUDGET as MAX_LOOKUP_BUDGET
+from .lookup import latency as lookup_latency, lookup_agent
+from .models import AgentRow
+from .output_handler import (
+    EXPORT_FORMATS,
+    converted_path,
+    export_parquet,
+    export_xlsx,
+    gzip_chunks,
+    read_committed,
+    read_file,
+)
+from .pipeline import BATCH_SIZE, PipelineStores
+from .progress_channel import ProgressChannel
+from .warmup import http_transport
+from .worker import WORKERS, WorkerPool
 
 app = FastAPI(title="Agent Contact Finder v3")
 
@@ -35,53 +57,114 @@ app.add_middleware(
 
 api = APIRouter(prefix="/api")
 
-jobs: dict[str, dict] = {}
+# Progress channels of queued/running jobs; job state lives in the job store
+channels: dict[str, ProgressChannel] = {}
 _tasks: dict[str, asyncio.Task] = {}
 
 DATA_DIR = Path(__file__).parent / "data"
 DATA_DIR.mkdir(exist_ok=True)
 JOBS_FILE = DATA_DIR / "jobs.json"
+JOBS_DB = DATA_DIR / "jobs.db"
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+JOBS_PAGE_MAX = 200
 
-def _save_jobs():
-    saveable = {}
-    for jid, job in jobs.items():
-        saveable[jid] = {
-            "status": job["status"],
-            "upload_path": job["upload_path"],
-            "result_path": job.get("result_path"),
-            "total": job["total"],
-            "error": job.get("error"),
-            "summary": job.get("summary"),
-            "filename": job.get("filename", ""),
-            "created_at": job.get("created_at", ""),
-        }
-    JOBS_FILE.write_text(json.dumps(saveable, indent=2), encoding="utf-8")
+job_store: JobStore | None = None
+worker_pool: WorkerPool | None = None
+_shutting_down = False
 
+# Kept open between /api/lookup calls; reopened when a job saves newer stores
+_lookup_stores: PipelineStores | None = None
+_lookup_stores_mtime = 0.0
+_lookup_client: httpx.AsyncClient | None = None
 
-def _load_jobs():
-    global jobs
-    if not JOBS_FILE.exists():
-        return
+
+def _get_job(job_id: str) -> dict | None:
+    return job_store.get(job_id)
+
+
+def _open_job_store():
+    global job_store
+    job_store = JobStore(JOBS_DB)
+    job_store.migrate_json(JOBS_FILE)
+
+
+def _deliver(job_id: str, event: dict):
+    """Pass a job event (from this process or a worker) to its progress channel."""
+    if event.get("type") in TERMINAL_EVENTS:
+        channel = channels.pop(job_id, None)
+        if channel:
+            channel.close(event)
+    else:
+        channels.setdefault(job_id, ProgressChannel()).publish(event)
+
+
+def _start_job(job_id: str, batches=None, first_batch=None):
+    channels.setdefault(job_id, ProgressChannel())
+    if worker_pool:
+        return  # queued in the job store; a worker claims it
+    _tasks[job_id] = asyncio.create_task(_run_job(job_id, batches, first_batch))
+
+
+async def _run_job(job_id: str, batches=None, first_batch=None):
     try:
-        saved = json.loads(JOBS_FILE.read_text(encoding="utf-8"))
-        for jid, data in saved.items():
-            restored = {**data, "progress": [], "preview_rows": None}
-            if data.get("status") == "running":
-                restored["status"] = "error"
-                restored["error"] = "Server restarted while this job was running."
-            jobs[jid] = restored
-    except (json.JSONDecodeError, KeyError):
-        pass
+        await execute_job(
+            job_store.get(job_id), job_store, DATA_DIR,
+            publish=lambda event: _deliver(job_id, event),
+            batches=batches,
+            first_batch=first_batch,
+            shutting_down=lambda: _shutting_down,
+        )
+    finally:
+        _tasks.pop(job_id, None)
+
+
+def _resume_interrupted():
+    """Re-queue jobs that were queued or running when the server last stopped."""
+    if worker_pool:
+        job_store.requeue()
+        return
+    for status in ("running", "queued"):
+        interrupted, _ = job_store.list(status=status, limit=1_000_000)
+        for job in interrupted:
+            job_store.update(job["job_id"], status="running")
+            _start_job(job["job_id"])
 
 
 @app.on_event("startup")
 async def startup():
-    _load_jobs()
+    global worker_pool
+    _open_job_store()
+    if WORKERS > 0:
+        worker_pool = WorkerPool(WORKERS, job_store, DATA_DIR, _deliver)
+    _resume_interrupted()
+    if worker_pool:
+        worker_pool.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Checkpoint running jobs and leave them queued for the next start."""
+    global _shutting_down
+    _shutting_down = True
+    if worker_pool:
+        await asyncio.to_thread(worker_pool.stop)
+    running = [t for t in _tasks.values() if not t.done()]
+    for task in running:
+        task.cancel()
+    await asyncio.gather(*running, return_exceptions=True)
+    if _lookup_client:
+        await _lookup_client.aclose()
+    executors.shutdown()
 
 
 @api.post("/upload")
-async def upload_file(file: UploadFile = File(...)):
+async def upload_file(
+    file: UploadFile = File(...),
+    time_budget_minutes: float | None = Form(None, gt=0),
+):
+    """Start a job. With a time budget, the job stops searching once the budget
+    (counted from upload) is spent and exports what it found."""
     ext = Path(file.filename).suffix.lower()
     if ext not in (".csv", ".xlsx", ".xls"):
         raise HTTPException(400, "Only .csv, .xlsx, or .xls files are supported.")
@@ -89,78 +172,58 @@ async def upload_file(file: UploadFile = File(...)):
     job_id = str(uuid.uuid4())[:8]
     upload_path = DATA_DIR / f"{job_id}{ext}"
 
-    content = await file.read()
+    # Stream the upload to disk instead of holding the whole file in memory
     with open(upload_path, "wb") as f:
-        f.write(content)
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            f.write(chunk)
 
+    # Parse off the event loop; only the first batch is needed to validate
+    batches = iter_batches(str(upload_path), BATCH_SIZE)
     try:
-        agents = read_input(str(upload_path))
+        first_batch = await asyncio.to_thread(next, batches, None)
     except (ValueError, FileNotFoundError) as e:
         upload_path.unlink(missing_ok=True)
         raise HTTPException(400, str(e))
 
-    if not agents:
+    if not first_batch:
         upload_path.unlink(missing_ok=True)
         raise HTTPException(400, "No valid agent rows found in file.")
 
-    jobs[job_id] = {
-        "status": "running",
-        "upload_path": str(upload_path),
-        "result_path": None,
-        "total": len(agents),
-        "progress": [],
-        "error": None,
-        "summary": None,
-        "preview_rows": None,
-        "filename": file.filename,
-        "created_at": datetime.now().isoformat(),
-    }
-    _save_jobs()
-
-    task = asyncio.create_task(_run_job(job_id, agents))
-    _tasks[job_id] = task
+    # Rough row count so progress has a sensible total before parsing finishes
+    total = max(len(first_batch), await asyncio.to_thread(estimate_rows, str(upload_path)))
+
+    if worker_pool:
+        batches.close()  # the worker parses the file itself
+    job_store.create(
+        job_id,
+        status="queued" if worker_pool else "running",
+        upload_path=str(upload_path),
+        total=total,
+        filename=file.filename,
+        created_at=datetime.now().isoformat(),
+        deadline=time.time() + time_budget_minutes * 60 if time_budget_minutes else None,
+    )
+    _start_job(job_id, batches, first_batch)
 
-    return {"job_id": job_id, "total": len(agents)}
+    return {"job_id": job_id, "total": total}
 
 
 @api.get("/progress/{job_id}")
 async def progress_stream(job_id: str):
-    if job_id not in jobs:
+    job = _get_job(job_id)
+    if not job:
         raise HTTPException(404, "Job not found.")
 
     async def event_generator():
-        last_idx = 0
-        heartbeat_count = 0
-        poll_interval = 0.3
-        heartbeat_every = int(5 / poll_interval)
-
-        while True:
-            job = jobs.get(job_id)
-            if not job:
-                break
-
-            progress_list = job["progress"]
-            while last_idx < len(progress_list):
-                yield f"data: {json.dumps(progress_list[last_idx])}\n\n"
-                last_idx += 1
-                heartbeat_count = 0
-
-            if job["status"] == "complete":
-                yield f"data: {json.dumps({'type': 'complete', 'summary': job['summary'], 'preview_rows': job['preview_rows']})}\n\n"
-                break
-            elif job["status"] == "error":
-                yield f"data: {json.dumps({'type': 'error', 'message': job['error']})}\n\n"
-                break
-            elif job["status"] == "cancelled":
-                yield f"data: {json.dumps({'type': 'cancelled'})}\n\n"
-                break
-
-            heartbeat_count += 1
-            if heartbeat_count >= heartbeat_every:
-                yield f"data: {json.dumps({'type': 'heartbeat'})}\n\n"
-                heartbeat_count = 0
-
-            await asyncio.sleep(poll_interval)
+        channel = channels.get(job_id)
+        if not channel and job["status"] in ("queued", "running"):
+            channel = channels.setdefault(job_id, ProgressChannel())
+        if channel:
+            async for event in channel.subscribe():
+                yield f"data: {json.dumps(event)}\n\n"
+        else:
+            # Already finished: only the outcome is known
+            yield f"data: {json.dumps(terminal_event(job))}\n\n"
 
     return StreamingResponse(
         event_generator(),
@@ -170,45 +233,80 @@ async def progress_stream(job_id: str):
 
 
 @api.get("/download/{job_id}")
-async def download_result(job_id: str):
-    job = jobs.get(job_id)
+async def download_result(job_id: str, fmt: str = Query("csv", alias="format")):
+    job = _get_job(job_id)
     if not job:
         raise HTTPException(404, "Job not found.")
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(400, f"Unknown format. Use one of: {', '.join(EXPORT_FORMATS)}.")
+    suffix, media_type = EXPORT_FORMATS[fmt]
+
     if job["status"] != "complete" or not job.get("result_path"):
+        # Serve the rows finished so far (also what's left of a failed job)
+        partial = job.get("partial_path")
+        if partial and job.get("committed_bytes") and Path(partial).exists():
+            if fmt not in ("csv", "csv.gz"):
+                raise HTTPException(400, "Partial results are only available as csv or csv.gz.")
+            chunks = read_committed(partial, job["committed_bytes"])
+            return StreamingResponse(
+                gzip_chunks(chunks) if fmt == "csv.gz" else chunks,
+                media_type=media_type,
+                headers={
+                    "Content-Disposition": f'attachment; filename="agent_contacts_{job_id}_partial{suffix}"',
+                    "X-Rows-Written": str(job.get("rows_written", "")),
+                },
+            )
         raise HTTPException(400, "Results not ready yet.")
 
     result_path = Path(job["result_path"])
     if not result_path.exists():
         raise HTTPException(404, "Result file not found.")
 
-    return FileResponse(
-        str(result_path),
-        filename=f"agent_contacts_{job_id}.csv",
-        media_type="text/csv",
-    )
+    filename = f"agent_contacts_{job_id}{suffix}"
+    if fmt == "csv.gz":
+        return StreamingResponse(
+            gzip_chunks(read_file(str(result_path))),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+    if fmt == "xlsx":
+        path = await asyncio.to_thread(export_xlsx, str(result_path))
+    elif fmt == "parquet":
+        try:
+            path = await asyncio.to_thread(export_parquet, str(result_path))
+        except ImportError:
+            raise HTTPException(400, "Parquet export needs pyarrow installed on the server.")
+    else:
+        path = str(result_path)
+
+    return FileResponse(path, filename=filename, media_type=media_type)
 
 
 @api.get("/jobs")
-async def list_jobs():
+async def list_jobs(
+    status: str | None = None,
+    limit: int = Query(50, ge=1, le=JOBS_PAGE_MAX),
+    offset: int = Query(0, ge=0),
+):
+    rows, count = job_store.list(status=status, limit=limit, offset=offset)
     history = []
-    for jid, job in jobs.items():
-        last_progress = job["progress"][-1] if job["progress"] else None
+    for job in rows:
+        channel = channels.get(job["job_id"])
         history.append({
-            "job_id": jid,
-            "filename": job.get("filename", "unknown"),
-            "created_at": job.get("created_at", ""),
+            "job_id": job["job_id"],
+            "filename": job["filename"] or "unknown",
+            "created_at": job["created_at"],
             "status": job["status"],
             "total": job["total"],
-            "summary": job.get("summary"),
-            "last_progress": last_progress,
+            "summary": job["summary"],
+            "last_progress": channel.last_progress if channel else job["last_progress"],
         })
-    history.sort(key=lambda x: x["created_at"], reverse=True)
-    return history
+    return {"jobs": history, "total": count, "limit": limit, "offset": offset}
 
 
 @api.delete("/jobs/{job_id}")
 async def delete_job(job_id: str):
-    job = jobs.get(job_id)
+    job = _get_job(job_id)
     if not job:
         raise HTTPException(404, "Job not found.")
 
@@ -216,36 +314,163 @@ async def delete_job(job_id: str):
     if task and not task.done():
         task.cancel()
 
-    for path_key in ("upload_path", "result_path"):
+    for path_key in ("upload_path", "result_path", "partial_path"):
         raw = job.get(path_key) or ""
         if raw:
             p = Path(raw)
             if p.is_file():
                 p.unlink(missing_ok=True)
+    if job.get("result_path"):
+        for fmt in ("xlsx", "parquet"):
+            Path(converted_path(job["result_path"], fmt)).unlink(missing_ok=True)
 
-    del jobs[job_id]
     _tasks.pop(job_id, None)
-    _save_jobs()
+    job_store.delete(job_id)
+    _deliver(job_id, {"type": "cancelled"})
     return {"ok": True}
 
 
 @api.post("/jobs/{job_id}/cancel")
 async def cancel_job(job_id: str):
-    job = jobs.get(job_id)
+    job = _get_job(job_id)
     if not job:
         raise HTTPException(404, "Job not found.")
-    if job["status"] != "running":
+    if job["status"] not in ("queued", "running"):
         raise HTTPException(400, "Job is not running.")
 
+    # In worker mode the worker sees the status change and stops the job
+    job_store.update(job_id, status="cancelled")
     task = _tasks.get(job_id)
     if task and not task.done():
         task.cancel()
-
-    job["status"] = "cancelled"
-    _save_jobs()
+    elif job["status"] == "queued":
+        _deliver(job_id, {"type": "cancelled"})
     return {"ok": True}
 
 
+@api.get("/stats/strategies")
+async def strategy_stats():
+    """Hit rate of each brokerage URL strategy, per franchise site domain."""
+    from .strategy_stats import StrategyStats
+    return StrategyStats(DATA_DIR / "strategy_stats.db").report()
+
+
+@api.get("/stats/phases")
+async def phase_stats():
+    """Historical hit rate and hits per second of each pipeline phase."""
+    from .phase_stats import PhaseStats
+    return PhaseStats(DATA_DIR / "phase_stats.db").report()
+
+
+@api.get("/stats/timeouts")
+async def timeout_stats():
+    """Observed latency and current adaptive timeout per host and request kind."""
+    from .metrics import timeouts
+    return timeouts.report()
+
+
+@api.get("/stats/retries")
+async def retry_stats():
+    """Fetch retries per host: by reason, recovered, gave up, denied by budget."""
+    from .retry import stats
+    return stats.report()
+
+
+@api.get("/stats/http-cache")
+async def http_cache_stats():
+    """Stored pages by status, their compressed size, and this process's cache outcomes."""
+    from .http_cache import open_cache
+    return await asyncio.to_thread(open_cache(DATA_DIR / "http_cache.db").report)
+
+
+@api.get("/stats/warmup")
+async def warmup_stats():
+    """First-batch latency per phase, warm-up connect times and DNS cache use."""
+    from .warmup import report
+    return report()
+
+
+@api.get("/stats/executors")
+async def executor_stats():
+    """Threads, queue depth and queue wait / run time of each blocking-work pool."""
+    return executors.report()
+
+
+@api.get("/stats/scheduler")
+async def scheduler_stats():
+    """Request budget, queue and per-job grants of each rate-limited source."""
+    from .rate_limiter import scheduler
+    return scheduler.report()
+
+
+# ── Single-agent lookup ──
+
+def _stores_mtime() -> float:
+    from . import pipeline
+    from .journal import journal_path
+    paths = [pipeline.DATA_DIR / "cache.json", pipeline.DATA_DIR / "directory.json"]
+    paths += [journal_path(p) for p in paths]
+    return max((p.stat().st_mtime for p in paths if p.exists()), default=0.0)
+
+
+async def _get_lookup_stores() -> PipelineStores:
+    global _lookup_stores, _lookup_stores_mtime
+    # Reloading parses the whole directory; keep it off the event loop
+    mtime = await asyncio.to_thread(_stores_mtime)
+    if _lookup_stores is None or mtime > _lookup_stores_mtime:
+        _lookup_stores = await asyncio.to_thread(PipelineStores.open)
+        _lookup_stores_mtime = mtime
+    return _lookup_stores
+
+
+def _get_lookup_client() -> httpx.AsyncClient:
+    global _lookup_client
+    if _lookup_client is None:
+        _lookup_client = httpx.AsyncClient(
+            follow_redirects=True,
+            transport=http_cache_transport(
+                DATA_DIR / "http_cache.db",
+                http_transport(httpx.Limits(max_connections=10, max_keepalive_connections=5)),
+            ),
+        )
+    return _lookup_client
+
+
+@api.get("/lookup")
+async def lookup(
+    name: str,
+    brokerage: str = "",
+    city: str = "",
+    state: str = "",
+    budget: float = Query(DEFAULT_LOOKUP_BUDGET, gt=0, le=MAX_LOOKUP_BUDGET),
+):
+    """Find one agent's phone/email: cache and directory, then live sources in parallel."""
+    global _lookup_stores_mtime
+    if not name.strip():
+        raise HTTPException(400, "name is required")
+    agent = AgentRow(name=name.strip(), brokerage=brokerage.strip(), city=city.strip(), state=state.strip())
+    stores = await _get_lookup_stores()
+    r, info = await lookup_agent(agent, _get_lookup_client(), stores, budget)
+    if info["source"] not in (None, "cache", "directory"):
+        # Jobs rewrite the snapshots; a lookup only appends what it found
+        await asyncio.to_thread(stores.save_new)
+        _lookup_stores_mtime = await asyncio.to_thread(_stores_mtime)
+    return {
+        "name": agent.name,
+        "brokerage": agent.brokerage,
+        "phone": r.phone,
+        "email": r.email,
+        "status": r.status.value,
+        **info,
+    }
+
+
+@api.get("/stats/lookup")
+async def lookup_stats():
+    """p50/p95 latency of /api/lookup, overall and per source."""
+    return lookup_latency.report()
+
+
 # ── Diagnostic endpoint — test search from this server ──
 
 @api.get("/test-search")
@@ -293,15 +518,12 @@ async def test_search(name: str = "Ken Puckett", brokerage: str = "Reecenichols"
 
     # Test 3: Raw DDG library test
     try:
-        import asyncio
-        loop = asyncio.get_event_loop()
-
         def _raw_ddg():
             from ddgs import DDGS
             with DDGS(timeout=15) as ddgs:
                 return list(ddgs.text(f'"{name}" real estate agent phone', max_results=3))
 
-        raw = await loop.run_in_executor(None, _raw_ddg)
+        raw = await executors.run("diagnostics", _raw_ddg)
         results["tests"]["raw_ddg"] = {
             "status": "ok",
             "result_count": len(raw),
@@ -340,122 +562,18 @@ async def test_search(name: str = "Ken Puckett", brokerage: str = "Reecenichols"
 async def get_comps(address: str):
     """Pull sold comps near a given address using HomeHarvest."""
     try:
-        from homeharvest import scrape_property
+        from .comps import find_comps
     except ImportError:
         raise HTTPException(status_code=500, detail="HomeHarvest not installed")
 
     import re as _re
     zip_match = _re.search(r'\b(\d{5})\b', address)
-    location = zip_match.group(1) if zip_match else address
-
-    comps = []
-    for months in [3, 6, 9, 12]:
-        try:
-            loop = asyncio.get_event_loop()
-
-            def _scrape(months_=months):
-                from datetime import date, timedelta
-                end = date.today()
-                start = end - timedelta(days=months_ * 30)
-                df = scrape_property(
-                    location=location,
-                    listing_type="sold",
-                    date_from=start.strftime("%Y-%m-%d"),
-                    date_to=end.strftime("%Y-%m-%d"),
-                    limit=10,
-                )
-                return df
-
-            df = await loop.run_in_executor(None, _scrape)
-
-            if df is None or len(df) == 0:
-                continue
-
-            results = []
-            for _, row in df.iterrows():
-                list_price = float(row.get('list_price') or row.get('price') or 0)
-                sold_price = float(row.get('sold_price') or row.get('close_price') or list_price)
-                dom = int(row.get('days_on_market') or row.get('dom') or 0)
-                addr = str(row.get('full_street_line') or row.get('street') or '')
-                city = str(row.get('city') or '')
-                if list_price <= 0:
-                    continue
-                pct_under = round((list_price - sold_price) / list_price * 100, 1) if list_price > 0 else 0
-                results.append({
-                    'address': f"{addr}, {city}".strip(', '),
-                    'listPrice': list_price,
-                    'soldPrice': sold_price,
-                    'pctUnderList': pct_under,
-                    'dom': dom,
-                })
-
-            if len(results) >= 3:
-                comps = results[:5]
-                break
-            if len(results) > 0:
-                comps = results
-        except Exception as e:
-            logging.getLogger("agent_finder.comps").warning("Comp scrape failed (%d mo): %s", months, e)
-            continue
-
-    if not comps:
-        return {"comps": [], "avgPctUnderList": 0, "avgDom": 0, "note": "No comps found"}
-
-    avg_pct = round(sum(c['pctUnderList'] for c in comps) / len(comps), 1)
-    avg_dom = round(sum(c['dom'] for c in comps) / len(comps))
-    return {"comps": comps, "avgPctUnderList": avg_pct, "avgDom": avg_dom}
-
-
-# ── Background job runner ──
-
-async def _run_job(job_id: str, agents):
-    job = jobs[job_id]
-
-    def on_progress(data: dict):
-        data["type"] = "progress"
-        job["progress"].append(data)
+    location = zip_match.group(1) if zip_match else address.strip().lower()
 
     try:
-        results = await run_pipeline(agents, progress_callback=on_progress)
-
-        result_path = str(DATA_DIR / f"{job_id}_results.csv")
-        export_results_csv(results, result_path)
-
-        preview = []
-        for r in results[:30]:
-            preview.append({
-                "name": r.agent.name,
-                "brokerage": r.agent.brokerage,
-                "address": r.agent.address,
-                "phone": r.phone,
-                "email": r.email,
-                "status": r.status.value,
-                "source": r.source,
-            })
-
-        summary = generate_summary(results)
-
-        job["status"] = "complete"
-        job["result_path"] = result_path
-        job["summary"] = summary
-        job["preview_rows"] = preview
-        _save_jobs()
-
-    except asyncio.CancelledError:
-        if job["status"] != "cancelled":
-            job["status"] = "cancelled"
-            _save_jobs()
-
-    except Exception as e:
-        import traceback
-        tb = traceback.format_exc()
-        logger.error("Job %s failed: %s\n%s", job_id, e, tb)
-        job["status"] = "error"
-        job["error"] = f"{e}\n\nTraceback:\n{tb}"
-        _save_jobs()
-
-    finally:
-        _tasks.pop(job_id, None)
+        return await find_comps(location)
+    except ExecutorFull:
+        raise HTTPException(status_code=503, detail="Too many comps requests, try again shortly")
 
 
 # ── Register router + serve frontend ──
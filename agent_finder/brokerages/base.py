@@ -1,20 +1,43 @@
 """Abstract base class for franchise-specific brokerage scrapers.
 
-Each franchise scraper inherits from this and implements the `search`
-method to look up a single agent in that franchise's directory.
+Each franchise scraper inherits from this and implements `strategies`
+(the candidate URLs for an agent) and `_parse_page`. The base class
+walks the strategies in order of their historical hit rate, starting
+with the exact profile URL from the sitemap index when there is one.
+
+Scrapers that implement `roster_url` also get office roster mode: agents
+whose offices resolve to the same roster page are looked up on it with
+one fetch, and only the ones missing from it are searched individually.
+Roster mode is dropped for a site whose rosters never resolve anyone.
 """
 
 import asyncio
 import logging
+import re
+import time
 from abc import ABC, abstractmethod
+from collections import defaultdict
+from urllib.parse import urlparse
 
 import httpx
+from bs4 import BeautifulSoup
 
 from ..models import AgentRow, ContactResult, ContactStatus
-from ..searchers.helpers import get_headers
+from ..http_cache import parse_once
+from ..metrics import timeouts
+from ..rate_limiter import request_slot, scheduler
+from ..retry import Deadline
+from ..single_flight import fetch, search_once
+from ..searchers.helpers import get_headers, extract_phones, name_key
+from ..sitemap_index import SitemapIndex
+from ..strategy_stats import StrategyStats
 
 logger = logging.getLogger("agent_finder.brokerages")
 
+ROSTER_MIN_AGENTS = 3     # office size at which one roster fetch pays off
+ROSTER_CARD_DEPTH = 6     # parent levels to climb from a tel:/mailto: link
+GENERIC_LOCALS = {"info", "contact", "admin", "support", "noreply", "help"}
+
 
 class BaseBrokerageScraper(ABC):
     name: str = ""
@@ -23,9 +46,28 @@ class BaseBrokerageScraper(ABC):
     max_concurrent: int = 3
     timeout: float = 15.0
 
-    def __init__(self, client: httpx.AsyncClient):
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        stats: StrategyStats | None = None,
+        sitemap: SitemapIndex | None = None,
+    ):
         self.client = client
+        self.stats = stats
+        self.sitemap = sitemap
         self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._configure_budget()
+
+    def _configure_budget(self):
+        """One request budget per site, shared by every job's scraper instance."""
+        if self.base_url and self.rate_limit > 0:
+            scheduler.configure(
+                self.domain, rate=self.max_concurrent / self.rate_limit, burst=self.max_concurrent,
+            )
+
+    @property
+    def domain(self) -> str:
+        return urlparse(self.base_url).netloc.removeprefix("www.")
 
     async def search_batch(
         self,
@@ -35,9 +77,13 @@ class BaseBrokerageScraper(ABC):
         """Search for all agents in this franchise's directory."""
         results: list[ContactResult] = []
 
+        if len(agents) >= ROSTER_MIN_AGENTS:
+            agents = await self._search_rosters(agents, results, on_result)
+
         for batch_start in range(0, len(agents), self.max_concurrent):
             batch = agents[batch_start : batch_start + self.max_concurrent]
-            tasks = [self._search_safe(a) for a in batch]
+            # Shares the search with any other job looking up the same agent here
+            tasks = [search_once(self.domain, a, self._search_safe) for a in batch]
             batch_results = await asyncio.gather(*tasks)
 
             for r in batch_results:
@@ -45,39 +91,229 @@ class BaseBrokerageScraper(ABC):
                 if on_result:
                     on_result(r)
 
-            if batch_start + self.max_concurrent < len(agents):
-                await asyncio.sleep(self.rate_limit)
-
         return results
 
+    async def _search_rosters(
+        self,
+        agents: list[AgentRow],
+        results: list[ContactResult],
+        on_result=None,
+    ) -> list[AgentRow]:
+        """Resolve agents from office roster pages. Returns the agents still missing."""
+        # Historical hit rate decides, like any other strategy
+        if self.stats and not self.stats.order(self.domain, ["roster"]):
+            return agents
+
+        # Several offices in one city can share a city-wide directory page
+        pages: dict[tuple, list[AgentRow]] = defaultdict(list)
+        targets: dict[tuple, tuple[str, dict | None]] = {}
+        remaining: list[AgentRow] = []
+        for agent in agents:
+            target = self.roster_url(agent)
+            if not target:
+                remaining.append(agent)
+                continue
+            url, params = target
+            page = (url, tuple(sorted((params or {}).items())))
+            targets[page] = target
+            pages[page].append(agent)
+
+        fetched = 0
+        for page, page_agents in pages.items():
+            if len(page_agents) < ROSTER_MIN_AGENTS:
+                remaining.extend(page_agents)
+                continue
+
+            fetched += 1
+            roster = await self._fetch_roster(targets[page], page_agents)
+            if roster is None:
+                # Fetch failed: search them individually, and it says nothing about the site
+                remaining.extend(page_agents)
+                continue
+
+            for agent in page_agents:
+                phone, email = roster.get(name_key(agent.name), ("", ""))
+                if not (phone or email):
+                    remaining.append(agent)
+                    continue
+                r = self._make_result(agent, phone, email)
+                results.append(r)
+                if on_result:
+                    on_result(r)
+
+            if self.stats:
+                self.stats.record(self.domain, "roster", bool(roster))
+
+        if fetched:
+            logger.info(
+                "%s: %d/%d agents resolved from %d office rosters",
+                self.name, len(agents) - len(remaining), len(agents), fetched,
+            )
+        return remaining
+
+    async def _fetch_roster(
+        self,
+        target: tuple[str, dict | None],
+        agents: list[AgentRow],
+    ) -> dict[str, tuple[str, str]] | None:
+        """The agents found on a roster page, or None if it couldn't be fetched."""
+        url, params = target
+        with request_slot(self.domain):
+            async with self._semaphore:
+                try:
+                    resp = await fetch(
+                        self.client, url, params, kind="roster", headers=self._headers(), timeout=self.timeout,
+                    )
+                    if resp.status_code == 200:
+                        return self._parse_roster(resp.text, agents)
+                    if resp.status_code >= 500 or resp.status_code == 429:
+                        return None
+                except Exception as e:
+                    logger.debug("%s: roster fetch failed for %s: %s", self.name, url, e)
+                    return None
+        return {}
+
+    def roster_url(self, agent: AgentRow) -> tuple[str, dict | None] | None:
+        """(url, query params) of the office roster page for this agent's office.
+
+        None means the scraper has no roster mode.
+        """
+        return None
+
+    def _parse_roster(self, html: str, agents: list[AgentRow]) -> dict[str, tuple[str, str]]:
+        """Map name key -> (phone, email) for the given agents listed on a roster page.
+
+        Each tel:/mailto: link is attributed to the smallest enclosing card
+        that holds a single phone link and names exactly one of the agents.
+        """
+        soup = BeautifulSoup(html, "html.parser")
+        wanted = {}
+        for agent in agents:
+            key = name_key(agent.name)
+            if key:
+                wanted[key] = tuple(key.split("-"))
+
+        found: dict[str, tuple[str, str]] = {}
+        for link in soup.find_all("a", href=True):
+            href = link["href"]
+            if not href.startswith(("tel:", "mailto:")):
+                continue
+
+            card = link
+            for _ in range(ROSTER_CARD_DEPTH):
+                parent = card.parent
+                if parent is None or len(parent.find_all("a", href=re.compile(r"^tel:"))) > 1:
+                    break
+                card = parent
+
+            tokens = set(re.findall(r"[a-z]+", card.get_text(" ").lower()))
+            matches = [k for k, (first, last) in wanted.items() if first in tokens and last in tokens]
+            if len(matches) != 1:
+                continue
+
+            phone, email = found.get(matches[0], ("", ""))
+            if href.startswith("tel:") and not phone:
+                phones = extract_phones(href.replace("tel:", "").strip())
+                phone = phones[0] if phones else ""
+            elif href.startswith("mailto:") and not email:
+                raw = href.replace("mailto:", "").strip().split("?")[0].lower()
+                if "@" in raw and not any(s in raw.split("@")[0] for s in GENERIC_LOCALS):
+                    email = raw
+            found[matches[0]] = (phone, email)
+
+        return {k: v for k, v in found.items() if v[0] or v[1]}
+
     async def _search_safe(self, agent: AgentRow) -> ContactResult:
-        async with self._semaphore:
+        # The site's request slot is taken by the first page not served from the cache
+        with request_slot(self.domain):
+            async with self._semaphore:
+                deadline = Deadline(timeouts.timeout(self.domain, "agent", self.timeout))
+                try:
+                    r = await deadline.run(self.search(agent))
+                    timeouts.observe(self.domain, "agent", deadline.elapsed)
+                    return r
+                except asyncio.TimeoutError:
+                    timeouts.observe(self.domain, "agent", deadline.elapsed, timed_out=True)
+                    logger.warning("%s: timeout for %s", self.name, agent.name)
+                    # A stuck site is not evidence the agent isn't listed
+                    return ContactResult(
+                        agent=agent,
+                        status=ContactStatus.ERROR,
+                        source=self.name,
+                        error_message="timeout",
+                    )
+                except Exception as e:
+                    logger.warning("%s: error for %s: %s", self.name, agent.name, e)
+                    return ContactResult(
+                        agent=agent,
+                        status=ContactStatus.ERROR,
+                        source=self.name,
+                        error_message=str(e),
+                    )
+
+    async def search(self, agent: AgentRow) -> ContactResult:
+        """Search for a single agent in this franchise's directory."""
+        candidates = {name: (url, params) for name, url, params in self.strategies(agent)}
+        if not candidates:
+            return self._make_result(agent)
+
+        if self.sitemap:
+            profile_url = self.sitemap.lookup(self.domain, agent.name, agent.city)
+            if profile_url:
+                candidates = {"sitemap": (profile_url, None), **candidates}
+
+        names = list(candidates)
+        if self.stats:
+            names = self.stats.order(self.domain, names)
+
+        headers = self._headers()
+        failure = ""
+        for strategy in names:
+            url, params = candidates[strategy]
+            phone, email = "", ""
             try:
-                return await asyncio.wait_for(
-                    self.search(agent), timeout=self.timeout
-                )
-            except asyncio.TimeoutError:
-                logger.warning("%s: timeout for %s", self.name, agent.name)
-                return ContactResult(
-                    agent=agent,
-                    status=ContactStatus.NOT_FOUND,
-                    source=self.name,
-                    error_message="timeout",
+                resp = await fetch(
+                    self.client, url, params, kind="profile", headers=headers, timeout=self.timeout,
                 )
+                if resp.status_code == 200:
+                    phone, email = parse_once(
+                        resp, f"{self.name}|{agent.name}", lambda html: self._parse_page(html, agent.name),
+                    )
+                elif resp.status_code >= 500 or resp.status_code == 429:
+                    failure = f"HTTP {resp.status_code}"
+                    continue
             except Exception as e:
-                logger.warning("%s: error for %s: %s", self.name, agent.name, e)
-                return ContactResult(
-                    agent=agent,
-                    status=ContactStatus.NOT_FOUND,
-                    source=self.name,
-                    error_message=str(e),
-                )
+                # Still failing after retries: not evidence the agent isn't listed
+                failure = f"{type(e).__name__}: {e}"
+                continue
+
+            if self.stats:
+                self.stats.record(self.domain, strategy, bool(phone or email))
+            if phone or email:
+                return self._make_result(agent, phone, email)
+
+        result = self._make_result(agent)
+        if failure:
+            result.status = ContactStatus.ERROR
+            result.error_message = failure
+        return result
 
     @abstractmethod
-    async def search(self, agent: AgentRow) -> ContactResult:
-        """Search for a single agent in this franchise's directory."""
+    def strategies(self, agent: AgentRow) -> list[tuple[str, str, dict | None]]:
+        """Candidate lookups for an agent as (strategy name, url, query params).
+
+        Listed in the default order; return [] to skip the agent.
+        """
+        ...
+
+    @abstractmethod
+    def _parse_page(self, html: str, agent_name: str) -> tuple[str, str]:
+        """Extract (phone, email) from a fetched page."""
         ...
 
+    def _headers(self) -> dict:
+        return get_headers()
+
     def _make_result(self, agent: AgentRow, phone: str = "", email: str = "") -> ContactResult:
         has = bool(phone or email)
         return ContactResult(
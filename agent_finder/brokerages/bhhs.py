@@ -6,8 +6,8 @@ Searches bhhs.com for agent profiles.
 from bs4 import BeautifulSoup
 
 from .base import BaseBrokerageScraper
-from ..models import AgentRow, ContactResult
-from ..searchers.helpers import get_headers, extract_phones, extract_emails
+from ..models import AgentRow
+from ..searchers.helpers import extract_phones, first_contact
 
 
 class BHHSBrokerageScraper(BaseBrokerageScraper):
@@ -17,29 +17,15 @@ class BHHSBrokerageScraper(BaseBrokerageScraper):
     max_concurrent = 2
     timeout = 15.0
 
-    async def search(self, agent: AgentRow) -> ContactResult:
-        headers = get_headers()
-
-        name_parts = agent.name.lower().split()
-        if len(name_parts) < 2:
-            return self._make_result(agent)
+    def strategies(self, agent: AgentRow) -> list[tuple[str, str, dict | None]]:
+        if len(agent.name.split()) < 2:
+            return []
 
         # BHHS agent search
-        search_url = f"{self.base_url}/agent-office-search"
-        params = {"type": "agent", "query": agent.name}
-
-        try:
-            resp = await self.client.get(
-                search_url, params=params, headers=headers, timeout=self.timeout
-            )
-            if resp.status_code == 200:
-                phone, email = self._parse_page(resp.text, agent.name)
-                if phone or email:
-                    return self._make_result(agent, phone, email)
-        except Exception:
-            pass
-
-        return self._make_result(agent)
+        return [
+            ("search", f"{self.base_url}/agent-office-search",
+             {"type": "agent", "query": agent.name}),
+        ]
 
     def _parse_page(self, html: str, agent_name: str) -> tuple[str, str]:
         soup = BeautifulSoup(html, "html.parser")
@@ -61,15 +47,13 @@ class BHHSBrokerageScraper(BaseBrokerageScraper):
 
         if not phone or not email:
             text = soup.get_text(separator=" ")
-            if not phone:
-                phones = extract_phones(text)
-                if phones:
-                    phone = phones[0]
-            if not email:
-                emails = extract_emails(text)
-                for em in emails:
-                    if "bhhs.com" not in em and "berkshirehathaway" not in em:
-                        email = em
-                        break
+            text_phone, text_email = first_contact(
+                text,
+                want_phone=not phone,
+                want_email=not email,
+                email_ok=lambda em: "bhhs.com" not in em and "berkshirehathaway" not in em,
+            )
+            phone = phone or text_phone
+            email = email or text_email
 
         return phone, email
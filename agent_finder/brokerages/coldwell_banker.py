@@ -3,11 +3,13 @@
 Searches coldwellbanker.com agent directory.
 """
 
+import re
+
 from bs4 import BeautifulSoup
 
 from .base import BaseBrokerageScraper
-from ..models import AgentRow, ContactResult
-from ..searchers.helpers import get_headers, extract_phones, extract_emails
+from ..models import AgentRow
+from ..searchers.helpers import extract_phones, first_contact
 
 
 class ColdwellBankerBrokerageScraper(BaseBrokerageScraper):
@@ -17,29 +19,22 @@ class ColdwellBankerBrokerageScraper(BaseBrokerageScraper):
     max_concurrent = 2
     timeout = 15.0
 
-    async def search(self, agent: AgentRow) -> ContactResult:
-        headers = get_headers()
-
-        name_parts = agent.name.lower().split()
-        if len(name_parts) < 2:
-            return self._make_result(agent)
+    def strategies(self, agent: AgentRow) -> list[tuple[str, str, dict | None]]:
+        if len(agent.name.split()) < 2:
+            return []
 
         # Coldwell Banker agent search
-        search_url = f"{self.base_url}/find-agents"
-        params = {"name": agent.name}
-
-        try:
-            resp = await self.client.get(
-                search_url, params=params, headers=headers, timeout=self.timeout
-            )
-            if resp.status_code == 200:
-                phone, email = self._parse_page(resp.text, agent.name)
-                if phone or email:
-                    return self._make_result(agent, phone, email)
-        except Exception:
-            pass
+        return [
+            ("search", f"{self.base_url}/find-agents", {"name": agent.name}),
+        ]
 
-        return self._make_result(agent)
+    def roster_url(self, agent: AgentRow) -> tuple[str, dict | None] | None:
+        if not (agent.city and agent.state):
+            return None
+        # City agent directory, e.g. /city/tx/austin/agents
+        city = re.sub(r"[^a-z]+", "-", agent.city.lower()).strip("-")
+        state = agent.state.strip().lower()[:2]
+        return f"{self.base_url}/city/{state}/{city}/agents", None
 
     def _parse_page(self, html: str, agent_name: str) -> tuple[str, str]:
         soup = BeautifulSoup(html, "html.parser")
@@ -61,16 +56,14 @@ class ColdwellBankerBrokerageScraper(BaseBrokerageScraper):
 
         if not phone or not email:
             text = soup.get_text(separator=" ")
-            if not phone:
-                phones = extract_phones(text)
-                if phones:
-                    phone = phones[0]
-            if not email:
-                emails = extract_emails(text)
-                skip = {"info@", "contact@", "admin@", "support@", "noreply@"}
-                for em in emails:
-                    if not any(em.startswith(s) for s in skip):
-                        email = em
-                        break
+            skip = ("info@", "contact@", "admin@", "support@", "noreply@")
+            text_phone, text_email = first_contact(
+                text,
+                want_phone=not phone,
+                want_email=not email,
+                email_ok=lambda em: not em.startswith(skip),
+            )
+            phone = phone or text_phone
+            email = email or text_email
 
         return phone, email
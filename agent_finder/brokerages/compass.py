@@ -6,8 +6,8 @@ Searches compass.com for agent profiles.
 from bs4 import BeautifulSoup
 
 from .base import BaseBrokerageScraper
-from ..models import AgentRow, ContactResult
-from ..searchers.helpers import get_headers, extract_phones, extract_emails
+from ..models import AgentRow
+from ..searchers.helpers import extract_phones, first_contact
 
 
 class CompassBrokerageScraper(BaseBrokerageScraper):
@@ -17,43 +17,18 @@ class CompassBrokerageScraper(BaseBrokerageScraper):
     max_concurrent = 2
     timeout = 15.0
 
-    async def search(self, agent: AgentRow) -> ContactResult:
-        headers = get_headers()
-
+    def strategies(self, agent: AgentRow) -> list[tuple[str, str, dict | None]]:
         name_parts = agent.name.lower().split()
         if len(name_parts) < 2:
-            return self._make_result(agent)
-
-        # Compass agent search
-        search_url = f"{self.base_url}/agents/"
-        params = {"search": agent.name}
+            return []
 
-        try:
-            resp = await self.client.get(
-                search_url, params=params, headers=headers, timeout=self.timeout
-            )
-            if resp.status_code == 200:
-                phone, email = self._parse_page(resp.text, agent.name)
-                if phone or email:
-                    return self._make_result(agent, phone, email)
-        except Exception:
-            pass
-
-        # Try slug-based URL
         slug = "-".join(name_parts)
-        profile_url = f"{self.base_url}/agents/{slug}"
-        try:
-            resp = await self.client.get(
-                profile_url, headers=headers, timeout=self.timeout
-            )
-            if resp.status_code == 200:
-                phone, email = self._parse_page(resp.text, agent.name)
-                if phone or email:
-                    return self._make_result(agent, phone, email)
-        except Exception:
-            pass
-
-        return self._make_result(agent)
+        return [
+            # Compass agent search
+            ("search", f"{self.base_url}/agents/", {"search": agent.name}),
+            # Slug-based URL
+            ("profile_slug", f"{self.base_url}/agents/{slug}", None),
+        ]
 
     def _parse_page(self, html: str, agent_name: str) -> tuple[str, str]:
         soup = BeautifulSoup(html, "html.parser")
@@ -75,15 +50,13 @@ class CompassBrokerageScraper(BaseBrokerageScraper):
 
         if not phone or not email:
             text = soup.get_text(separator=" ")
-            if not phone:
-                phones = extract_phones(text)
-                if phones:
-                    phone = phones[0]
-            if not email:
-                emails = extract_emails(text)
-                for em in emails:
-                    if "compass.com" not in em:
-                        email = em
-                        break
+            text_phone, text_email = first_contact(
+                text,
+                want_phone=not phone,
+                want_email=not email,
+                email_ok=lambda em: "compass.com" not in em,
+            )
+            phone = phone or text_phone
+            email = email or text_email
 
         return phone, email
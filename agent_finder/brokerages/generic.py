@@ -9,8 +9,8 @@ import re
 from bs4 import BeautifulSoup
 
 from .base import BaseBrokerageScraper
-from ..models import AgentRow, ContactResult
-from ..searchers.helpers import get_headers, extract_phones, extract_emails
+from ..models import AgentRow
+from ..searchers.helpers import extract_phones, first_contact, name_in_email
 
 # Map franchise keys to their known website domains
 FRANCHISE_DOMAINS: dict[str, str] = {
@@ -42,35 +42,23 @@ class GenericBrokerageScraper(BaseBrokerageScraper):
     max_concurrent = 2
     timeout = 15.0
 
-    def __init__(self, client, franchise_key: str = ""):
-        super().__init__(client)
+    def __init__(self, client, franchise_key: str = "", stats=None, sitemap=None):
+        super().__init__(client, stats, sitemap)
         self.franchise_key = franchise_key
         domain = FRANCHISE_DOMAINS.get(franchise_key, "")
         self.base_url = f"https://www.{domain}" if domain else ""
+        self._configure_budget()
 
-    async def search(self, agent: AgentRow) -> ContactResult:
+    def strategies(self, agent: AgentRow) -> list[tuple[str, str, dict | None]]:
         if not self.base_url:
-            return self._make_result(agent)
-
-        headers = get_headers()
+            return []
 
         # Try common agent search paths
-        for path_template in AGENT_SEARCH_PATHS:
-            path = path_template.format(name=agent.name.replace(" ", "+"))
-            url = self.base_url + path
-
-            try:
-                resp = await self.client.get(
-                    url, headers=headers, timeout=self.timeout
-                )
-                if resp.status_code == 200:
-                    phone, email = self._parse_page(resp.text, agent.name)
-                    if phone or email:
-                        return self._make_result(agent, phone, email)
-            except Exception:
-                continue
-
-        return self._make_result(agent)
+        query = agent.name.replace(" ", "+")
+        return [
+            (path_template, self.base_url + path_template.format(name=query), None)
+            for path_template in AGENT_SEARCH_PATHS
+        ]
 
     def _parse_page(self, html: str, agent_name: str) -> tuple[str, str]:
         soup = BeautifulSoup(html, "html.parser")
@@ -97,17 +85,13 @@ class GenericBrokerageScraper(BaseBrokerageScraper):
         # Fallback: text extraction
         if not phone or not email:
             text = soup.get_text(separator=" ")
-            if not phone:
-                phones = extract_phones(text)
-                if phones:
-                    phone = phones[0]
-            if not email:
-                agent_parts = agent_name.lower().split()
-                all_emails = extract_emails(text)
-                for em in all_emails:
-                    local = em.split("@")[0]
-                    if any(p in local for p in agent_parts):
-                        email = em
-                        break
+            text_phone, text_email = first_contact(
+                text,
+                want_phone=not phone,
+                want_email=not email,
+                email_ok=lambda em: name_in_email(em, agent_name),
+            )
+            phone = phone or text_phone
+            email = email or text_email
 
         return phone, email
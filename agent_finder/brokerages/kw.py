@@ -7,8 +7,8 @@ and parse the results for phone/email.
 from bs4 import BeautifulSoup
 
 from .base import BaseBrokerageScraper
-from ..models import AgentRow, ContactResult
-from ..searchers.helpers import get_headers, extract_phones, extract_emails
+from ..models import AgentRow
+from ..searchers.helpers import get_headers, first_contact, name_in_email
 
 
 class KWBrokerageScraper(BaseBrokerageScraper):
@@ -18,69 +18,50 @@ class KWBrokerageScraper(BaseBrokerageScraper):
     max_concurrent = 2
     timeout = 15.0
 
-    async def search(self, agent: AgentRow) -> ContactResult:
-        # Try the agent search page
-        headers = get_headers()
-        headers["Referer"] = self.base_url
-
-        # Search URL pattern
+    def strategies(self, agent: AgentRow) -> list[tuple[str, str, dict | None]]:
         name_parts = agent.name.lower().split()
         if len(name_parts) < 2:
-            return self._make_result(agent)
-
-        # Try direct search
-        search_url = f"{self.base_url}/agent/search"
-        params = {"q": agent.name}
-
-        try:
-            resp = await self.client.get(
-                search_url, params=params, headers=headers, timeout=self.timeout
-            )
-            if resp.status_code == 200:
-                phone, email = self._parse_page(resp.text, agent.name)
-                if phone or email:
-                    return self._make_result(agent, phone, email)
-        except Exception:
-            pass
+            return []
 
-        # Try slug-based profile URL
         slug = "-".join(name_parts)
-        profile_url = f"{self.base_url}/agent/{slug}"
-        try:
-            resp = await self.client.get(
-                profile_url, headers=headers, timeout=self.timeout
-            )
-            if resp.status_code == 200:
-                phone, email = self._parse_page(resp.text, agent.name)
-                if phone or email:
-                    return self._make_result(agent, phone, email)
-        except Exception:
-            pass
+        return [
+            # Direct search
+            ("search", f"{self.base_url}/agent/search", {"q": agent.name}),
+            # Slug-based profile URL
+            ("profile_slug", f"{self.base_url}/agent/{slug}", None),
+        ]
 
-        return self._make_result(agent)
+    def roster_url(self, agent: AgentRow) -> tuple[str, dict | None] | None:
+        if not (agent.city and agent.state):
+            return None
+        # Office roster: the agent search filtered to one office's market
+        return f"{self.base_url}/agent/search", {
+            "location": f"{agent.city.strip()}, {agent.state.strip()}",
+            "office": agent.brokerage.strip(),
+        }
+
+    def _headers(self) -> dict:
+        headers = get_headers()
+        headers["Referer"] = self.base_url
+        return headers
 
     def _parse_page(self, html: str, agent_name: str) -> tuple[str, str]:
         soup = BeautifulSoup(html, "html.parser")
         text = soup.get_text(separator=" ")
 
-        phones = extract_phones(text)
-        emails = extract_emails(text)
+        # Prefer an email naming the agent; otherwise skip generic ones
+        skip = {"info", "contact", "admin", "support", "noreply", "help"}
 
-        # Filter emails — skip generic ones
-        agent_parts = agent_name.lower().split()
-        best_email = ""
-        for em in emails:
+        def is_personal(em: str) -> bool:
             local = em.split("@")[0]
-            if any(p in local for p in agent_parts):
-                best_email = em
-                break
-        if not best_email and emails:
-            skip = {"info", "contact", "admin", "support", "noreply", "help"}
-            for em in emails:
-                local = em.split("@")[0]
-                if not any(s in local for s in skip):
-                    best_email = em
-                    break
+            return not any(s in local for s in skip)
+
+        def names_agent(em: str) -> bool:
+            return name_in_email(em, agent_name)
 
-        phone = phones[0] if phones else ""
+        phone, best_email = first_contact(
+            text,
+            email_ok=lambda em: names_agent(em) or is_personal(em),
+            prefer=names_agent,
+        )
         return phone, best_email
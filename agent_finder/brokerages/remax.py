@@ -3,11 +3,13 @@
 Searches remax.com agent directory by agent name.
 """
 
+import re
+
 from bs4 import BeautifulSoup
 
 from .base import BaseBrokerageScraper
-from ..models import AgentRow, ContactResult
-from ..searchers.helpers import get_headers, extract_phones, extract_emails
+from ..models import AgentRow
+from ..searchers.helpers import get_headers, extract_phones, first_contact
 
 
 class ReMaxBrokerageScraper(BaseBrokerageScraper):
@@ -17,46 +19,33 @@ class ReMaxBrokerageScraper(BaseBrokerageScraper):
     max_concurrent = 2
     timeout = 15.0
 
-    async def search(self, agent: AgentRow) -> ContactResult:
-        headers = get_headers()
-        headers["Referer"] = self.base_url
-
+    def strategies(self, agent: AgentRow) -> list[tuple[str, str, dict | None]]:
         name_parts = agent.name.lower().split()
         if len(name_parts) < 2:
-            return self._make_result(agent)
-
-        # RE/MAX agent search URL
-        search_url = f"{self.base_url}/real-estate-agents"
-        params = {"query": agent.name}
-
-        try:
-            resp = await self.client.get(
-                search_url, params=params, headers=headers, timeout=self.timeout
-            )
-            if resp.status_code == 200:
-                phone, email = self._parse_results(resp.text, agent.name)
-                if phone or email:
-                    return self._make_result(agent, phone, email)
-        except Exception:
-            pass
+            return []
 
-        # Try slug-based profile
         slug = "-".join(name_parts)
-        profile_url = f"{self.base_url}/real-estate-agents/{slug}"
-        try:
-            resp = await self.client.get(
-                profile_url, headers=headers, timeout=self.timeout
-            )
-            if resp.status_code == 200:
-                phone, email = self._parse_results(resp.text, agent.name)
-                if phone or email:
-                    return self._make_result(agent, phone, email)
-        except Exception:
-            pass
-
-        return self._make_result(agent)
+        return [
+            # RE/MAX agent search URL
+            ("search", f"{self.base_url}/real-estate-agents", {"query": agent.name}),
+            # Slug-based profile
+            ("profile_slug", f"{self.base_url}/real-estate-agents/{slug}", None),
+        ]
+
+    def roster_url(self, agent: AgentRow) -> tuple[str, dict | None] | None:
+        if not (agent.city and agent.state):
+            return None
+        # City agent directory, e.g. /real-estate-agents/austin-tx
+        city = re.sub(r"[^a-z]+", "-", agent.city.lower()).strip("-")
+        state = agent.state.strip().lower()[:2]
+        return f"{self.base_url}/real-estate-agents/{city}-{state}", None
+
+    def _headers(self) -> dict:
+        headers = get_headers()
+        headers["Referer"] = self.base_url
+        return headers
 
-    def _parse_results(self, html: str, agent_name: str) -> tuple[str, str]:
+    def _parse_page(self, html: str, agent_name: str) -> tuple[str, str]:
         soup = BeautifulSoup(html, "html.parser")
 
         # Look for tel: links first
@@ -83,17 +72,17 @@ class ReMaxBrokerageScraper(BaseBrokerageScraper):
         # Fallback: extract from page text
         if not phone or not email:
             text = soup.get_text(separator=" ")
-            if not phone:
-                phones = extract_phones(text)
-                if phones:
-                    phone = phones[0]
-            if not email:
-                emails = extract_emails(text)
-                skip = {"info@", "contact@", "admin@", "support@", "noreply@"}
-                for em in emails:
-                    if not any(em.startswith(s) for s in skip):
-                        if "remax.com" not in em and "move.com" not in em:
-                            email = em
-                            break
+            skip = ("info@", "contact@", "admin@", "support@", "noreply@")
+            text_phone, text_email = first_contact(
+                text,
+                want_phone=not phone,
+                want_email=not email,
+                email_ok=lambda em: (
+                    not em.startswith(skip)
+                    and "remax.com" not in em and "move.com" not in em
+                ),
+            )
+            phone = phone or text_phone
+            email = email or text_email
 
         return phone, email
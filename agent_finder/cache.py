@@ -2,6 +2,7 @@
 
 Stores found contacts keyed by normalized (name + brokerage) hash.
 Avoids re-searching agents across jobs. TTL: 14 days.
+New entries can also be appended to a journal (see journal.py).
 """
 
 import json
@@ -10,6 +11,7 @@ import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from . import journal
 from .models import AgentRow, ContactResult, ContactStatus
 
 logger = logging.getLogger("agent_finder.cache")
@@ -22,6 +24,7 @@ class FileCache:
     def __init__(self, path: Path):
         self.path = path
         self._data: dict[str, dict] = {}
+        self._new: dict[str, dict] = {}     # entries put since the last save
         self._dirty = False
         self._load()
 
@@ -33,6 +36,13 @@ class FileCache:
                 logger.info("Cache loaded: %d entries", len(self._data))
             except (json.JSONDecodeError, OSError):
                 self._data = {}
+        for key, entry in journal.read(self.path):
+            self._merge(key, entry)
+
+    def _merge(self, key: str, entry: dict):
+        current = self._data.get(key)
+        if current is None or entry["cached_at"] > current["cached_at"]:
+            self._data[key] = entry
 
     @staticmethod
     def _key(name: str, brokerage: str) -> str:
@@ -61,7 +71,7 @@ class FileCache:
         if not result.has_contact:
             return
         key = self._key(result.agent.name, result.agent.brokerage)
-        self._data[key] = {
+        self._data[key] = self._new[key] = {
             "phone": result.phone,
             "email": result.email,
             "source": result.source,
@@ -75,11 +85,24 @@ class FileCache:
     def save(self):
         if self._dirty:
             try:
-                self.path.write_text(json.dumps(self._data), encoding="utf-8")
+                with journal.folding(self.path) as entries:
+                    for key, entry in entries:
+                        self._merge(key, entry)
+                    self.path.write_text(json.dumps(self._data), encoding="utf-8")
                 self._dirty = False
+                self._new.clear()
                 logger.info("Cache saved: %d entries", len(self._data))
             except OSError as e:
                 logger.warning("Failed to save cache: %s", e)
 
+    def save_new(self):
+        """Append the entries put since the last save to the journal."""
+        if self._new:
+            try:
+                journal.append(self.path, list(self._new.items()))
+                self._new.clear()
+            except OSError as e:
+                logger.warning("Failed to append to cache journal: %s", e)
+
     def __len__(self):
         return len(self._data)
@@ -0,0 +1,81 @@
+"""Resumable job state.
+
+A job's results reach the partial CSV one batch at a time, so a checkpoint
+is the number of agents (and CSV bytes) already written, plus the
+per-agent progress inside the batch currently being searched: the
+phases each agent finished and what it found. After a restart the job
+skips the written agents and replays that state instead of searching
+those agents again.
+"""
+
+import logging
+import time
+from typing import Callable
+
+from .models import AgentRow, ContactResult, ContactStatus
+
+logger = logging.getLogger("agent_finder.checkpoint")
+
+PHASES = ("brokerage", "search", "realtor", "email")
+SAVE_INTERVAL = 30.0    # seconds between periodic saves mid-batch
+
+
+class JobCheckpoint:
+    def __init__(self, data: dict | None, on_save: Callable[[dict], None]):
+        data = data or {}
+        self.rows_done: int = data.get("rows_done", 0)
+        self.committed_bytes: int = data.get("committed_bytes", 0)
+        # dedup key -> [phase names done, phone, email, source, status]
+        self._agents: dict[str, list] = data.get("agents", {})
+        self._on_save = on_save
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    def prior(self, key: str, agent: AgentRow) -> tuple[set[str], ContactResult] | None:
+        """Phases already run for an agent in this batch and their result."""
+        entry = self._agents.get(key)
+        if not entry:
+            return None
+        phases, phone, email, source, status = entry
+        return set(phases), ContactResult(
+            agent=agent, phone=phone, email=email, source=source, status=ContactStatus(status),
+        )
+
+    def record(self, key: str, phase: str, r: ContactResult):
+        entry = self._agents.get(key)
+        phases = entry[0] if entry else []
+        if phase not in phases:
+            phases = [*phases, phase]
+        self._agents[key] = [phases, r.phone, r.email, r.source, r.status.value]
+        self._dirty = True
+        if time.monotonic() - self._saved_at >= SAVE_INTERVAL:
+            self.save()
+
+    def batch_done(self, rows_done: int, committed_bytes: int):
+        """The batch is in the CSV: advance past it and drop per-agent state."""
+        self.rows_done = rows_done
+        self.committed_bytes = committed_bytes
+        self._agents = {}
+        self._dirty = True
+        self.save()
+
+    def restart(self):
+        """Forget all progress, so the job runs again from the first agent."""
+        self.rows_done = 0
+        self.committed_bytes = 0
+        self._agents = {}
+        self._dirty = True
+        self.save()
+
+    def to_dict(self) -> dict:
+        return {
+            "rows_done": self.rows_done,
+            "committed_bytes": self.committed_bytes,
+            "agents": self._agents,
+        }
+
+    def save(self):
+        if self._dirty:
+            self._on_save(self.to_dict())
+            self._dirty = False
+        self._saved_at = time.monotonic()
@@ -0,0 +1,148 @@
+"""Sold comps for the Underwriting page, from HomeHarvest.
+
+One scrape covers the last 12 months for a location, newest sale first,
+so a result cut off at SCRAPE_LIMIT still holds every recent sale. The
+3-, 6- and 9-month windows are cut from it locally, and the narrowest
+window with at least MIN_COMPS sales is used. Results are cached per location (the
+zip code when the address has one) for COMPS_TTL.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+
+import pandas as pd
+from homeharvest import scrape_property
+
+from . import executors
+from .single_flight import flights
+
+logger = logging.getLogger("agent_finder.comps")
+
+WINDOW_MONTHS = (3, 6, 9, 12)
+MIN_COMPS = 3
+MAX_COMPS = 5
+SCRAPE_LIMIT = 200       # sales fetched for the 12-month window
+COMPS_TTL = 6 * 3600.0
+CACHE_SIZE = 1000
+
+NO_COMPS = {"comps": [], "avgPctUnderList": 0, "avgDom": 0, "note": "No comps found"}
+
+# location -> (expiry, response)
+_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+
+def _scrape(location: str) -> pd.DataFrame | None:
+    end = date.today()
+    start = end - timedelta(days=WINDOW_MONTHS[-1] * 30)
+    return scrape_property(
+        location=location,
+        listing_type="sold",
+        date_from=start.strftime("%Y-%m-%d"),
+        date_to=end.strftime("%Y-%m-%d"),
+        limit=SCRAPE_LIMIT,
+        # The limit keeps the newest sales, which the narrow windows need
+        sort_by="sold_date",
+        sort_direction="desc",
+    )
+
+
+def _coalesce(df: pd.DataFrame, *columns: str) -> pd.Series:
+    """First non-zero numeric value across `columns`, per row (NaN if none)."""
+    out = pd.Series(float("nan"), index=df.index)
+    for column in columns:
+        if column in df:
+            values = pd.to_numeric(df[column], errors="coerce")
+            out = out.fillna(values.where(values != 0))
+    return out
+
+
+def _text(df: pd.DataFrame, *columns: str) -> pd.Series:
+    out = pd.Series("", index=df.index)
+    for column in columns:
+        if column in df:
+            values = df[column].fillna("").astype(str)
+            out = out.where(out != "", values)
+    return out
+
+
+def select_comps(df: pd.DataFrame, today: date | None = None) -> pd.DataFrame:
+    """Up to MAX_COMPS sales from the narrowest window with MIN_COMPS of them.
+
+    If no window has that many, the widest window with any sales is used.
+    Sales without a sold date only count toward the 12-month window.
+    """
+    list_price = _coalesce(df, "list_price", "price").fillna(0.0)
+    sold_price = _coalesce(df, "sold_price", "close_price").fillna(list_price)
+    sold_on = (
+        pd.to_datetime(df["last_sold_date"], errors="coerce", utc=True).dt.tz_localize(None)
+        if "last_sold_date" in df else pd.Series(pd.NaT, index=df.index)
+    )
+    frame = pd.DataFrame({
+        "address": (_text(df, "full_street_line", "street") + ", " + _text(df, "city")).str.strip(", "),
+        "listPrice": list_price,
+        "soldPrice": sold_price,
+        "pctUnderList": ((list_price - sold_price) / list_price * 100).round(1),
+        "dom": _coalesce(df, "days_on_market", "dom").fillna(0).astype(int),
+        "age_days": (pd.Timestamp(today or date.today()) - sold_on).dt.days,
+    })[list_price > 0]
+    frame = frame.sort_values("age_days", na_position="last", kind="stable")
+
+    chosen = frame.iloc[:0]
+    for months in WINDOW_MONTHS:
+        window = frame if months == WINDOW_MONTHS[-1] else frame[frame["age_days"] <= months * 30]
+        if len(window) >= MIN_COMPS:
+            return window.head(MAX_COMPS)
+        if len(window):
+            chosen = window
+    return chosen
+
+
+def _response(comps: pd.DataFrame) -> dict:
+    if comps.empty:
+        return NO_COMPS
+    return {
+        "comps": [
+            {
+                "address": address,
+                "listPrice": float(lp),
+                "soldPrice": float(sp),
+                "pctUnderList": float(pct),
+                "dom": int(dom),
+            }
+            for address, lp, sp, pct, dom in zip(
+                comps["address"], comps["listPrice"], comps["soldPrice"],
+                comps["pctUnderList"], comps["dom"],
+            )
+        ],
+        "avgPctUnderList": round(float(comps["pctUnderList"].mean()), 1),
+        "avgDom": round(float(comps["dom"].mean())),
+    }
+
+
+async def _compute(location: str) -> dict:
+    try:
+        df = await executors.run("comps", _scrape, location)
+        response = _response(select_comps(df)) if df is not None and len(df) else NO_COMPS
+    except executors.ExecutorFull:
+        raise
+    except Exception as e:
+        # Not cached: the next request tries again
+        logger.warning("Comp scrape failed for %s: %s", location, e)
+        return NO_COMPS
+
+    _cache[location] = (time.monotonic() + COMPS_TTL, response)
+    _cache.move_to_end(location)
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return response
+
+
+async def find_comps(location: str) -> dict:
+    """Comps response for a zip code or address, from the cache when fresh."""
+    cached = _cache.get(location)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    # Concurrent requests for the same location share one scrape
+    return await flights.do(("comps", location), lambda: _compute(location))
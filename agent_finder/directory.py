@@ -0,0 +1,257 @@
+"""Local agent directory with fuzzy name lookup.
+
+Every contact the pipeline finds is also recorded here with its name
+tokens, canonical franchise, city/state and contact info. Unlike the
+exact-key cache, lookups tolerate spelling and brokerage-string variants:
+candidates at the same franchise share the last name, or the first name
+and last initial, and are ranked by trigram similarity of the full name.
+
+Records live in parallel lists and postings in compact int arrays so a
+few hundred thousand agents fit comfortably in memory. New records are
+appended to a journal (see journal.py), which is folded into the JSON
+snapshot once it grows past FOLD_BYTES.
+"""
+
+import json
+import logging
+import re
+import sys
+from array import array
+from functools import lru_cache
+from pathlib import Path
+
+from . import journal
+from .models import AgentRow, ContactResult, ContactStatus
+from .searchers.brokerage_router import identify_franchise
+from .searchers.helpers import NAME_SUFFIXES
+
+logger = logging.getLogger("agent_finder.directory")
+
+MIN_CONFIDENCE = 0.85      # similarity needed to trust a directory hit
+MIN_MARGIN = 0.05          # best match must beat a different contact by this much
+STATE_MISMATCH_PENALTY = 0.3
+CITY_MATCH_BONUS = 0.05
+FOLD_BYTES = 1_000_000     # journal size at which a save rewrites the snapshot
+
+
+def _name_tokens(name: str) -> list[str]:
+    tokens = []
+    for raw in name.lower().replace("-", " ").split():
+        token = re.sub(r"[^a-z]", "", raw)
+        if token and token not in NAME_SUFFIXES:
+            tokens.append(token)
+    return tokens
+
+
+def canonical_brokerage(brokerage: str) -> str:
+    """Franchise key, or the cleaned brokerage name for independents."""
+    franchise = identify_franchise(brokerage)
+    if franchise:
+        return franchise
+    cleaned = re.sub(r",?\s*\b(llc|inc|corp|ltd|co)\b\.?", "", brokerage.lower())
+    return re.sub(r"[^a-z0-9]+", " ", cleaned).strip()
+
+
+@lru_cache(maxsize=200_000)
+def _token_trigrams(token: str) -> frozenset[str]:
+    padded = f"  {token} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _blocking_keys(tokens: list[str]) -> set[str]:
+    """Index keys of a name: the last name, and the first name with the
+    last initial. A misspelling in either half still shares one key,
+    while a common first name alone doesn't pull in every namesake."""
+    first, last = tokens[0], tokens[-1]
+    return {last, f"{first} {last[0]}"}
+
+
+def _trigrams(name: str) -> frozenset[str]:
+    """Trigrams of each name word, padded per word (as pg_trgm does)."""
+    grams = frozenset()
+    for token in name.split():
+        grams = grams | _token_trigrams(token)
+    return grams
+
+
+def _similarity(a: frozenset[str], b: frozenset[str]) -> float:
+    """Dice coefficient of two trigram sets."""
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+class AgentDirectory:
+    def __init__(self, path: Path):
+        self.path = path
+        self._new: list[tuple] = []     # records added since the last save
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        # Parallel record columns, indexed by record id
+        self._names: list[str] = []
+        self._brokerages: list[str] = []
+        self._cities: list[str] = []
+        self._states: list[str] = []
+        self._phones: list[str] = []
+        self._emails: list[str] = []
+        # (blocking key, brokerage) -> record ids
+        self._postings: dict[tuple[str, str], array] = {}
+
+    def _load(self):
+        self._load_snapshot()
+        for record in journal.read(self.path):
+            self._merge(*record)
+
+    def _load_snapshot(self):
+        if self.path.exists():
+            try:
+                raw = self.path.read_text(encoding="utf-8")
+                for record in (json.loads(raw) if raw.strip() else []):
+                    self._append(*record)
+                logger.info("Agent directory loaded: %d agents", len(self))
+            except (json.JSONDecodeError, OSError, TypeError):
+                self._reset()
+
+    def _append(self, name: str, brokerage: str, city: str, state: str, phone: str, email: str) -> int:
+        rid = len(self._names)
+        self._names.append(name)
+        self._brokerages.append(sys.intern(brokerage))
+        self._cities.append(sys.intern(city))
+        self._states.append(sys.intern(state))
+        self._phones.append(phone)
+        self._emails.append(email)
+        brokerage = self._brokerages[rid]
+        for key in _blocking_keys(name.split()):
+            self._postings.setdefault((sys.intern(key), brokerage), array("I")).append(rid)
+        return rid
+
+    def _candidates(self, tokens: list[str], brokerage: str) -> set[int]:
+        """Records at the same brokerage sharing a blocking key."""
+        ids: set[int] = set()
+        for key in _blocking_keys(tokens):
+            ids.update(self._postings.get((key, brokerage), ()))
+        return ids
+
+    def add(self, result: ContactResult):
+        """Record a found contact, updating an existing entry for the same agent."""
+        if not result.has_contact:
+            return
+        agent = result.agent
+        tokens = _name_tokens(agent.name)
+        if len(tokens) < 2:
+            return
+        name = " ".join(tokens)
+        brokerage = canonical_brokerage(agent.brokerage)
+        city = agent.city.strip().lower()
+        state = agent.state.strip().upper()[:2]
+        record = (name, brokerage, city, state, result.phone, result.email)
+        self._merge(*record)
+        self._new.append(record)
+
+    def _merge(self, name: str, brokerage: str, city: str, state: str, phone: str, email: str):
+        # The same name always shares the last-name key
+        for rid in self._postings.get((name.split()[-1], brokerage), ()):
+            if self._names[rid] == name and self._states[rid] in ("", state):
+                self._phones[rid] = phone or self._phones[rid]
+                self._emails[rid] = email or self._emails[rid]
+                self._cities[rid] = self._cities[rid] or sys.intern(city)
+                self._states[rid] = self._states[rid] or sys.intern(state)
+                return
+
+        self._append(name, brokerage, city, state, phone, email)
+
+    def lookup(self, agent: AgentRow) -> tuple[ContactResult | None, float]:
+        """Best directory match for an agent and its confidence (0-1).
+
+        Returns (None, confidence) when nothing clears MIN_CONFIDENCE or
+        two different contacts match about equally well.
+        """
+        tokens = _name_tokens(agent.name)
+        if len(tokens) < 2:
+            return None, 0.0
+        name = " ".join(tokens)
+        query = None
+        brokerage = canonical_brokerage(agent.brokerage)
+        city = agent.city.strip().lower()
+        state = agent.state.strip().upper()[:2]
+
+        # A name with n chars has n + 1 trigrams, so Dice can't exceed
+        # 2 * min / sum of those counts; skip candidates that can't qualify.
+        floor = MIN_CONFIDENCE - CITY_MATCH_BONUS
+        n = len(name) + 1
+
+        best_id, best, runner_up = -1, 0.0, 0.0
+        for rid in self._candidates(tokens, brokerage):
+            other = self._names[rid]
+            if other == name:
+                score = 1.0
+            else:
+                m = len(other) + 1
+                if 2 * min(n, m) / (n + m) < floor:
+                    continue
+                query = query or _trigrams(name)
+                score = _similarity(query, _trigrams(other))
+            if state and self._states[rid] and self._states[rid] != state:
+                score -= STATE_MISMATCH_PENALTY
+            elif city and self._cities[rid] == city:
+                score = min(1.0, score + CITY_MATCH_BONUS)
+            if best_id < 0:
+                best_id, best = rid, score
+            elif score > best:
+                if not self._same_contact(rid, best_id):
+                    runner_up = best
+                best_id, best = rid, score
+            elif score > runner_up and not self._same_contact(rid, best_id):
+                runner_up = score
+
+        if best_id < 0 or best < MIN_CONFIDENCE or best - runner_up < MIN_MARGIN:
+            return None, best
+        return ContactResult(
+            agent=agent,
+            phone=self._phones[best_id],
+            email=self._emails[best_id],
+            source="directory",
+            status=ContactStatus.FOUND,
+        ), best
+
+    def _same_contact(self, a: int, b: int) -> bool:
+        return self._phones[a] == self._phones[b] and self._emails[a] == self._emails[b]
+
+    def save(self):
+        """Append the new records to the journal, and fold the journal into
+        the snapshot once it has grown past FOLD_BYTES.
+
+        The fold rebuilds from the snapshot on disk rather than this
+        process's copy, so records other jobs saved meanwhile are kept.
+        """
+        self.save_new()
+        if self._new or journal.size(self.path) < FOLD_BYTES:
+            return
+        try:
+            with journal.folding(self.path) as records:
+                self._reset()
+                self._load_snapshot()
+                for record in records:
+                    self._merge(*record)
+                records = list(zip(
+                    self._names, self._brokerages, self._cities,
+                    self._states, self._phones, self._emails,
+                ))
+                self.path.write_text(json.dumps(records, separators=(",", ":")), encoding="utf-8")
+            logger.info("Agent directory saved: %d agents", len(self))
+        except OSError as e:
+            logger.warning("Failed to save agent directory: %s", e)
+
+    def save_new(self):
+        """Append the records added since the last save to the journal."""
+        if self._new:
+            try:
+                journal.append(self.path, self._new)
+                self._new.clear()
+            except OSError as e:
+                logger.warning("Failed to append to agent directory journal: %s", e)
+
+    def __len__(self):
+        return len(self._names)
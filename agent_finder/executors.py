@@ -0,0 +1,124 @@
+"""Named thread pools for blocking work, one per workload.
+
+DDG searches, DNS/MX lookups, the HomeHarvest comps scrape and the
+diagnostics endpoint all block a thread. On the shared default executor,
+a burst of one could starve the others: ten comps requests would hold
+every thread while a job's DDG queries waited behind them. Each
+workload gets its own pool here. Pools for request-driven work also
+have a queue limit, so a burst is turned away instead of piling up.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from .metrics import LatencyTracker
+
+logger = logging.getLogger("agent_finder.executors")
+
+# name -> (threads, max queued calls or None for unbounded)
+POOLS: dict[str, tuple[int, int | None]] = {
+    "search": (8, None),       # ddgs queries; the DDG budget already paces them
+    "dns": (16, None),         # getaddrinfo and MX lookups
+    "comps": (2, 8),           # HomeHarvest scrapes for /api/comps
+    "diagnostics": (1, 2),     # /api/test-search
+}
+
+T = TypeVar("T")
+
+# Time calls spent queued, and running, per pool
+wait_latency = LatencyTracker()
+run_latency = LatencyTracker()
+
+
+class ExecutorFull(RuntimeError):
+    """The pool's queue limit is reached."""
+
+
+class BoundedExecutor:
+    def __init__(self, name: str, threads: int, max_queue: int | None = None):
+        self.name = name
+        self.threads = threads
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(threads, thread_name_prefix=f"agent-finder-{name}")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def submit(self, fn: Callable[..., T], *args) -> "asyncio.Future[T]":
+        """Run `fn(*args)` on this pool; raises ExecutorFull if its queue is full."""
+        with self._lock:
+            if self.max_queue is not None and self._queued >= self.max_queue:
+                self._rejected += 1
+                raise ExecutorFull(f"{self.name} executor is busy")
+            self._queued += 1
+        submitted = time.monotonic()
+
+        def call() -> T:
+            started = time.monotonic()
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+            wait_latency.record(self.name, started - submitted)
+            try:
+                return fn(*args)
+            finally:
+                run_latency.record(self.name, time.monotonic() - started)
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+
+        def on_done(f: Future):
+            # A call cancelled before it started never ran `call`
+            if f.cancelled():
+                with self._lock:
+                    self._queued -= 1
+
+        future = self._pool.submit(call)
+        future.add_done_callback(on_done)
+        return asyncio.wrap_future(future)
+
+    def report(self) -> dict:
+        with self._lock:
+            return {
+                "threads": self.threads,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": self._queued,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+executors = {name: BoundedExecutor(name, threads, queue) for name, (threads, queue) in POOLS.items()}
+
+
+def run(name: str, fn: Callable[..., T], *args) -> "asyncio.Future[T]":
+    """Run blocking `fn(*args)` on the `name` pool and await its result."""
+    return executors[name].submit(fn, *args)
+
+
+def report() -> dict[str, dict]:
+    waits = wait_latency.report()
+    runs = run_latency.report()
+    return {
+        name: {
+            **executor.report(),
+            "wait": waits.get(name),
+            "run": runs.get(name),
+        }
+        for name, executor in executors.items()
+    }
+
+
+def shutdown():
+    for executor in executors.values():
+        executor.shutdown()
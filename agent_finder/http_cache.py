@@ -0,0 +1,242 @@
+"""On-disk HTTP cache for scraped pages.
+
+Profile and roster pages change rarely, but every job fetched them again
+in full. The cache is an httpx transport, keyed by URL, that keeps
+zlib-compressed 200 bodies in SQLite together with their ETag and
+Last-Modified headers:
+
+- a page checked within FRESH_FOR is served without a request;
+- an older one is revalidated with If-None-Match / If-Modified-Since,
+  and a 304 answer is served from the stored body;
+- a 404 is remembered for NEGATIVE_TTL, so guessed profile slugs that
+  don't exist aren't requested again by every job.
+
+Only requests that go to the network take the unit of work's rate-limit
+slot (`rate_limiter.current_slot`). SQLite and zlib work runs in a
+thread, off the event loop.
+
+`parse_once` skips re-parsing a body that was already parsed, which is
+what a cache hit or 304 returns.
+"""
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Callable, TypeVar
+
+import httpx
+
+from .rate_limiter import current_slot
+from .retry import off_the_clock
+
+logger = logging.getLogger("agent_finder.http_cache")
+
+FRESH_FOR = 3600.0                 # seconds a page is served without revalidating
+NEGATIVE_TTL = 3 * 86400.0         # seconds a 404 is trusted
+MAX_AGE = 30 * 86400.0             # entries not checked for this long are pruned
+MAX_BODY = 2 * 1024 * 1024         # larger bodies aren't stored
+PARSE_MEMO_SIZE = 4096
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url           TEXT PRIMARY KEY,
+    status        INTEGER NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    content_type  TEXT,
+    body          BLOB,
+    checked_at    REAL NOT NULL
+);
+"""
+
+T = TypeVar("T")
+
+
+class HttpCache:
+    def __init__(self, path: Path):
+        self.path = path
+        self.stats: Counter = Counter()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self.prune()
+
+    def get(self, url: str) -> dict | None:
+        """The stored entry for `url`, with its body decompressed."""
+        with self._lock:
+            row = self._db.execute("SELECT * FROM responses WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry["body"] = zlib.decompress(entry["body"]) if entry["body"] is not None else b""
+        return entry
+
+    def put(self, url: str, resp: httpx.Response):
+        body = zlib.compress(resp.content, 6) if resp.status_code == 200 else None
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url, resp.status_code, resp.headers.get("etag"),
+                    resp.headers.get("last-modified"), resp.headers.get("content-type"),
+                    body, time.time(),
+                ),
+            )
+
+    def touch(self, url: str):
+        with self._lock:
+            self._db.execute("UPDATE responses SET checked_at = ? WHERE url = ?", (time.time(), url))
+
+    def prune(self):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM responses WHERE checked_at < ? OR (status = 404 AND checked_at < ?)",
+                (now - MAX_AGE, now - NEGATIVE_TTL),
+            )
+
+    def report(self) -> dict:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT status, COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM responses GROUP BY status"
+            ).fetchall()
+        return {
+            "entries": {str(status): n for status, n, _ in rows},
+            "stored_bytes": sum(size for _, _, size in rows),
+            "requests": dict(self.stats),
+        }
+
+
+def _replay(entry: dict, request: httpx.Request, outcome: str) -> httpx.Response:
+    """A response rebuilt from a stored entry."""
+    headers = {
+        name: value
+        for name, value in (
+            ("content-type", entry["content_type"]),
+            ("etag", entry["etag"]),
+            ("last-modified", entry["last_modified"]),
+        )
+        if value
+    }
+    return httpx.Response(
+        entry["status"], headers=headers, content=entry["body"], request=request,
+        extensions={"http_cache": outcome},
+    )
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """Wraps a transport with the on-disk cache for GET requests."""
+
+    def __init__(self, cache: HttpCache, transport: httpx.AsyncBaseTransport):
+        self.cache = cache
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return await self.transport.handle_async_request(request)
+
+        url = str(request.url)
+        entry = await asyncio.to_thread(self.cache.get, url)
+        if entry is not None:
+            age = time.time() - entry["checked_at"]
+            if entry["status"] == 404 and age < NEGATIVE_TTL:
+                self.cache.stats["negative_hit"] += 1
+                return _replay(entry, request, "negative_hit")
+            if entry["status"] == 200 and age < FRESH_FOR:
+                self.cache.stats["hit"] += 1
+                return _replay(entry, request, "hit")
+            if entry["status"] == 200:
+                if entry["etag"]:
+                    request.headers["If-None-Match"] = entry["etag"]
+                if entry["last_modified"]:
+                    request.headers["If-Modified-Since"] = entry["last_modified"]
+
+        slot = current_slot.get()
+        waited = 0.0
+        if slot is not None and not slot.taken:
+            start = time.monotonic()
+            await off_the_clock(slot.take())
+            waited = time.monotonic() - start
+
+        resp = await self.transport.handle_async_request(request)
+        # Lets the caller's timing leave out the wait for the slot
+        resp.extensions["slot_wait"] = waited
+        if resp.status_code == 304 and entry is not None and entry["status"] == 200:
+            await resp.aclose()
+            await asyncio.to_thread(self.cache.touch, url)
+            self.cache.stats["revalidated"] += 1
+            replayed = _replay(entry, request, "revalidated")
+            replayed.extensions["slot_wait"] = waited
+            return replayed
+        if resp.status_code not in (200, 404):
+            self.cache.stats["uncached"] += 1
+            return resp
+
+        try:
+            await resp.aread()
+        finally:
+            await resp.aclose()
+        # The body is decoded now; the rebuilt response must not decode it again
+        headers = [
+            (name, value) for name, value in resp.headers.multi_items()
+            if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        fresh = httpx.Response(
+            resp.status_code, headers=headers, content=resp.content, request=request,
+            extensions={**resp.extensions, "http_cache": "miss"},
+        )
+        if len(resp.content) <= MAX_BODY:
+            await asyncio.to_thread(self.cache.put, url, fresh)
+        self.cache.stats["miss"] += 1
+        return fresh
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+_caches: dict[Path, HttpCache] = {}
+_caches_lock = threading.Lock()
+
+
+def open_cache(path: Path) -> HttpCache:
+    """The process-wide cache stored at `path`."""
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = HttpCache(path)
+        return _caches[path]
+
+
+def transport(path: Path, inner: httpx.AsyncBaseTransport) -> CachingTransport:
+    """`inner` behind the cache at `path`."""
+    return CachingTransport(open_cache(path), inner)
+
+
+# ── Parse memo ──
+
+_parsed: OrderedDict = OrderedDict()
+_parsed_lock = threading.Lock()
+
+
+def parse_once(resp: httpx.Response, key: str, parse: Callable[[str], T]) -> T:
+    """`parse(resp.text)`, reusing the result for a body already parsed
+    under the same `key` (e.g. the agent name the page is matched against)."""
+    memo_key = (hashlib.blake2b(resp.content, digest_size=16).digest(), key)
+    with _parsed_lock:
+        if memo_key in _parsed:
+            _parsed.move_to_end(memo_key)
+            return _parsed[memo_key]
+    result = parse(resp.text)
+    with _parsed_lock:
+        _parsed[memo_key] = result
+        if len(_parsed) > PARSE_MEMO_SIZE:
+            _parsed.popitem(last=False)
+    return result
@@ -2,9 +2,12 @@
 
 import csv
 import logging
+import sys
+from itertools import islice
 from pathlib import Path
+from typing import Callable, Iterator
 
-from .models import AgentRow
+from .models import AgentRow, ColumnTable
 
 logger = logging.getLogger("agent_finder.input")
 
@@ -30,86 +33,158 @@ def _detect_column(headers: list[str], candidates: set[str]) -> str | None:
     return None
 
 
+def _row_builder(headers: list[str]) -> Callable[[list, int], AgentRow | None]:
+    """Detect the agent columns in `headers` and return a function that turns
+    one row of cell values into an AgentRow (or None for rows without a name)."""
+    name_col = _detect_column(headers, NAME_COLUMNS)
+    broker_col = _detect_column(headers, BROKER_COLUMNS)
+    addr_col = _detect_column(headers, ADDRESS_COLUMNS)
+    city_col = _detect_column(headers, CITY_COLUMNS)
+    state_col = _detect_column(headers, STATE_COLUMNS)
+    zip_col = _detect_column(headers, ZIP_COLUMNS)
+    price_col = _detect_column(headers, PRICE_COLUMNS)
+
+    if not name_col:
+        raise ValueError(
+            f"Could not find agent name column. Headers: {headers}. "
+            f"Expected one of: {NAME_COLUMNS}"
+        )
+
+    # Duplicate headers resolve to the last occurrence, as csv.DictReader does
+    position = {h: i for i, h in enumerate(headers)}
+    known_cols = {name_col, broker_col, addr_col, city_col, state_col, zip_col, price_col}
+    extra_cols = [(h, position[h]) for h in position if h not in known_cols]
+    columns = ColumnTable([h for h, _ in extra_cols])
+    extra_i = [j for _, j in extra_cols]
+    name_i = position[name_col]
+    field_i = [
+        position[col] if col else None
+        for col in (broker_col, addr_col, city_col, state_col, zip_col, price_col)
+    ]
+    width = len(headers)
+
+    def build(values: list, i: int) -> AgentRow | None:
+        if len(values) < width:
+            values = list(values) + [""] * (width - len(values))
+        name = (values[name_i] or "").strip()
+        if not name:
+            return None
+        brokerage, address, city, state, zip_code, list_price = (
+            (values[j] or "").strip() if j is not None else "" for j in field_i
+        )
+        return AgentRow(
+            name=name,
+            brokerage=brokerage,
+            address=address,
+            city=city,
+            state=state,
+            zip_code=zip_code,
+            list_price=list_price,
+            row_index=i,
+            # Interned so repeated cell values (statuses, types, ...) share one string
+            extra_values=tuple(sys.intern(values[j] or "") for j in extra_i),
+            columns=columns,
+        )
+
+    return build
+
+
+def iter_csv(file_path: str) -> Iterator[AgentRow]:
+    """Yield AgentRows from a CSV file one at a time."""
+    count = 0
+    with open(file_path, "r", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        headers = next(reader, None) or []
+        build = _row_builder(headers)
+
+        # Blank lines are skipped without consuming a row index
+        for i, values in enumerate(row for row in reader if row):
+            agent = build(values, i)
+            if agent:
+                count += 1
+                yield agent
+
+    logger.info("Parsed %d agent rows from %s", count, file_path)
+
+
 def read_csv(file_path: str) -> list[AgentRow]:
     """Read a CSV file and return AgentRow list."""
-    rows = []
-    with open(file_path, "r", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-        headers = reader.fieldnames or []
-
-        name_col = _detect_column(headers, NAME_COLUMNS)
-        broker_col = _detect_column(headers, BROKER_COLUMNS)
-        addr_col = _detect_column(headers, ADDRESS_COLUMNS)
-        city_col = _detect_column(headers, CITY_COLUMNS)
-        state_col = _detect_column(headers, STATE_COLUMNS)
-        zip_col = _detect_column(headers, ZIP_COLUMNS)
-        price_col = _detect_column(headers, PRICE_COLUMNS)
-
-        if not name_col:
-            raise ValueError(
-                f"Could not find agent name column. Headers: {headers}. "
-                f"Expected one of: {NAME_COLUMNS}"
-            )
-
-        known_cols = {name_col, broker_col, addr_col, city_col, state_col, zip_col, price_col}
-
-        for i, row in enumerate(reader):
-            name = (row.get(name_col) or "").strip()
-            if not name:
-                continue
-
-            extra = {k: v for k, v in row.items() if k not in known_cols and k is not None}
-
-            rows.append(AgentRow(
-                name=name,
-                brokerage=(row.get(broker_col) or "").strip() if broker_col else "",
-                address=(row.get(addr_col) or "").strip() if addr_col else "",
-                city=(row.get(city_col) or "").strip() if city_col else "",
-                state=(row.get(state_col) or "").strip() if state_col else "",
-                zip_code=(row.get(zip_col) or "").strip() if zip_col else "",
-                list_price=(row.get(price_col) or "").strip() if price_col else "",
-                row_index=i,
-                extra_columns=extra,
-            ))
-
-    logger.info("Parsed %d agent rows from %s", len(rows), file_path)
-    return rows
+    return list(iter_csv(file_path))
 
 
-def read_excel(file_path: str) -> list[AgentRow]:
-    """Read an Excel file and return AgentRow list."""
+def iter_excel(file_path: str) -> Iterator[AgentRow]:
+    """Yield AgentRows straight from an Excel sheet's rows, one at a time."""
     import openpyxl
     wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
-    ws = wb.active
-
-    rows_iter = ws.iter_rows(values_only=True)
-    header_row = next(rows_iter, None)
-    if not header_row:
-        raise ValueError("Excel file is empty.")
+    try:
+        rows_iter = wb.active.iter_rows(values_only=True)
+        header_row = next(rows_iter, None)
+        if not header_row:
+            raise ValueError("Excel file is empty.")
 
-    headers = [str(h).strip() if h else "" for h in header_row]
+        headers = [str(h).strip() if h else "" for h in header_row]
+        build = _row_builder(headers)
 
-    import tempfile
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8") as tmp:
-        writer = csv.DictWriter(tmp, fieldnames=headers)
-        writer.writeheader()
-        for row in rows_iter:
+        count = 0
+        for i, row in enumerate(rows_iter):
             values = [str(v).strip() if v is not None else "" for v in row]
-            writer.writerow(dict(zip(headers, values)))
-        tmp_path = tmp.name
+            agent = build(values, i)
+            if agent:
+                count += 1
+                yield agent
+        logger.info("Parsed %d agent rows from %s", count, file_path)
+    finally:
+        wb.close()
 
-    wb.close()
-    result = read_csv(tmp_path)
-    Path(tmp_path).unlink(missing_ok=True)
-    return result
 
+def read_excel(file_path: str) -> list[AgentRow]:
+    """Read an Excel file and return AgentRow list."""
+    return list(iter_excel(file_path))
 
-def read_input(file_path: str) -> list[AgentRow]:
-    """Read CSV or Excel file, auto-detecting format."""
+
+def iter_input(file_path: str) -> Iterator[AgentRow]:
+    """Yield AgentRows from a CSV or Excel file, auto-detecting format."""
     ext = Path(file_path).suffix.lower()
     if ext == ".csv":
-        return read_csv(file_path)
+        return iter_csv(file_path)
     elif ext in (".xlsx", ".xls"):
-        return read_excel(file_path)
+        return iter_excel(file_path)
     else:
         raise ValueError(f"Unsupported file type: {ext}")
+
+
+def iter_batches(file_path: str, batch_size: int, skip: int = 0) -> Iterator[list[AgentRow]]:
+    """Yield lists of up to `batch_size` AgentRows as the file is parsed,
+    after skipping the first `skip` agents (already handled by a resumed job)."""
+    batch: list[AgentRow] = []
+    for agent in islice(iter_input(file_path), skip, None):
+        batch.append(agent)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def estimate_rows(file_path: str) -> int:
+    """Cheap upper-bound row count (blank-name rows included) without parsing."""
+    ext = Path(file_path).suffix.lower()
+    if ext == ".csv":
+        lines = 0
+        with open(file_path, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                lines += chunk.count(b"\n")
+        return max(lines - 1, 0)
+    elif ext in (".xlsx", ".xls"):
+        import openpyxl
+        wb = openpyxl.load_workbook(file_path, read_only=True)
+        try:
+            return max((wb.active.max_row or 1) - 1, 0)
+        finally:
+            wb.close()
+    return 0
+
+
+def read_input(file_path: str) -> list[AgentRow]:
+    """Read CSV or Excel file, auto-detecting format."""
+    return list(iter_input(file_path))
@@ -0,0 +1,196 @@
+"""Run one uploaded job end to end.
+
+Shared by the web process (in-process mode) and worker processes: parse
+the upload in the background, run the pipeline batch by batch, append
+results to the partial CSV, checkpoint, and keep the job store current.
+Events for the job's progress channel go to a `publish` callback.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import traceback
+from contextlib import aclosing
+from pathlib import Path
+from typing import Callable
+
+from .checkpoint import JobCheckpoint
+from .input_handler import iter_batches
+from .job_store import JobStore
+from .output_handler import IncrementalCsvWriter, preview_rows
+from .pipeline import BATCH_SIZE, run_pipeline_batches
+from .rate_limiter import current_share, job_share, scheduler
+from .retry import RetryBudget, current_budget
+
+logger = logging.getLogger("agent_finder.job_runner")
+
+PREVIEW_ROWS = 30
+TERMINAL_EVENTS = ("complete", "error", "cancelled")
+
+
+async def parsed_batches(batches, first_batch=None, name: str = "parse"):
+    """Feed parsed batches to the pipeline while the rest of the file is parsed.
+
+    A background thread parses ahead into a small bounded queue, so searching
+    starts right away without the whole upload sitting in memory.
+    """
+    pending: queue.Queue = queue.Queue(maxsize=2)
+    stop = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                pending.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def take():
+        while not stop.is_set():
+            try:
+                return pending.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        return done
+
+    def produce():
+        try:
+            for batch in batches:
+                if not put(batch):
+                    return
+        except Exception as e:
+            put(e)
+        else:
+            put(done)
+
+    threading.Thread(target=produce, name=name, daemon=True).start()
+    try:
+        if first_batch:
+            yield first_batch
+        while (item := await asyncio.to_thread(take)) is not done:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Let the parser thread exit if the job stops mid-file
+        stop.set()
+
+
+def terminal_event(job: dict) -> dict:
+    if job["status"] == "complete":
+        return {"type": "complete", "summary": job["summary"], "preview_rows": job["preview_rows"]}
+    if job["status"] == "error":
+        return {"type": "error", "message": job["error"]}
+    return {"type": "cancelled"}
+
+
+async def execute_job(
+    job: dict,
+    store: JobStore,
+    data_dir: Path,
+    publish: Callable[[dict], None],
+    batches=None,
+    first_batch=None,
+    shutting_down: Callable[[], bool] = lambda: False,
+):
+    """Run a job from its row in the job store until it completes, fails or is cancelled.
+
+    Without `batches` the upload is parsed from the start, skipping agents
+    an earlier run already wrote. Cancelling while `shutting_down()` is true
+    checkpoints the job and leaves it "running" for the next start to resume.
+    """
+    job_id = job["job_id"]
+    last_progress = job.get("last_progress")
+    # Every source request this job makes is scheduled under its share
+    # and retried within its own budget
+    current_share.set(job_share(job_id, job["total"]))
+    current_budget.set(RetryBudget())
+
+    def update(**fields):
+        job.update(fields)
+        store.update(job_id, **fields)
+
+    def on_progress(data: dict):
+        nonlocal last_progress
+        data["type"] = "progress"
+        data["total"] = max(data["total"], job["total"])
+        last_progress = data
+        publish(data)
+
+    checkpoint = JobCheckpoint(
+        job.get("checkpoint"), lambda data: store.update(job_id, checkpoint=data),
+    )
+    writer = IncrementalCsvWriter(str(data_dir / f"{job_id}_results.csv"))
+    try:
+        writer.resume(checkpoint.committed_bytes)
+    except FileNotFoundError as e:
+        # Skipping the checkpointed rows would silently drop them from the results
+        logger.warning("Job %s: %s; starting over", job_id, e)
+        checkpoint.restart()
+    update(partial_path=writer.partial_path)
+    preview = preview_rows(writer.partial_path, PREVIEW_ROWS) if writer.rows_written else []
+
+    def on_batch(results):
+        writer.write(results)
+        checkpoint.batch_done(writer.rows_written, writer.committed_bytes)
+        for r in results[:PREVIEW_ROWS - len(preview)]:
+            preview.append({
+                "name": r.agent.name,
+                "brokerage": r.agent.brokerage,
+                "address": r.agent.address,
+                "phone": r.phone,
+                "email": r.email,
+                "status": r.status.value,
+                "source": r.source,
+            })
+        update(committed_bytes=writer.committed_bytes, rows_written=writer.rows_written)
+
+    try:
+        if batches is None:
+            if not Path(job["upload_path"] or "").exists():
+                raise FileNotFoundError(f"Upload file is gone: {job['upload_path']}")
+            if checkpoint.rows_done:
+                logger.info("Resuming job %s after %d agents", job_id, checkpoint.rows_done)
+            batches = iter_batches(job["upload_path"], BATCH_SIZE, skip=checkpoint.rows_done)
+
+        async with aclosing(parsed_batches(batches, first_batch, f"parse-{job_id}")) as agent_batches:
+            await run_pipeline_batches(
+                agent_batches, on_batch,
+                progress_callback=on_progress,
+                checkpoint=checkpoint,
+                completed=writer.rows_written,
+                found=writer.counts.found,
+                deadline=float(job["deadline"]) if job.get("deadline") else None,
+            )
+
+        update(
+            status="complete",
+            result_path=writer.finalize(),
+            partial_path=None,
+            summary=writer.counts.summary(),
+            preview_rows=preview,
+        )
+
+    except asyncio.CancelledError:
+        if shutting_down():
+            # Still "running" in the store, so the next start resumes it
+            checkpoint.save()
+            logger.info("Job %s checkpointed at %d agents for shutdown", job_id, checkpoint.rows_done)
+        else:
+            update(status="cancelled")
+
+    except Exception as e:
+        tb = traceback.format_exc()
+        logger.error("Job %s failed: %s\n%s", job_id, e, tb)
+        update(status="error", error=f"{e}\n\nTraceback:\n{tb}")
+
+    finally:
+        # Keeps the partial file on error/cancel so finished rows stay downloadable
+        writer.close()
+        scheduler.release(job_id)
+        store.update(job_id, last_progress=last_progress)
+        if not shutting_down():
+            publish(terminal_event(job))
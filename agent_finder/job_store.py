@@ -0,0 +1,191 @@
+"""SQLite-backed job history.
+
+One row per job with indexed status/created_at, so status changes are
+single-row updates and /api/jobs can page through history without loading
+all of it. Summary, preview rows, the last progress event and the resume
+checkpoint are stored as JSON text.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+logger = logging.getLogger("agent_finder.job_store")
+
+COLUMNS = (
+    "job_id", "status", "filename", "created_at", "upload_path", "result_path",
+    "partial_path", "committed_bytes", "rows_written", "total", "error",
+    "summary", "preview_rows", "last_progress", "checkpoint", "worker", "deadline",
+)
+JSON_COLUMNS = {"summary", "preview_rows", "last_progress", "checkpoint"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id          TEXT PRIMARY KEY,
+    status          TEXT NOT NULL,
+    filename        TEXT NOT NULL DEFAULT '',
+    created_at      TEXT NOT NULL DEFAULT '',
+    upload_path     TEXT,
+    result_path     TEXT,
+    partial_path    TEXT,
+    committed_bytes INTEGER NOT NULL DEFAULT 0,
+    rows_written    INTEGER NOT NULL DEFAULT 0,
+    total           INTEGER NOT NULL DEFAULT 0,
+    error           TEXT,
+    summary         TEXT,
+    preview_rows    TEXT,
+    last_progress   TEXT,
+    checkpoint      TEXT,
+    worker          INTEGER,
+    deadline        REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+CREATE INDEX IF NOT EXISTS jobs_created_at ON jobs (created_at);
+"""
+
+
+class JobStore:
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._add_missing_columns()
+
+    def _add_missing_columns(self):
+        """Bring a jobs.db created by an older version up to COLUMNS."""
+        existing = {row["name"] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        for column in COLUMNS:
+            if column not in existing:
+                self._db.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+
+    @staticmethod
+    def _encode(fields: dict) -> dict:
+        unknown = set(fields) - set(COLUMNS)
+        if unknown:
+            raise KeyError(f"Unknown job fields: {sorted(unknown)}")
+        return {
+            k: json.dumps(v) if k in JSON_COLUMNS and v is not None else v
+            for k, v in fields.items()
+        }
+
+    @staticmethod
+    def _decode(row: sqlite3.Row) -> dict:
+        job = dict(row)
+        for k in JSON_COLUMNS:
+            if job[k] is not None:
+                job[k] = json.loads(job[k])
+        return job
+
+    def create(self, job_id: str, **fields):
+        values = self._encode({"job_id": job_id, **fields})
+        cols = ", ".join(values)
+        marks = ", ".join(f":{k}" for k in values)
+        with self._lock:
+            self._db.execute(f"INSERT INTO jobs ({cols}) VALUES ({marks})", values)
+
+    def update(self, job_id: str, **fields):
+        if not fields:
+            return
+        values = self._encode(fields)
+        sets = ", ".join(f"{k} = :{k}" for k in values)
+        with self._lock:
+            self._db.execute(f"UPDATE jobs SET {sets} WHERE job_id = :_id", {**values, "_id": job_id})
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._decode(row) if row else None
+
+    def list(self, status: str | None = None, limit: int = 50, offset: int = 0) -> tuple[list[dict], int]:
+        """A page of jobs, newest first, and the number of jobs matching."""
+        where, params = ("WHERE status = ?", [status]) if status else ("", [])
+        with self._lock:
+            count = self._db.execute(f"SELECT COUNT(*) FROM jobs {where}", params).fetchone()[0]
+            rows = self._db.execute(
+                f"SELECT * FROM jobs {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                [*params, limit, offset],
+            ).fetchall()
+        return [self._decode(r) for r in rows], count
+
+    def delete(self, job_id: str):
+        with self._lock:
+            self._db.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+    def claim(self, worker: int) -> dict | None:
+        """Move the oldest queued job to running for `worker` and return it.
+
+        Safe across processes: the select and update share one write
+        transaction, so two workers can't claim the same job.
+        """
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row:
+                    self._db.execute(
+                        "UPDATE jobs SET status = 'running', worker = ? WHERE job_id = ?",
+                        (worker, row["job_id"]),
+                    )
+                self._db.execute("COMMIT")
+            except sqlite3.Error:
+                self._db.execute("ROLLBACK")
+                raise
+        if not row:
+            return None
+        return {**self._decode(row), "status": "running", "worker": worker}
+
+    def requeue(self, worker: int | None = None) -> int:
+        """Put running jobs (all, or one worker's) back in the queue."""
+        sql = "UPDATE jobs SET status = 'queued', worker = NULL WHERE status = 'running'"
+        params: tuple = ()
+        if worker is not None:
+            sql += " AND worker = ?"
+            params = (worker,)
+        with self._lock:
+            return self._db.execute(sql, params).rowcount
+
+    def running_totals(self) -> dict[str, int]:
+        """Row totals of running jobs (all processes), by job id."""
+        with self._lock:
+            rows = self._db.execute("SELECT job_id, total FROM jobs WHERE status = 'running'").fetchall()
+        return {r["job_id"]: r["total"] for r in rows}
+
+    def migrate_json(self, jobs_file: Path) -> int:
+        """Import a legacy jobs.json once, then move it aside."""
+        if not jobs_file.exists():
+            return 0
+        try:
+            saved = json.loads(jobs_file.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning("Could not read %s for migration: %s", jobs_file, e)
+            return 0
+
+        imported = 0
+        with self._lock:
+            self._db.execute("BEGIN")
+            for job_id, data in saved.items():
+                fields = self._encode({
+                    "job_id": job_id,
+                    **{k: v for k, v in data.items() if k in COLUMNS and v is not None},
+                })
+                fields.setdefault("status", "error")
+                cols = ", ".join(fields)
+                marks = ", ".join(f":{k}" for k in fields)
+                cur = self._db.execute(f"INSERT OR IGNORE INTO jobs ({cols}) VALUES ({marks})", fields)
+                imported += cur.rowcount
+            self._db.execute("COMMIT")
+        jobs_file.rename(jobs_file.with_name(jobs_file.name + ".migrated"))
+        logger.info("Migrated %d jobs from %s", imported, jobs_file)
+        return imported
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,101 @@
+"""Append-only side files for the JSON stores.
+
+New entries are appended to `<store>.journal` instead of rewriting the
+JSON snapshot, so concurrent writers can't overwrite each other's saves.
+The agent directory always appends; the cache appends from the
+single-agent lookup and rewrites its snapshot at the end of each job
+batch. Loads replay the journal over the snapshot, and a fold writes it
+into the snapshot and empties it under a file lock, so an append can't
+fall between the two. The lock is taken on `<store>.journal.lock`, with
+flock where available and msvcrt on Windows.
+"""
+
+import json
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger("agent_finder.journal")
+
+
+def journal_path(path: Path) -> Path:
+    return path.with_name(path.name + ".journal")
+
+
+@contextmanager
+def _locked(path: Path):
+    """Hold the exclusive lock on the journal of the store at `path`."""
+    with open(path.with_name(path.name + ".journal.lock"), "a+b") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+            return
+        f.seek(0)
+        while True:
+            try:
+                # Locks the first byte; LK_LOCK itself gives up after ~10 s
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                break
+            except OSError:
+                continue
+        try:
+            yield
+        finally:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _parse(lines) -> list:
+    entries = []
+    for line in lines:
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            # A line cut short by a crash mid-append
+            continue
+    return entries
+
+
+def append(path: Path, entries: list):
+    """Add `entries` to the journal of the store at `path`."""
+    if not entries:
+        return
+    with _locked(path), open(journal_path(path), "a", encoding="utf-8") as f:
+        f.write("".join(json.dumps(e, separators=(",", ":")) + "\n" for e in entries))
+
+
+def size(path: Path) -> int:
+    """Bytes in the journal of the store at `path`."""
+    try:
+        return journal_path(path).stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def read(path: Path) -> list:
+    """Entries in the journal of the store at `path`."""
+    try:
+        with _locked(path), open(journal_path(path), encoding="utf-8") as f:
+            return _parse(f)
+    except FileNotFoundError:
+        return []
+
+
+@contextmanager
+def folding(path: Path) -> Iterator[list]:
+    """Lock the journal of the store at `path` and yield its entries.
+
+    The caller applies them and writes its snapshot inside the block.
+    The journal is emptied only if the block succeeds.
+    """
+    with _locked(path), open(journal_path(path), "a+", encoding="utf-8") as f:
+        f.seek(0)
+        yield _parse(f)
+        f.truncate(0)
@@ -0,0 +1,126 @@
+"""Single-agent lookup for interactive use.
+
+Checks the cache and the local directory first. On a miss, it races the
+franchise directory scraper, a DDG query and the Realtor.com profile
+fetch. The first source with a contact wins and the others are cancelled.
+Everything runs inside a fixed latency budget.
+
+Lookups draw on the same per-source request budgets as batch jobs.
+They run at interactive priority, so they are served ahead of queued
+job requests instead of waiting behind them. With worker processes,
+the web process holds LOOKUP_SHARE of each budget for lookups and the
+workers split the rest (see worker.py).
+"""
+
+import asyncio
+import logging
+import time
+
+import httpx
+
+from .metrics import LatencyTracker
+from .models import AgentRow, ContactResult, ContactStatus
+from .pipeline import PipelineStores, make_scraper
+from .searchers import ddg_search
+from .searchers.brokerage_router import identify_franchise
+from .searchers.realtor_profile import search_batch as realtor_search_batch
+
+logger = logging.getLogger("agent_finder.lookup")
+
+DEFAULT_BUDGET = 8.0     # seconds
+MAX_BUDGET = 30.0
+
+latency = LatencyTracker()
+
+
+async def _timed(name: str, search) -> ContactResult:
+    start = time.monotonic()
+    r = await search
+    # Losers cancelled by a faster source aren't recorded
+    latency.record(name, time.monotonic() - start)
+    return r
+
+
+def _sources(agent: AgentRow, client: httpx.AsyncClient, stores: PipelineStores) -> dict:
+    """Per-source coroutines, each resolving to a single ContactResult."""
+    sources = {}
+    franchise = identify_franchise(agent.brokerage)
+    scraper = make_scraper(franchise, client, stores) if franchise else None
+    if scraper:
+        sources["brokerage"] = scraper.search_batch([agent])
+    sources["search"] = ddg_search.search_batch([agent])
+    sources["realtor"] = realtor_search_batch([agent], client, sitemap=stores.sitemap)
+    return {
+        name: _timed(name, _first(batch)) for name, batch in sources.items()
+    }
+
+
+async def _first(batch) -> ContactResult:
+    return (await batch)[0]
+
+
+async def lookup_agent(
+    agent: AgentRow,
+    client: httpx.AsyncClient,
+    stores: PipelineStores,
+    budget: float = DEFAULT_BUDGET,
+) -> tuple[ContactResult, dict]:
+    """Find one agent's contact within `budget` seconds.
+
+    Returns the result and a dict of lookup details: the winning source,
+    the sources that finished without a hit, and whether time ran out.
+    """
+    start = time.monotonic()
+    info: dict = {"source": None, "tried": [], "timed_out": False}
+
+    def finish(r: ContactResult) -> tuple[ContactResult, dict]:
+        elapsed = time.monotonic() - start
+        latency.record("total", elapsed)
+        info["elapsed_ms"] = round(elapsed * 1000)
+        return r, info
+
+    cached = stores.cache.get(agent)
+    if cached:
+        info["source"] = "cache"
+        return finish(cached)
+    hit, confidence = stores.directory.lookup(agent)
+    if hit:
+        info.update(source="directory", confidence=round(confidence, 3))
+        return finish(hit)
+
+    tasks = {
+        asyncio.ensure_future(coro): name
+        for name, coro in _sources(agent, client, stores).items()
+    }
+    best = ContactResult(agent=agent, status=ContactStatus.NOT_FOUND)
+    deadline = start + budget
+    try:
+        pending = set(tasks)
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                info["timed_out"] = True
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                name = tasks[task]
+                if task.cancelled() or task.exception():
+                    info["tried"].append(name)
+                    continue
+                r = task.result()
+                if r.has_contact:
+                    info["source"] = name
+                    stores.cache.put(r)
+                    stores.directory.add(r)
+                    return finish(r)
+                info["tried"].append(name)
+                if r.error_message and not best.error_message:
+                    best = r
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    best.status = ContactStatus.NOT_FOUND
+    return finish(best)
@@ -0,0 +1,132 @@
+"""In-process latency tracking: request-path percentiles and adaptive timeouts."""
+
+import math
+import threading
+from collections import deque
+
+WINDOW = 1000       # most recent samples kept per name
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    # Nearest-rank percentile
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class LatencyTracker:
+    """Rolling p50/p95 of recent durations, per name (e.g. lookup source)."""
+
+    def __init__(self, window: int = WINDOW):
+        self.window = window
+        self._samples: dict[str, deque] = {}
+        self._counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(name, deque(maxlen=self.window)).append(seconds)
+            self._counts[name] = self._counts.get(name, 0) + 1
+
+    def report(self) -> dict[str, dict]:
+        with self._lock:
+            snapshot = {name: sorted(s) for name, s in self._samples.items()}
+            counts = dict(self._counts)
+        return {
+            name: {
+                "count": counts[name],
+                "p50_ms": round(_percentile(ordered, 50) * 1000),
+                "p95_ms": round(_percentile(ordered, 95) * 1000),
+                "max_ms": round(ordered[-1] * 1000),
+            }
+            for name, ordered in sorted(snapshot.items())
+        }
+
+
+# ── Adaptive timeouts ──
+
+TIMEOUT_PERCENTILE = 99
+TIMEOUT_FACTOR = 1.5      # headroom over the percentile
+TIMEOUT_MARGIN = 1.0      # seconds added on top
+TIMEOUT_FLOOR = 2.0
+TIMEOUT_CEILING = 60.0
+TIMEOUT_MIN_SAMPLES = 30  # until then the caller's default applies
+RECOMPUTE_EVERY = 10      # samples between percentile recomputations
+SLOWDOWN_WINDOW = 100     # recent requests checked for a general slowdown
+SLOWDOWN_RATE = 0.1       # share of those timing out that starts probing
+PROBE_EVERY = 10          # while probing, every Nth request gets the default timeout
+
+
+class AdaptiveTimeouts:
+    """Per-(host, request kind) timeouts derived from recent latencies.
+
+    The timeout is a high percentile of recent successful durations, times
+    a factor, plus a margin, clamped to [TIMEOUT_FLOOR, TIMEOUT_CEILING].
+    A stuck request to a host that normally answers in 400 ms is cut off
+    after a couple of seconds, while a site that is always slow keeps a
+    long timeout.
+
+    While many recent requests time out, every PROBE_EVERY-th request
+    gets the caller's default timeout again. If the host has only slowed
+    down, those probes succeed, and their durations raise the percentile.
+    If it is down, only the probes pay the long wait.
+    """
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._samples: dict[tuple[str, str], deque] = {}
+        self._outcomes: dict[tuple[str, str], deque] = {}   # recent timed-out flags
+        self._timeouts: dict[tuple[str, str], float] = {}
+        self._since: dict[tuple[str, str], int] = {}
+        self._calls: dict[tuple[str, str], int] = {}
+        self._timed_out: dict[tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def timeout(self, host: str, kind: str, default: float) -> float:
+        key = (host, kind)
+        with self._lock:
+            limit = self._timeouts.get(key)
+            if limit is None:
+                return default
+            outcomes = self._outcomes[key]
+            if sum(outcomes) >= SLOWDOWN_RATE * len(outcomes):
+                self._calls[key] = self._calls.get(key, 0) + 1
+                if self._calls[key] % PROBE_EVERY == 0:
+                    return max(limit, default)
+            return limit
+
+    def observe(self, host: str, kind: str, seconds: float, timed_out: bool = False):
+        key = (host, kind)
+        with self._lock:
+            self._outcomes.setdefault(key, deque(maxlen=SLOWDOWN_WINDOW)).append(timed_out)
+            if timed_out:
+                self._timed_out[key] = self._timed_out.get(key, 0) + 1
+                return
+            samples = self._samples.setdefault(key, deque(maxlen=self.window))
+            samples.append(seconds)
+            self._since[key] = self._since.get(key, 0) + 1
+            if len(samples) < TIMEOUT_MIN_SAMPLES:
+                return
+            if key in self._timeouts and self._since[key] < RECOMPUTE_EVERY:
+                return
+            self._since[key] = 0
+            limit = _percentile(sorted(samples), TIMEOUT_PERCENTILE) * TIMEOUT_FACTOR + TIMEOUT_MARGIN
+            self._timeouts[key] = min(TIMEOUT_CEILING, max(TIMEOUT_FLOOR, limit))
+
+    def report(self) -> dict[str, dict]:
+        with self._lock:
+            # Hosts that only ever timed out have no samples but are listed too
+            snapshot = {key: sorted(self._samples.get(key, ())) for key in self._outcomes}
+            limits = dict(self._timeouts)
+            timed_out = dict(self._timed_out)
+        report = {}
+        for (host, kind), ordered in sorted(snapshot.items()):
+            report[f"{host} {kind}"] = {
+                "samples": len(ordered),
+                "p50_ms": round(_percentile(ordered, 50) * 1000) if ordered else None,
+                "p99_ms": round(_percentile(ordered, TIMEOUT_PERCENTILE) * 1000) if ordered else None,
+                "timeout_s": round(limits[(host, kind)], 2) if (host, kind) in limits else None,
+                "timed_out": timed_out.get((host, kind), 0),
+            }
+        return report
+
+
+timeouts = AdaptiveTimeouts()
@@ -1,6 +1,6 @@
 """Data models for Agent Contact Finder v2."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from enum import Enum
 
 
@@ -9,9 +9,19 @@ class ContactStatus(str, Enum):
     PARTIAL = "partial"
     NOT_FOUND = "not_found"
     ERROR = "error"
+    SKIPPED = "skipped"      # not searched: the job's time budget ran out
 
 
-@dataclass
+class ColumnTable:
+    """Extra-column headers of one upload, shared by all of its rows."""
+    __slots__ = ("headers", "positions")
+
+    def __init__(self, headers: list[str]):
+        self.headers = tuple(headers)
+        self.positions = {h: i for i, h in enumerate(self.headers)}
+
+
+@dataclass(slots=True)
 class AgentRow:
     """One row from the uploaded CSV — an agent to find contact info for."""
     name: str
@@ -22,10 +32,23 @@ class AgentRow:
     zip_code: str = ""
     list_price: str = ""
     row_index: int = 0
-    extra_columns: dict = field(default_factory=dict)
+    # Values of the upload's other columns, in `columns.headers` order
+    extra_values: tuple = ()
+    columns: ColumnTable | None = None
+
+    def extra(self, header: str) -> str:
+        i = self.columns.positions.get(header) if self.columns else None
+        return self.extra_values[i] if i is not None else ""
+
+    @property
+    def extra_columns(self) -> dict:
+        """The extra columns as a header -> value dict (built on demand)."""
+        if not self.columns:
+            return {}
+        return dict(zip(self.columns.headers, self.extra_values))
 
 
-@dataclass
+@dataclass(slots=True)
 class ContactResult:
     """Search result for one agent."""
     agent: AgentRow
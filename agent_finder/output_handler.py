@@ -1,71 +1,320 @@
-"""Export pipeline results to CSV."""
+"""Export pipeline results to CSV, plus compressed and columnar copies."""
 
 import csv
 import logging
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Callable
 
 from .models import ContactResult
 
 logger = logging.getLogger("agent_finder.output")
 
+RESULT_FIELDS = [
+    "Name", "Brokerage", "Phone", "Email", "Status", "Source",
+    "Street Address", "City", "State", "Zip Code", "List Price",
+]
 
-def export_results_csv(results: list[ContactResult], output_path: str):
-    """Export results to a single CSV file with original columns + contact info appended."""
-    if not results:
-        return
 
+def _extra_keys(results: list[ContactResult]) -> tuple[str, ...]:
     extra_keys = []
     seen = set()
+    tables = set()
     for r in results:
-        for k in r.agent.extra_columns:
+        table = r.agent.columns
+        # Rows of one upload share a table, so each is scanned once
+        if table is None or id(table) in tables:
+            continue
+        tables.add(id(table))
+        for k in table.headers:
             if k not in seen:
                 extra_keys.append(k)
                 seen.add(k)
+    return tuple(extra_keys)
 
-    fieldnames = [
-        "Name", "Brokerage", "Phone", "Email", "Status", "Source",
-        "Street Address", "City", "State", "Zip Code", "List Price",
-    ] + extra_keys
 
-    with open(output_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
+def _result_row(r: ContactResult, extra_keys: tuple[str, ...]) -> list[str]:
+    agent = r.agent
+    row = [
+        agent.name, agent.brokerage, r.phone, r.email, r.status.value, r.source,
+        agent.address, agent.city, agent.state, agent.zip_code, agent.list_price,
+    ]
+    if agent.columns and agent.columns.headers == extra_keys:
+        row.extend(agent.extra_values)
+    else:
+        row.extend(agent.extra(k) for k in extra_keys)
+    return row
+
 
+def export_results_csv(results: list[ContactResult], output_path: str):
+    """Export results to a single CSV file with original columns + contact info appended."""
+    if not results:
+        return
+
+    extra_keys = _extra_keys(results)
+
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(RESULT_FIELDS + list(extra_keys))
         for r in results:
-            row = {
-                "Name": r.agent.name,
-                "Brokerage": r.agent.brokerage,
-                "Phone": r.phone,
-                "Email": r.email,
-                "Status": r.status.value,
-                "Source": r.source,
-                "Street Address": r.agent.address,
-                "City": r.agent.city,
-                "State": r.agent.state,
-                "Zip Code": r.agent.zip_code,
-                "List Price": r.agent.list_price,
-            }
-            for k in extra_keys:
-                row[k] = r.agent.extra_columns.get(k, "")
-
-            writer.writerow(row)
+            writer.writerow(_result_row(r, extra_keys))
 
     logger.info("Exported %d results to %s", len(results), output_path)
 
 
+def partial_path(output_path: str) -> str:
+    return output_path + ".partial"
+
+
+class IncrementalCsvWriter:
+    """Appends finished results to `<output>.partial` while a job runs.
+
+    `committed_bytes` only advances after a whole batch is flushed, so the
+    file up to that offset is always a valid CSV; a download taken mid-job
+    (or after a crash) reads just that prefix. `finalize` renames the
+    partial file into place instead of rewriting it.
+    """
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.partial_path = partial_path(output_path)
+        self.committed_bytes = 0
+        self.rows_written = 0
+        self.counts = SummaryCounts()
+        self._file = None
+        self._writer = None
+        self._extra_keys: tuple[str, ...] = ()
+
+    def write(self, results: list[ContactResult]):
+        if not results:
+            return
+        if self._file is None:
+            # Every row of an upload shares its header, so the first batch
+            # fixes the extra columns for the whole file.
+            self._extra_keys = _extra_keys(results)
+            self._file = open(self.partial_path, "w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(RESULT_FIELDS + list(self._extra_keys))
+        for r in results:
+            self._writer.writerow(_result_row(r, self._extra_keys))
+        self._file.flush()
+        self.committed_bytes = self._file.tell()
+        self.rows_written += len(results)
+        self.counts.add(results)
+
+    def resume(self, committed_bytes: int):
+        """Reopen the partial file of an interrupted job.
+
+        Anything after `committed_bytes` (a batch written but not yet
+        checkpointed) is cut off; the committed rows are re-read to restore
+        the running counts. Raises FileNotFoundError if the file is gone or
+        shorter than that, since the committed rows would be lost.
+        """
+        path = Path(self.partial_path)
+        if not committed_bytes:
+            return
+        if not path.exists() or path.stat().st_size < committed_bytes:
+            raise FileNotFoundError(f"Partial results missing or cut short: {path}")
+        with open(path, "r+b") as f:
+            f.truncate(committed_bytes)
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            status_i, phone_i, email_i = (header.index(c) for c in ("Status", "Phone", "Email"))
+            for row in reader:
+                self.counts.add_row(row[status_i], row[phone_i], row[email_i])
+                self.rows_written += 1
+        self._extra_keys = tuple(header[len(RESULT_FIELDS):])
+        self._file = open(path, "a", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self.committed_bytes = committed_bytes
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+    def finalize(self) -> str | None:
+        """Close the partial file and move it to the output path."""
+        if self._file is None:
+            return None
+        self._file.close()
+        os.replace(self.partial_path, self.output_path)
+        logger.info("Exported %d results to %s", self.rows_written, self.output_path)
+        return self.output_path
+
+
+def preview_rows(path: str, limit: int) -> list[dict]:
+    """The first rows of a result CSV in the job preview format."""
+    preview = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if len(preview) >= limit:
+                break
+            preview.append({
+                "name": row["Name"],
+                "brokerage": row["Brokerage"],
+                "address": row["Street Address"],
+                "phone": row["Phone"],
+                "email": row["Email"],
+                "status": row["Status"],
+                "source": row["Source"],
+            })
+    return preview
+
+
+def read_committed(path: str, committed_bytes: int, chunk_size: int = 64 * 1024):
+    """Yield the first `committed_bytes` of a partial result file."""
+    remaining = min(committed_bytes, Path(path).stat().st_size)
+    with open(path, "rb") as f:
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+# ── Download formats ──
+
+# format -> (file suffix, media type)
+EXPORT_FORMATS = {
+    "csv": (".csv", "text/csv"),
+    "csv.gz": (".csv.gz", "application/gzip"),
+    "xlsx": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+GZIP_LEVEL = 6
+
+
+def gzip_chunks(chunks):
+    """Gzip a stream of byte chunks on the fly."""
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        if out := compressor.compress(chunk):
+            yield out
+    yield compressor.flush()
+
+
+def read_file(path: str, chunk_size: int = 64 * 1024):
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+def converted_path(csv_path: str, fmt: str) -> str:
+    return str(Path(csv_path).with_suffix(EXPORT_FORMATS[fmt][0]))
+
+
+def _is_fresh(path: str, source: str) -> bool:
+    p = Path(path)
+    return p.exists() and p.stat().st_mtime >= Path(source).stat().st_mtime
+
+
+def _write_atomically(out_path: str, write: Callable[[str], None]):
+    """Run `write(tmp_path)` on a unique temporary file next to `out_path`,
+    then move it into place, so concurrent exports never share a file."""
+    with tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(out_path) or ".", prefix=os.path.basename(out_path) + ".",
+        suffix=".tmp", delete=False,
+    ) as f:
+        tmp_path = f.name
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def export_xlsx(csv_path: str) -> str:
+    """Convert a result CSV to XLSX row by row (openpyxl write-only mode)."""
+    from openpyxl import Workbook
+
+    out_path = converted_path(csv_path, "xlsx")
+    if _is_fresh(out_path, csv_path):
+        return out_path
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Results")
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            ws.append(row)
+    _write_atomically(out_path, wb.save)
+    logger.info("Wrote %s", out_path)
+    return out_path
+
+
+def export_parquet(csv_path: str) -> str:
+    """Convert a result CSV to Parquet in record batches. Requires pyarrow."""
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+
+    out_path = converted_path(csv_path, "parquet")
+    if _is_fresh(out_path, csv_path):
+        return out_path
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f), [])
+    # Keep every column as text: phones, zips and prices must not be re-typed
+    convert = pa_csv.ConvertOptions(
+        column_types={name: pa.string() for name in header},
+        strings_can_be_null=False,
+    )
+    reader = pa_csv.open_csv(csv_path, convert_options=convert)
+
+    def write(tmp_path: str):
+        with pq.ParquetWriter(tmp_path, reader.schema, compression="zstd") as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+
+    _write_atomically(out_path, write)
+    logger.info("Wrote %s", out_path)
+    return out_path
+
+
+class SummaryCounts:
+    """Running result counts, so a summary doesn't need every result in memory."""
+
+    def __init__(self):
+        self.total = self.found = self.not_found = self.errors = self.skipped = 0
+        self.with_phone = self.with_email = 0
+
+    def add(self, results: list[ContactResult]):
+        for r in results:
+            self.add_row(r.status.value, r.phone, r.email)
+
+    def add_row(self, status: str, phone: str, email: str):
+        self.total += 1
+        if status == "found":
+            self.found += 1
+        elif status == "not_found":
+            self.not_found += 1
+        elif status == "error":
+            self.errors += 1
+        elif status == "skipped":
+            self.skipped += 1
+        if phone:
+            self.with_phone += 1
+        if email:
+            self.with_email += 1
+
+    def summary(self) -> dict:
+        return {
+            "total": self.total,
+            "found": self.found,
+            "not_found": self.not_found,
+            "errors": self.errors,
+            "skipped": self.skipped,
+            "with_phone": self.with_phone,
+            "with_email": self.with_email,
+            "hit_rate": round(self.found / self.total * 100) if self.total > 0 else 0,
+        }
+
+
 def generate_summary(results: list[ContactResult]) -> dict:
-    total = len(results)
-    found = sum(1 for r in results if r.status.value == "found")
-    not_found = sum(1 for r in results if r.status.value == "not_found")
-    errors = sum(1 for r in results if r.status.value == "error")
-    with_phone = sum(1 for r in results if r.phone)
-    with_email = sum(1 for r in results if r.email)
-
-    return {
-        "total": total,
-        "found": found,
-        "not_found": not_found,
-        "errors": errors,
-        "with_phone": with_phone,
-        "with_email": with_email,
-        "hit_rate": round(found / total * 100) if total > 0 else 0,
-    }
+    counts = SummaryCounts()
+    counts.add(results)
+    return counts.summary()
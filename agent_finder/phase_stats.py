@@ -0,0 +1,154 @@
+"""SQLite-backed yield statistics for pipeline phases.
+
+Records how many agents each source (brokerage directory, DDG,
+Realtor.com, email guess) searched, how many it found and how long it
+took. Counts are kept overall, per franchise, and per franchise and state.
+The pipeline routes each agent through the sources in order of expected
+yield for its segment and skips sources that have stopped finding
+anything there. Jobs with a time budget rank by hits per second instead
+of hit rate.
+
+Every job and worker process adds its own counts to the shared table on
+save, so concurrent jobs don't overwrite each other's numbers.
+"""
+
+import logging
+import random
+import sqlite3
+from pathlib import Path
+
+logger = logging.getLogger("agent_finder.phase_stats")
+
+MIN_AGENTS = 20        # samples before a segment's own numbers are trusted
+MIN_HIT_RATE = 0.02    # below this (with MIN_AGENTS samples) a source is skipped
+REPROBE_EVERY = 50     # still try a skipped source for 1 in N agents in case it recovers
+
+# Seconds per agent assumed until a phase has history
+DEFAULT_SECONDS = {"brokerage": 1.0, "search": 4.0, "realtor": 2.5, "email": 0.2}
+
+
+def segment_keys(source: str, franchise: str = "", state: str = "") -> list[str]:
+    """Stat keys for a source, most specific first. Agents outside the
+    known franchises share the "other" segment."""
+    franchise = franchise or "other"
+    keys = [f"{source}:{franchise}", source]
+    if state:
+        keys.insert(0, f"{source}:{franchise}:{state}")
+    return keys
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS phase_stats (
+    key     TEXT PRIMARY KEY,
+    agents  REAL NOT NULL,
+    hits    REAL NOT NULL,
+    seconds REAL NOT NULL
+);
+"""
+
+
+class PhaseStats:
+    def __init__(self, path: Path):
+        self.path = path
+        # phase key -> [agents, hits, seconds], as of the last load plus this job's counts
+        self._data: dict[str, list[float]] = {}
+        self._pending: dict[str, list[float]] = {}     # counts not saved yet
+        self._db = sqlite3.connect(str(path), timeout=10, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        self._load()
+
+    def _load(self):
+        try:
+            rows = self._db.execute("SELECT key, agents, hits, seconds FROM phase_stats").fetchall()
+        except sqlite3.Error as e:
+            logger.warning("Failed to load phase stats: %s", e)
+            return
+        self._data = {key: [agents, hits, seconds] for key, agents, hits, seconds in rows}
+        for key, (agents, hits, seconds) in self._pending.items():
+            entry = self._data.setdefault(key, [0, 0, 0.0])
+            entry[0] += agents
+            entry[1] += hits
+            entry[2] += seconds
+
+    def record(self, key: str, agents: int, hits: int, seconds: float):
+        for counts in (self._data, self._pending):
+            entry = counts.setdefault(key, [0, 0, 0.0])
+            entry[0] += agents
+            entry[1] += hits
+            entry[2] += seconds
+
+    def record_segment(
+        self, source: str, franchise: str, state: str, agents: int, hits: int, seconds: float,
+    ):
+        for key in segment_keys(source, franchise, state):
+            self.record(key, agents, hits, seconds)
+
+    def _estimate(self, keys: list[str]) -> tuple[str, float, float, bool]:
+        """(key used, hit rate, seconds per agent, trusted) from the most
+        specific key with enough samples."""
+        for key in keys:
+            agents, hits, seconds = self._data.get(key, (0, 0, 0.0))
+            if agents >= MIN_AGENTS:
+                return key, hits / agents, seconds / agents, True
+        agents, hits, seconds = self._data.get(keys[-1], (0, 0, 0.0))
+        phase = keys[-1].split(":", 1)[0]
+        per_agent = seconds / agents if agents else DEFAULT_SECONDS.get(phase, 1.0)
+        # Laplace-smoothed hit rate, so an untried source starts at 0.5
+        return keys[-1], (hits + 1) / (agents + 2), per_agent, False
+
+    def yield_rate(self, key: str) -> float:
+        """Expected contacts found per second spent on `key`."""
+        _, hit_rate, per_agent, _ = self._estimate([key])
+        return max(hit_rate, 0.001) / max(per_agent, 0.01)
+
+    def route(
+        self, sources: list[str], franchise: str = "", state: str = "", per_second: bool = False,
+    ) -> list[str]:
+        """Sources to try for an agent in this segment, best expected yield first.
+
+        Yield is hit rate per agent searched, or hits per second with
+        `per_second`. Ties keep the given order. A source whose trusted
+        hit rate is below MIN_HIT_RATE is left out, except for a random
+        1 in REPROBE_EVERY agents that probe it.
+        """
+        ranked = []
+        for i, source in enumerate(sources):
+            key, hit_rate, per_agent, trusted = self._estimate(segment_keys(source, franchise, state))
+            # Probing by chance works the same for a 10-agent job as for a 10k one
+            if trusted and hit_rate < MIN_HIT_RATE and random.random() >= 1 / REPROBE_EVERY:
+                continue
+            score = hit_rate / max(per_agent, 0.01) if per_second else hit_rate
+            ranked.append((-score, i, source))
+        return [source for _, _, source in sorted(ranked)]
+
+    def report(self) -> dict[str, dict]:
+        report = {}
+        for key, (agents, hits, seconds) in sorted(self._data.items()):
+            report[key] = {
+                "agents": int(agents),
+                "hits": int(hits),
+                "hit_rate": round(hits / agents * 100, 1) if agents else 0,
+                "seconds_per_agent": round(seconds / agents, 2) if agents else None,
+                "hits_per_second": round(self.yield_rate(key), 3),
+                "skipped": agents >= MIN_AGENTS and hits / agents < MIN_HIT_RATE,
+            }
+        return report
+
+    def save(self):
+        """Add this job's unsaved counts to the table and pick up other jobs' counts."""
+        if not self._pending:
+            return
+        rows = [(key, *counts) for key, counts in self._pending.items()]
+        try:
+            self._db.executemany(
+                """INSERT INTO phase_stats (key, agents, hits, seconds) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(key) DO UPDATE SET agents = agents + excluded.agents,
+                       hits = hits + excluded.hits, seconds = seconds + excluded.seconds""",
+                rows,
+            )
+        except sqlite3.Error as e:
+            logger.warning("Failed to save phase stats: %s", e)
+            return
+        self._pending.clear()
+        self._load()
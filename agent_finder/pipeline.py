@@ -1,30 +1,46 @@
 """Pipeline orchestrator — 4-phase search for agent contact info.
 
 Phase 1: Brokerage directory lookup (batch by franchise)
-Phase 2: DuckDuckGo search (remaining agents)
-Phase 3: Realtor.com profile search (still-missing agents)
+Phase 2: DuckDuckGo search
+Phase 3: Realtor.com profile search
 Phase 4: Email pattern guessing (agents with phone but no email)
 
 Key improvements over v2:
 - Deduplication: same agent on multiple properties = search once
 - Brokerage-first: ~45% of agents resolved via franchise directories
 - Cross-job caching: previously found contacts skip all passes
+- Local agent directory: fuzzy name match on past finds before Phase 1
 - Chunked processing with gc.collect() for memory safety
+- Streaming: large uploads are fed in batches as the file is parsed
+- Yield routing: each agent tries phases 1-3 in order of historical hit
+  rate for its franchise and state, skipping sources that never hit there
+- Time budgets: with a deadline, routing ranks by hits per second and
+  the job stops searching when time runs out
 """
 
+import asyncio
 import gc
 import logging
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable
+from functools import partial
+from typing import AsyncIterator, Awaitable, Callable
 
 import httpx
 
+from . import http_cache, warmup
 from .models import AgentRow, ContactResult, ContactStatus
 from .cache import FileCache
+from .checkpoint import PHASES, JobCheckpoint
+from .directory import AgentDirectory
+from .phase_stats import PhaseStats
+from .sitemap_index import INDEX_PATH as SITEMAP_INDEX_PATH, SitemapIndex
+from .strategy_stats import StrategyStats
 from .searchers.brokerage_router import group_by_franchise
 from .searchers import ddg_search
-from .searchers.realtor_profile import search_batch as realtor_search_batch
-from .searchers.email_guesser import guess_batch as email_guess_batch
+from .searchers.realtor_profile import REALTOR_URL, search_batch as realtor_search_batch
+from .searchers.email_guesser import domains_for, guess_batch as email_guess_batch
 
 # Brokerage scraper imports
 from .brokerages.kw import KWBrokerageScraper
@@ -55,7 +71,66 @@ SCRAPER_CLASSES: dict[str, type] = {
 GENERIC_FRANCHISES = {"homesmart", "realty_one", "exit_realty", "howard_hanna",
                       "weichert", "long_foster", "sothebys", "redfin"}
 
+# Sources an agent can be routed through (email guessing always runs last)
+SEARCH_SOURCES = ("brokerage", "search", "realtor")
+
 CHUNK_SIZE = 200
+BATCH_SIZE = 500     # rows per pipeline run (and per partial-result flush) for streamed uploads
+
+
+@dataclass
+class PipelineStores:
+    """Persistent lookup stores, opened once and shared by every batch of a job."""
+    cache: FileCache
+    directory: AgentDirectory
+    strategy_stats: StrategyStats
+    phase_stats: PhaseStats
+    sitemap: SitemapIndex | None
+
+    @classmethod
+    def open(cls) -> "PipelineStores":
+        return cls(
+            cache=FileCache(DATA_DIR / "cache.json"),
+            directory=AgentDirectory(DATA_DIR / "directory.json"),
+            strategy_stats=StrategyStats(DATA_DIR / "strategy_stats.db"),
+            phase_stats=PhaseStats(DATA_DIR / "phase_stats.db"),
+            # Built offline by `python -m agent_finder.sitemap_index`
+            sitemap=SitemapIndex() if SITEMAP_INDEX_PATH.exists() else None,
+        )
+
+    def save(self):
+        self.cache.save()
+        self.directory.save()
+        self.strategy_stats.save()
+        self.phase_stats.save()
+
+    def save_new(self):
+        """Append only the new cache and directory entries to their
+        journals, without rewriting any snapshot (see journal.py)."""
+        self.cache.save_new()
+        self.directory.save_new()
+
+
+def has_scraper(franchise: str) -> bool:
+    return franchise in SCRAPER_CLASSES or franchise in GENERIC_FRANCHISES
+
+
+def make_scraper(franchise: str, client: httpx.AsyncClient, stores: PipelineStores):
+    """Directory scraper for a franchise, or None if it has none."""
+    if franchise in SCRAPER_CLASSES:
+        return SCRAPER_CLASSES[franchise](
+            client, stats=stores.strategy_stats, sitemap=stores.sitemap,
+        )
+    if franchise in GENERIC_FRANCHISES:
+        return GenericBrokerageScraper(
+            client, franchise_key=franchise, stats=stores.strategy_stats, sitemap=stores.sitemap,
+        )
+    return None
+
+
+def _key(agent: AgentRow) -> str:
+    """Dedup key: the same agent on several rows is searched once."""
+    return f"{agent.name.strip().lower()}|{agent.brokerage.strip().lower()}"
 
 
 def _deduplicate(agents: list[AgentRow]) -> tuple[list[AgentRow], dict[str, list[int]]]:
@@ -65,7 +140,7 @@ def _deduplicate(agents: list[AgentRow]) -> tuple[list[AgentRow], dict[str, list
     index_map: dict[str, list[int]] = {}
 
     for agent in agents:
-        key = f"{agent.name.strip().lower()}|{agent.brokerage.strip().lower()}"
+        key = _key(agent)
         if key not in seen:
             seen[key] = agent
             index_map[key] = [agent.row_index]
@@ -80,9 +155,30 @@ def _deduplicate(agents: list[AgentRow]) -> tuple[list[AgentRow], dict[str, list
 async def run_pipeline(
     agents: list[AgentRow],
     progress_callback: Callable[[dict], None] | None = None,
+    stores: PipelineStores | None = None,
+    checkpoint: JobCheckpoint | None = None,
+    deadline: float | None = None,
+    known: dict[str, ContactResult] | None = None,
 ) -> list[ContactResult]:
-    """Run the 4-phase search pipeline on a list of agents."""
+    """Run the 4-phase search pipeline on a list of agents.
+
+    `known` maps dedup keys to the final results of earlier batches of
+    the same job; those agents take that result instead of being
+    searched again.
+
+    With a checkpoint, each agent's phase results are recorded as they
+    arrive, and agents recorded by an interrupted run skip the phases
+    they finished.
+
+    With a deadline (epoch seconds), the search phases run in order of
+    historical hits per second and stop when time runs out; agents no
+    phase got to are marked SKIPPED.
+    """
     total = len(agents)
+    # Loading and saving large stores takes seconds; keep it off the event loop
+    stores = stores or await asyncio.to_thread(PipelineStores.open)
+    cache, directory = stores.cache, stores.directory
+    sitemap, phase_stats = stores.sitemap, stores.phase_stats
 
     # Results indexed by row_index
     results: dict[int, ContactResult] = {a.row_index: ContactResult(agent=a) for a in agents}
@@ -110,16 +206,15 @@ async def run_pipeline(
         nonlocal found_count, completed_count
         row_indices = index_map.get(dedup_key, [r.agent.row_index])
         for idx in row_indices:
-            original_agent = results[idx].agent
-            was_found = results[idx].has_contact
-            results[idx] = ContactResult(
-                agent=original_agent,
-                phone=r.phone,
-                email=r.email,
-                source=r.source,
-                status=r.status,
-                error_message=r.error_message,
-            )
+            row = results[idx]
+            was_found = row.has_contact
+            if row is not r:
+                # Update in place: each row keeps its own AgentRow and result object
+                row.phone = r.phone
+                row.email = r.email
+                row.source = r.source
+                row.status = r.status
+                row.error_message = r.error_message
             if idx not in counted_rows:
                 counted_rows.add(idx)
                 completed_count += 1
@@ -132,14 +227,15 @@ async def run_pipeline(
     # ── Step 0: Deduplicate ──
     unique_agents, index_map = _deduplicate(agents)
 
-    def _key(a: AgentRow) -> str:
-        return f"{a.name.strip().lower()}|{a.brokerage.strip().lower()}"
-
     # ── Step 1: Cache check ──
-    cache = FileCache(DATA_DIR / "cache.json")
     uncached: list[AgentRow] = []
 
     for agent in unique_agents:
+        # Searched in an earlier batch of this job (found or not)
+        earlier = known.get(_key(agent)) if known else None
+        if earlier:
+            apply_result(earlier, _key(agent))
+            continue
         cached = cache.get(agent)
         if cached:
             apply_result(cached, _key(agent))
@@ -151,69 +247,171 @@ async def run_pipeline(
         logger.info("Cache hits: %d/%d", cached_hits, len(unique_agents))
         emit("Cache lookup complete", "cache")
 
+    # ── Step 1b: Local directory (fuzzy name match on past finds) ──
+    directory_hits = 0
+    if len(directory):
+        unresolved: list[AgentRow] = []
+        hits = await asyncio.to_thread(lambda: [directory.lookup(a)[0] for a in uncached])
+        for agent, hit in zip(uncached, hits):
+            if hit:
+                apply_result(hit, _key(agent))
+                directory_hits += 1
+                cached_hits += 1
+            else:
+                unresolved.append(agent)
+        uncached = unresolved
+        if directory_hits:
+            logger.info("Directory hits: %d/%d", directory_hits, len(unique_agents))
+            emit("Directory lookup complete", "cache")
+
+    # ── Step 1c: Resume agents searched before a restart ──
+    phases_done: dict[int, set[str]] = {}
+    if checkpoint:
+        for agent in uncached:
+            prior = checkpoint.prior(_key(agent), agent)
+            if prior:
+                phases_done[agent.row_index], r = prior
+                apply_result(r, _key(agent))
+        if phases_done:
+            logger.info("Resumed %d agents from checkpoint", len(phases_done))
+            emit("Checkpoint restored", "cache")
+
+    def pending(agent: AgentRow, phase: str) -> bool:
+        return phase not in phases_done.get(agent.row_index, ())
+
+    def remember(r: ContactResult):
+        cache.put(r)
+        directory.add(r)
+
+    # Rows any search phase has looked at (the rest are SKIPPED if time runs out)
+    searched: set[int] = {idx for idx, done in phases_done.items() if done}
+    # Rows each phase has searched in this run, for its yield stats
+    done_in: dict[str, set[int]] = {phase: set() for phase in PHASES}
+
+    def record(r: ContactResult, phase: str):
+        searched.add(r.agent.row_index)
+        done_in[phase].add(r.agent.row_index)
+        if checkpoint:
+            checkpoint.record(_key(r.agent), phase, r)
+
     # ── Step 2: Group by franchise ──
-    brokerage_groups, unmatched = group_by_franchise(uncached)
+    brokerage_groups, _ = group_by_franchise(uncached)
+    franchise_of = {a.row_index: f for f, group in brokerage_groups.items() for a in group}
+
+    def segment(agent: AgentRow) -> tuple[str, str]:
+        return franchise_of.get(agent.row_index, ""), agent.state.strip().upper()[:2]
 
     # Track which unique agents still need searching
-    still_need: set[int] = {a.row_index for a in uncached}
+    still_need: set[int] = {
+        a.row_index for a in uncached if not results[a.row_index].has_contact
+    }
+
+    def remaining() -> float | None:
+        return None if deadline is None else deadline - time.time()
+
+    warmed_up: set[str] = set()     # phases whose first unit of work has been timed
+
+    async def timed(phase: str, agents_: list[AgentRow], work: Callable[[], Awaitable]) -> bool:
+        """Run one unit of phase work within the time budget and record its
+        yield per segment. Returns False once the budget is used up."""
+        budget = remaining()
+        if budget is not None and budget <= 0:
+            return False
+        found_before = {a.row_index for a in agents_ if results[a.row_index].has_contact}
+        start = time.monotonic()
+        try:
+            if budget is None:
+                await work()
+            else:
+                await asyncio.wait_for(work(), timeout=budget)
+        except asyncio.TimeoutError:
+            logger.info("Time budget used up during %s", phase)
+            return False
+        finally:
+            if phase not in warmed_up:
+                warmed_up.add(phase)
+                warmup.first_batch.record(phase, time.monotonic() - start)
+            # Only agents the work got through count, so a cut-short run isn't misread as fast
+            attempted = [a for a in agents_ if a.row_index in done_in[phase]]
+            if attempted:
+                per_agent = (time.monotonic() - start) / len(attempted)
+                by_segment: dict[tuple[str, str], list[int]] = {}
+                for a in attempted:
+                    counts = by_segment.setdefault(segment(a), [0, 0])
+                    counts[0] += 1
+                    if a.row_index not in found_before and results[a.row_index].has_contact:
+                        counts[1] += 1
+                for (franchise, state), (n, hits) in by_segment.items():
+                    phase_stats.record_segment(phase, franchise, state, n, hits, n * per_agent)
+        return True
 
     async with httpx.AsyncClient(
         follow_redirects=True,
-        limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+        transport=http_cache.transport(
+            DATA_DIR / "http_cache.db",
+            # Connections warmed up for a later franchise group must outlive the current one
+            warmup.http_transport(
+                httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=30.0),
+            ),
+        ),
     ) as client:
 
         # ── Phase 1: Brokerage directory lookups ──
-        for franchise, franchise_agents in brokerage_groups.items():
-            if not franchise_agents:
-                continue
-
-            emit(franchise_agents[0].name, "brokerage", franchise)
-            logger.info("Phase 1: %s directory (%d agents)", franchise, len(franchise_agents))
-
-            # Get the right scraper
-            if franchise in SCRAPER_CLASSES:
-                scraper = SCRAPER_CLASSES[franchise](client)
-            elif franchise in GENERIC_FRANCHISES:
-                scraper = GenericBrokerageScraper(client, franchise_key=franchise)
-            else:
-                # No scraper — agents fall through to Phase 2
-                continue
-
-            def on_brokerage_result(r: ContactResult, _franchise=franchise):
-                key = _key(r.agent)
-                apply_result(r, key)
-                if r.has_contact:
-                    cache.put(r)
-                    still_need.discard(r.agent.row_index)
-                emit(r.agent.name, "brokerage", _franchise)
-
-            await scraper.search_batch(franchise_agents, on_result=on_brokerage_result)
-            gc.collect()
-
-        # ── Phase 2: DDG search for remaining agents ──
-        ddg_agents = [a for a in uncached if a.row_index in still_need]
+        async def brokerage_phase(agents_: list[AgentRow]) -> bool:
+            by_franchise: dict[str, list[AgentRow]] = {}
+            for agent in agents_:
+                by_franchise.setdefault(franchise_of[agent.row_index], []).append(agent)
+            groups = list(by_franchise.items())
+            if deadline is not None:
+                # Most productive franchise directories first
+                groups.sort(key=lambda g: -phase_stats.yield_rate(f"brokerage:{g[0]}"))
+            for i, (franchise, franchise_agents) in enumerate(groups):
+                scraper = scrapers[franchise]
+                if i + 1 < len(groups):
+                    # Connect to the next directory while this one is searched
+                    warm_tasks.append(warmup.connect(client, [scrapers[groups[i + 1][0]].base_url]))
+                emit(franchise_agents[0].name, "brokerage", franchise)
+                logger.info("Phase 1: %s directory (%d agents)", franchise, len(franchise_agents))
+
+                def on_brokerage_result(r: ContactResult, _franchise=franchise):
+                    key = _key(r.agent)
+                    apply_result(r, key)
+                    record(r, "brokerage")
+                    if r.has_contact:
+                        remember(r)
+                        still_need.discard(r.agent.row_index)
+                    emit(r.agent.name, "brokerage", _franchise)
+
+                work = partial(scraper.search_batch, franchise_agents, on_result=on_brokerage_result)
+                if not await timed("brokerage", franchise_agents, work):
+                    return False
+                gc.collect()
+            return True
 
-        if ddg_agents:
+        # ── Phase 2: DDG search ──
+        async def search_phase(ddg_agents: list[AgentRow]) -> bool:
             logger.info("Phase 2: DDG search for %d agents", len(ddg_agents))
             emit(ddg_agents[0].name, "search")
 
             def on_ddg_result(r: ContactResult):
                 key = _key(r.agent)
                 apply_result(r, key)
+                record(r, "search")
                 if r.has_contact:
-                    cache.put(r)
+                    remember(r)
                     still_need.discard(r.agent.row_index)
                 emit(r.agent.name, "search")
 
             for chunk_start in range(0, len(ddg_agents), CHUNK_SIZE):
                 chunk = ddg_agents[chunk_start : chunk_start + CHUNK_SIZE]
-                await ddg_search.search_batch(chunk, on_result=on_ddg_result)
+                work = partial(ddg_search.search_batch, chunk, on_result=on_ddg_result)
+                if not await timed("search", chunk, work):
+                    return False
                 gc.collect()
+            return True
 
-        # ── Phase 3: Realtor.com for still-missing agents ──
-        realtor_agents = [a for a in uncached if a.row_index in still_need]
-
-        if realtor_agents:
+        # ── Phase 3: Realtor.com ──
+        async def realtor_phase(realtor_agents: list[AgentRow]) -> bool:
             logger.info("Phase 3: Realtor.com for %d agents", len(realtor_agents))
             emit(realtor_agents[0].name, "realtor")
 
@@ -221,25 +419,31 @@ async def run_pipeline(
                 key = _key(r.agent)
                 if r.has_contact:
                     apply_result(r, key)
-                    cache.put(r)
+                    remember(r)
                     still_need.discard(r.agent.row_index)
                 else:
                     apply_result(r, key)
+                record(r, "realtor")
                 emit(r.agent.name, "realtor")
 
             for chunk_start in range(0, len(realtor_agents), CHUNK_SIZE):
                 chunk = realtor_agents[chunk_start : chunk_start + CHUNK_SIZE]
-                await realtor_search_batch(chunk, client, on_result=on_realtor_result)
+                work = partial(realtor_search_batch, chunk, client, on_result=on_realtor_result, sitemap=sitemap)
+                if not await timed("realtor", chunk, work):
+                    return False
                 gc.collect()
+            return True
 
         # ── Phase 4: Email guessing for agents with phone but no email ──
-        need_email = [
-            results[idx].agent
-            for idx in results
-            if results[idx].phone and not results[idx].email
-        ]
-
-        if need_email:
+        async def email_phase() -> bool:
+            need_email = [
+                results[idx].agent
+                for idx in results
+                if results[idx].phone and not results[idx].email
+                and pending(results[idx].agent, "email")
+            ]
+            if not need_email:
+                return True
             logger.info("Phase 4: Email guessing for %d agents", len(need_email))
             emit(need_email[0].name, "email")
 
@@ -253,18 +457,82 @@ async def run_pipeline(
                         else:
                             r.source = "email_guess"
                         r.status = ContactStatus.FOUND
-                        cache.put(r)
+                        remember(r)
+                r = results.get(agent.row_index)
+                if r:
+                    record(r, "email")
                 emit(agent.name, "email")
 
-            await email_guess_batch(need_email, on_result=on_email_result)
+            work = partial(email_guess_batch, need_email, on_result=on_email_result)
+            return await timed("email", need_email, work)
+
+        # ── Route each agent through the search sources, best expected yield first ──
+        routes: dict[int, list[str]] = {}
+        for agent in uncached:
+            if agent.row_index not in still_need:
+                continue
+            franchise, state = segment(agent)
+            available = [
+                source for source in SEARCH_SOURCES
+                if pending(agent, source) and (source != "brokerage" or has_scraper(franchise))
+            ]
+            routes[agent.row_index] = phase_stats.route(
+                available, franchise, state, per_second=deadline is not None,
+            )
+            if available and not routes[agent.row_index]:
+                searched.add(agent.row_index)  # every source is a known miss here
+
+        # ── Warm up: resolve every host and mail domain the run may use ──
+        scrapers = {
+            franchise: make_scraper(franchise, client, stores)
+            for franchise in {
+                segment(a)[0] for a in uncached if "brokerage" in routes.get(a.row_index, ())
+            }
+        }
+        urls = [scraper.base_url for scraper in scrapers.values() if scraper.base_url]
+        if any("realtor" in route for route in routes.values()):
+            urls.append(REALTOR_URL)
+        mail_domains = {
+            d for a in uncached if not results[a.row_index].email for d in domains_for(a.brokerage)
+        }
+        warm_tasks = [warmup.prefetch(urls, mail_domains)]
+
+        try:
+            phase_runs = {"brokerage": brokerage_phase, "search": search_phase, "realtor": realtor_phase}
+            out_of_time = False
+            while not out_of_time:
+                # Each round sends every agent still missing to its next source;
+                # different sources run side by side since their budgets are separate
+                by_source: dict[str, list[AgentRow]] = {}
+                for agent in uncached:
+                    route = routes.get(agent.row_index)
+                    if route and agent.row_index in still_need:
+                        by_source.setdefault(route.pop(0), []).append(agent)
+                if not by_source:
+                    break
+                done = await asyncio.gather(*(
+                    phase_runs[source](group) for source, group in by_source.items()
+                ))
+                out_of_time = not all(done)
+            if not out_of_time:
+                out_of_time = not await email_phase()
+        finally:
+            # Background lookups and HEADs must not outlive the client
+            for task in warm_tasks:
+                task.cancel()
 
     # ── Save cache ──
-    cache.save()
+    await asyncio.to_thread(stores.save)
 
     # ── Final cleanup ──
+    skipped_rows: set[int] = set()
+    if out_of_time:
+        for agent in uncached:
+            if agent.row_index not in searched:
+                skipped_rows.update(index_map.get(_key(agent), [agent.row_index]))
     for idx, r in results.items():
         if not r.has_contact and r.status != ContactStatus.ERROR:
-            r.status = ContactStatus.NOT_FOUND
+            r.status = ContactStatus.SKIPPED if idx in skipped_rows else ContactStatus.NOT_FOUND
 
     # Build ordered result list matching original input order
     ordered = [results[a.row_index] for a in agents]
@@ -278,3 +546,56 @@ async def run_pipeline(
     )
 
     return ordered
+
+
+async def run_pipeline_batches(
+    batches: AsyncIterator[list[AgentRow]],
+    on_batch: Callable[[list[ContactResult]], None],
+    progress_callback: Callable[[dict], None] | None = None,
+    checkpoint: JobCheckpoint | None = None,
+    completed: int = 0,
+    found: int = 0,
+    deadline: float | None = None,
+):
+    """Run the pipeline over agent batches as they arrive from the parser.
+
+    Each batch's final results go to `on_batch` (in input order) as soon as
+    that batch finishes, instead of being held until the whole job ends.
+
+    Progress counts are cumulative across batches (starting from
+    `completed`/`found` when resuming a job); `total` is the number of rows
+    received so far, so it grows while the upload is still being parsed.
+    """
+    stores = await asyncio.to_thread(PipelineStores.open)
+    cached = 0
+    total = completed
+    # Final result per dedup key, so agents repeated across batches are searched once
+    known: dict[str, ContactResult] = {}
+
+    async for batch in batches:
+        total += len(batch)
+        batch_cached = 0
+
+        def on_progress(data: dict):
+            nonlocal batch_cached
+            batch_cached = data["cached_hits"]
+            if progress_callback:
+                progress_callback({
+                    **data,
+                    "completed": completed + data["completed"],
+                    "total": total,
+                    "found": found + data["found"],
+                    "not_found": (completed - found) + data["not_found"],
+                    "cached_hits": cached + data["cached_hits"],
+                })
+
+        batch_results = await run_pipeline(
+            batch, on_progress, stores=stores, checkpoint=checkpoint, deadline=deadline, known=known,
+        )
+        for r in batch_results:
+            if r.status != ContactStatus.SKIPPED:
+                known.setdefault(_key(r.agent), r)
+        on_batch(batch_results)
+        completed += len(batch_results)
+        found += sum(1 for r in batch_results if r.has_contact)
+        cached += batch_cached
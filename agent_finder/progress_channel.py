@@ -0,0 +1,74 @@
+"""Per-job broadcast of progress events to SSE subscribers.
+
+The pipeline publishes an event for every agent it finishes. Progress
+counts are cumulative, so a client only needs the newest one: the channel
+keeps a short ring buffer, wakes subscribers when something is published,
+and each subscriber coalesces bursts to at most `max_rate` updates a second.
+"""
+
+import asyncio
+from collections import deque
+from typing import AsyncIterator
+
+HISTORY_SIZE = 64
+MAX_UPDATES_PER_SEC = 4
+HEARTBEAT_SECONDS = 5.0
+
+
+class ProgressChannel:
+    def __init__(self, history: int = HISTORY_SIZE):
+        self._events: deque[tuple[int, dict]] = deque(maxlen=history)
+        self._seq = 0
+        self._changed = asyncio.Event()
+        self.closed = False
+        self.last_progress: dict | None = None
+
+    def publish(self, event: dict):
+        if self.closed:
+            return
+        self._seq += 1
+        self._events.append((self._seq, event))
+        if event.get("type") == "progress":
+            self.last_progress = event
+        # Wake everyone waiting on the current event, then start a fresh one
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def close(self, event: dict):
+        """Publish a terminal event (complete/error/cancelled) and end the stream."""
+        self.publish(event)
+        self.closed = True
+
+    def _since(self, seq: int) -> list[dict]:
+        events = [e for s, e in self._events if s > seq]
+        # Keep only the newest of each run of progress events
+        return [
+            e for i, e in enumerate(events)
+            if e.get("type") != "progress"
+            or i + 1 == len(events)
+            or events[i + 1].get("type") != "progress"
+        ]
+
+    async def subscribe(
+        self,
+        max_rate: float = MAX_UPDATES_PER_SEC,
+        heartbeat: float = HEARTBEAT_SECONDS,
+    ) -> AsyncIterator[dict]:
+        """Yield events until the channel closes, with heartbeats when idle."""
+        seen = 0
+        while True:
+            changed = self._changed
+            events = self._since(seen)
+            seen = self._seq
+            for event in events:
+                yield event
+            if self.closed and seen == self._seq:
+                return
+            if events:
+                # Let a burst accumulate instead of waking for every event
+                await asyncio.sleep(1 / max_rate)
+                continue
+            try:
+                await asyncio.wait_for(changed.wait(), heartbeat)
+            except asyncio.TimeoutError:
+                yield {"type": "heartbeat"}
@@ -1,7 +1,15 @@
-"""Async token-bucket rate limiter for controlling request rates."""
+"""Async rate limiting: a simple token bucket, and a fair scheduler that
+shares each source's request budget between concurrent jobs."""
 
 import asyncio
+import heapq
+import itertools
+import random
 import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 
 
 class TokenBucketLimiter:
@@ -31,3 +39,178 @@ class TokenBucketLimiter:
                 self.tokens = 0.0
             else:
                 self.tokens -= 1.0
+
+
+# ── Fair sharing of source budgets across jobs ──
+
+PRIORITY_INTERACTIVE = 0     # single lookups and diagnostics: served first
+PRIORITY_BULK = 1            # uploaded jobs
+SMALL_JOB_ROWS = 500         # jobs up to this size get SMALL_JOB_WEIGHT
+SMALL_JOB_WEIGHT = 4.0
+
+
+@dataclass(frozen=True)
+class JobShare:
+    """Who is asking for a request slot, and how big a share they get."""
+    job_id: str
+    weight: float = 1.0
+    priority: int = PRIORITY_BULK
+
+
+def job_share(job_id: str, total_rows: int) -> JobShare:
+    weight = SMALL_JOB_WEIGHT if total_rows <= SMALL_JOB_ROWS else 1.0
+    return JobShare(job_id, weight, PRIORITY_BULK)
+
+
+# Set by the job runner; tasks the job starts inherit it
+current_share: ContextVar[JobShare] = ContextVar(
+    "current_share", default=JobShare("", 1.0, PRIORITY_INTERACTIVE),
+)
+
+
+class _Source:
+    def __init__(self, rate: float, burst: int, jitter: float):
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self.paused_until = 0.0
+        self.vtime = 0.0                       # virtual time of the last grant
+        self.finish: dict[str, float] = {}     # job -> virtual finish of its last request
+        self.waiting: list = []                # heap of (priority, finish, seq, job_id, future)
+        self.granted: Counter = Counter()     # job -> requests granted, while it runs
+        self.pump: asyncio.Task | None = None
+
+
+class FairScheduler:
+    """Global request budget per source, shared fairly between jobs.
+
+    Each source (DDG, Realtor.com, a brokerage domain) is a token bucket.
+    When several jobs wait on the same source, the next token goes to the
+    highest priority, then to the job with the smallest virtual finish time
+    (weighted fair queuing): every job gets a share proportional to its
+    weight however many requests it has queued, so a small upload keeps
+    moving next to a 20k-row one. Sources that aren't configured are not
+    limited.
+    """
+
+    def __init__(self):
+        self._sources: dict[str, _Source] = {}
+        self._seq = itertools.count()
+        # Fraction of each source's rate this process may use (worker mode)
+        self.capacity = 1.0
+
+    def configure(self, source: str, rate: float, burst: int = 1, jitter: float = 0.0):
+        """Set a source's budget: `rate` requests/second, `jitter` extra random wait."""
+        src = self._sources.get(source)
+        if src is None:
+            self._sources[source] = _Source(rate, burst, jitter)
+        else:
+            src.rate, src.burst, src.jitter = rate, burst, jitter
+
+    def pause(self, source: str, seconds: float):
+        """Hold every job's requests to a source, e.g. after it rate-limits us."""
+        src = self._sources.get(source)
+        if src:
+            src.paused_until = max(src.paused_until, time.monotonic() + seconds)
+
+    def set_capacity(self, fraction: float):
+        self.capacity = min(1.0, max(0.01, fraction))
+
+    async def acquire(self, source: str):
+        src = self._sources.get(source)
+        if src is None:
+            return
+        share = current_share.get()
+        loop = asyncio.get_running_loop()
+        start = max(src.vtime, src.finish.get(share.job_id, 0.0))
+        finish = start + 1.0 / share.weight
+        src.finish[share.job_id] = finish
+
+        fut = loop.create_future()
+        heapq.heappush(src.waiting, (share.priority, finish, next(self._seq), share.job_id, fut))
+        if src.pump is None or src.pump.done() or src.pump.get_loop() is not loop:
+            src.pump = loop.create_task(self._pump(src))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+
+    async def _pump(self, src: _Source):
+        loop = asyncio.get_running_loop()
+        while src.waiting:
+            now = time.monotonic()
+            if now < src.paused_until:
+                await asyncio.sleep(src.paused_until - now)
+                continue
+            rate = src.rate * self.capacity
+            src.tokens = min(src.burst, src.tokens + (now - src.last_refill) * rate)
+            src.last_refill = now
+            if src.tokens < 1.0:
+                await asyncio.sleep((1.0 - src.tokens) / rate + random.uniform(0, src.jitter))
+                continue
+
+            _, finish, _, job_id, fut = heapq.heappop(src.waiting)
+            if fut.done() or fut.get_loop() is not loop:
+                continue  # waiter gave up, or belongs to a finished event loop
+            src.tokens -= 1.0
+            src.vtime = finish
+            src.granted[job_id] += 1
+            fut.set_result(None)
+
+            if len(src.finish) > 256:
+                src.finish = {j: f for j, f in src.finish.items() if f > src.vtime}
+
+    def release(self, job_id: str):
+        """Forget a finished job's grant counts and queue position."""
+        for src in self._sources.values():
+            src.granted.pop(job_id, None)
+            src.finish.pop(job_id, None)
+
+    def report(self) -> dict[str, dict]:
+        """Per-source budget, queue length and grants per running job."""
+        return {
+            name: {
+                "rate_per_sec": round(src.rate * self.capacity, 3),
+                "waiting": sum(1 for w in src.waiting if not w[4].done()),
+                "paused_for": round(max(0.0, src.paused_until - time.monotonic()), 1),
+                "granted": dict(src.granted.most_common(20)),
+            }
+            for name, src in sorted(self._sources.items())
+        }
+
+
+scheduler = FairScheduler()
+
+
+class Slot:
+    """One request slot from `source`'s budget, taken on first use.
+
+    A unit of work (one agent, one roster page) sets it as `current_slot`
+    instead of acquiring up front. The HTTP cache takes it before its
+    first network request, so work served from disk costs no budget.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.taken = False
+
+    async def take(self):
+        if not self.taken:
+            self.taken = True
+            await scheduler.acquire(self.source)
+
+
+current_slot: ContextVar[Slot | None] = ContextVar("current_slot", default=None)
+
+
+@contextmanager
+def request_slot(source: str):
+    """Give the work in this block one `Slot` of `source`'s budget."""
+    token = current_slot.set(Slot(source))
+    try:
+        yield
+    finally:
+        current_slot.reset(token)
@@ -0,0 +1,221 @@
+"""Retry policy for the scraper HTTP layer.
+
+Transient failures are retried with jittered exponential backoff: connect
+errors, connection resets, 5xx and 429. A definitive answer is returned
+as-is: a 404 or any other 4xx, or a read timeout, since the adaptive
+timeouts already bound those. Retries draw on a per-job budget, so a
+site that is down can't multiply a job's request count.
+
+Per-agent time limits run through a `Deadline`, which doesn't count the
+time a retry spends backing off or waiting for a request slot.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Awaitable, TypeVar
+
+import httpx
+
+logger = logging.getLogger("agent_finder.retry")
+
+T = TypeVar("T")
+
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 0.5       # seconds before the first retry (before jitter)
+BACKOFF_CAP = 8.0
+BUDGET_RATIO = 0.1       # each request earns this many retries
+BUDGET_MIN = 10          # retries every job may spend regardless
+
+TRANSIENT_ERRORS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+    httpx.ReadError,
+    httpx.WriteError,
+    httpx.RemoteProtocolError,
+)
+
+
+class RetryBudget:
+    """Retries allowed for one job: BUDGET_MIN plus BUDGET_RATIO per request."""
+
+    def __init__(self, ratio: float = BUDGET_RATIO, minimum: int = BUDGET_MIN):
+        self.ratio = ratio
+        self.tokens = float(minimum)
+        self._lock = threading.Lock()
+
+    def on_request(self):
+        with self._lock:
+            self.tokens += self.ratio
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.tokens < 1.0:
+                return False
+            self.tokens -= 1.0
+            return True
+
+
+# Set by the job runner; requests outside a job share one budget
+_shared_budget = RetryBudget()
+current_budget: ContextVar[RetryBudget | None] = ContextVar("current_budget", default=None)
+
+
+class Deadline:
+    """A time limit that stops counting while paused by `off_the_clock`.
+
+    The backoff and the wait for a fresh request slot are spent on
+    purpose. Counting them would turn a transient failure that retrying
+    recovered from into a timeout.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.paused = 0.0
+        self._start = time.monotonic()
+        self._pauses = 0
+        self._paused_at = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since `run` started, not counting paused time."""
+        now = time.monotonic()
+        paused = self.paused + (now - self._paused_at if self._pauses else 0.0)
+        return now - self._start - paused
+
+    def pause(self):
+        if self._pauses == 0:
+            self._paused_at = time.monotonic()
+        self._pauses += 1
+
+    def resume(self):
+        self._pauses -= 1
+        if self._pauses == 0:
+            self.paused += time.monotonic() - self._paused_at
+
+    async def run(self, aw: Awaitable[T]) -> T:
+        """Await `aw`, raising asyncio.TimeoutError once the limit is used up."""
+        token = current_deadline.set(self)
+        try:
+            task = asyncio.ensure_future(aw)
+        finally:
+            current_deadline.reset(token)
+        self._start = time.monotonic()
+        try:
+            while True:
+                remaining = self.seconds - self.elapsed
+                if remaining <= 0:
+                    task.cancel()
+                    await asyncio.wait({task})
+                    raise asyncio.TimeoutError
+                done, _ = await asyncio.wait({task}, timeout=remaining)
+                if done:
+                    return task.result()
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+
+
+# Set inside Deadline.run, so retries can pause it
+current_deadline: ContextVar[Deadline | None] = ContextVar("current_deadline", default=None)
+
+
+async def off_the_clock(aw: Awaitable[T]) -> T:
+    """Await `aw` without counting the wait against the current Deadline."""
+    deadline = current_deadline.get()
+    if deadline is None:
+        return await aw
+    deadline.pause()
+    try:
+        return await aw
+    finally:
+        deadline.resume()
+
+
+class RetryStats:
+    def __init__(self):
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def count(self, host: str, outcome: str):
+        with self._lock:
+            self._counts[(host, outcome)] += 1
+
+    def report(self) -> dict[str, dict[str, int]]:
+        """Per host: retries by reason, recoveries, give-ups and budget denials."""
+        with self._lock:
+            counts = dict(self._counts)
+        report: dict[str, dict[str, int]] = {}
+        for (host, outcome), n in sorted(counts.items()):
+            report.setdefault(host, {})[outcome] = n
+        return report
+
+
+stats = RetryStats()
+
+
+def _reason(resp: httpx.Response | None, exc: Exception | None) -> str | None:
+    """Why a request should be retried, or None if its outcome is final."""
+    if exc is not None:
+        return type(exc).__name__ if isinstance(exc, TRANSIENT_ERRORS) else None
+    if resp.status_code == 429 or resp.status_code >= 500:
+        return f"http_{resp.status_code}"
+    return None
+
+
+def _backoff(attempt: int, resp: httpx.Response | None) -> float:
+    if resp is not None:
+        retry_after = resp.headers.get("retry-after", "")
+        if retry_after.isdigit():
+            return min(BACKOFF_CAP, float(retry_after))
+    # Full jitter: spreads out retries from many agents hitting the same host
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+async def with_retries(host: str, send, before_retry=None) -> httpx.Response:
+    """Run `send()` and retry transient failures within the job's budget.
+
+    `before_retry` is awaited before each retry (e.g. to take a rate
+    limiter slot). Raises the last error, or returns the last response,
+    when retries run out.
+    """
+    budget = current_budget.get() or _shared_budget
+    budget.on_request()
+    attempt = 0
+    while True:
+        resp, exc = None, None
+        try:
+            resp = await send()
+        except Exception as e:
+            exc = e
+
+        reason = _reason(resp, exc)
+        if reason is None:
+            if attempt:
+                stats.count(host, "recovered")
+            if exc is not None:
+                raise exc
+            return resp
+
+        attempt += 1
+        if attempt >= MAX_ATTEMPTS:
+            stats.count(host, "gave_up")
+        elif not budget.try_spend():
+            stats.count(host, "budget_exhausted")
+        else:
+            stats.count(host, f"retry:{reason}")
+            delay = _backoff(attempt, resp)
+            logger.debug("Retrying %s after %s in %.1fs", host, reason, delay)
+            await off_the_clock(asyncio.sleep(delay))
+            if before_retry:
+                await off_the_clock(before_retry())
+            continue
+
+        if exc is not None:
+            raise exc
+        return resp
@@ -5,22 +5,31 @@ The ddgs library provides a proper API with backend rotation and
 structured results — much more reliable than raw HTML scraping.
 """
 
-import asyncio
 import logging
-import random
+import math
 import re
+import time
 
+from .. import executors
+from ..metrics import timeouts
 from ..models import AgentRow, ContactResult, ContactStatus
+from ..rate_limiter import scheduler
+from ..single_flight import search_once
 from .helpers import extract_phones, extract_emails
 
 logger = logging.getLogger("agent_finder.searchers.ddg")
 
-# Rate limiting
+# Rate limiting (shared by every job through the scheduler)
+SOURCE = "ddg"
 QUERY_DELAY = 3.0           # seconds between queries
 JITTER_MAX = 2.0             # random extra delay
 COOLDOWN_EVERY = 50          # take a longer break every N queries
 COOLDOWN_SECONDS = 15.0      # longer break duration
 RATE_LIMIT_BACKOFF = 30.0    # backoff on rate limit
+SEARCH_TIMEOUT = 20          # per query, until adaptive timeouts take over
+
+scheduler.configure(SOURCE, rate=1 / QUERY_DELAY, jitter=JITTER_MAX)
+_queries = 0
 
 # Backends to try in order (fallback if one gets rate-limited)
 BACKENDS = ["auto", "html", "lite"]
@@ -75,11 +84,7 @@ async def search_one(agent: AgentRow) -> ContactResult:
 
     for backend in BACKENDS:
         try:
-            loop = asyncio.get_event_loop()
-            search_results = await loop.run_in_executor(
-                None,
-                lambda b=backend: _run_ddg_search(query, b),
-            )
+            search_results = await executors.run("search", _run_ddg_search, query, backend)
 
             if not search_results:
                 continue
@@ -110,7 +115,9 @@ async def search_one(agent: AgentRow) -> ContactResult:
         except Exception as e:
             if "ratelimit" in str(e).lower():
                 logger.warning("DDG rate limited on backend '%s', backing off", backend)
-                await asyncio.sleep(RATE_LIMIT_BACKOFF)
+                # Back off for every job, not just this one
+                scheduler.pause(SOURCE, RATE_LIMIT_BACKOFF)
+                await scheduler.acquire(SOURCE)
             else:
                 logger.debug("DDG backend '%s' failed for %s: %s", backend, agent.name, e)
             continue
@@ -119,16 +126,25 @@ async def search_one(agent: AgentRow) -> ContactResult:
 
 
 def _run_ddg_search(query: str, backend: str) -> list[dict]:
-    """Run a DDG search synchronously (called from executor)."""
+    """Run a DDG search synchronously (called on the search executor)."""
     from ddgs import DDGS
-
-    with DDGS(timeout=20) as ddgs:
-        results = list(ddgs.text(
-            query,
-            backend=backend,
-            max_results=8,
-            region="us-en",
-        ))
+    from ddgs.exceptions import TimeoutException
+
+    # Each backend gets its own timeout from its recent latencies
+    limit = timeouts.timeout(SOURCE, backend, SEARCH_TIMEOUT)
+    start = time.monotonic()
+    try:
+        with DDGS(timeout=math.ceil(limit)) as ddgs:
+            results = list(ddgs.text(
+                query,
+                backend=backend,
+                max_results=8,
+                region="us-en",
+            ))
+    except TimeoutException:
+        timeouts.observe(SOURCE, backend, time.monotonic() - start, timed_out=True)
+        raise
+    timeouts.observe(SOURCE, backend, time.monotonic() - start)
     return results
 
 
@@ -136,22 +152,24 @@ async def search_batch(
     agents: list[AgentRow],
     on_result=None,
 ) -> list[ContactResult]:
-    """Search a batch of agents sequentially with rate limiting."""
+    """Search a batch of agents sequentially, within the shared DDG budget."""
     results: list[ContactResult] = []
 
-    for i, agent in enumerate(agents):
-        r = await search_one(agent)
+    async def _search(agent: AgentRow) -> ContactResult:
+        global _queries
+        await scheduler.acquire(SOURCE)
+        _queries += 1
+        # Longer cooldown every N queries across all jobs
+        if _queries % COOLDOWN_EVERY == 0:
+            logger.info("DDG cooldown after %d queries", _queries)
+            scheduler.pause(SOURCE, COOLDOWN_SECONDS)
+        return await search_one(agent)
+
+    for agent in agents:
+        # Another job searching for the same agent shares its query
+        r = await search_once(SOURCE, agent, _search)
         results.append(r)
         if on_result:
             on_result(r)
 
-        # Rate limiting
-        delay = QUERY_DELAY + random.uniform(0, JITTER_MAX)
-        await asyncio.sleep(delay)
-
-        # Longer cooldown every N queries
-        if (i + 1) % COOLDOWN_EVERY == 0 and i + 1 < len(agents):
-            logger.info("DDG cooldown after %d queries", i + 1)
-            await asyncio.sleep(COOLDOWN_SECONDS)
-
     return results
@@ -7,14 +7,26 @@ Expanded from 14 to 60+ brokerage domains. Uses dnspython for
 proper MX record validation.
 """
 
-import asyncio
 import logging
 import re
+import socket
+import time
 
+from .. import executors
 from ..models import AgentRow
+from ..single_flight import flights
 
 logger = logging.getLogger("agent_finder.searchers.email_guesser")
 
+MX_TTL = 3600.0         # seconds an MX answer is reused within the process
+MX_FAILURE_TTL = 60.0   # a lookup that failed (timeout, no nameserver) is retried sooner
+
+# getaddrinfo errors that mean the name doesn't exist, rather than that DNS didn't answer
+_NO_SUCH_HOST = {socket.EAI_NONAME, getattr(socket, "EAI_NODATA", socket.EAI_NONAME)}
+
+# domain -> (has MX, expiry)
+_mx_cache: dict[str, tuple[bool, float]] = {}
+
 # Expanded brokerage domain database (60+ entries)
 KNOWN_DOMAINS: dict[str, list[str]] = {
     # Tier 1: Top franchises by volume
@@ -118,6 +130,16 @@ def _guess_domain_from_name(brokerage: str) -> str | None:
     return domain
 
 
+def domains_for(brokerage: str) -> list[str]:
+    """Email domains to try for a brokerage: known ones, else one guessed from its name."""
+    domains = _find_domains(brokerage)
+    if not domains:
+        guessed = _guess_domain_from_name(brokerage)
+        if guessed:
+            domains = [guessed]
+    return domains
+
+
 def _generate_patterns(name: str, domain: str) -> list[str]:
     """Generate common email address patterns."""
     parts = name.lower().split()
@@ -148,17 +170,29 @@ def _generate_patterns(name: str, domain: str) -> list[str]:
     return patterns
 
 
-async def _check_mx(domain: str) -> bool:
-    """Check if a domain has MX records using dnspython."""
-    loop = asyncio.get_event_loop()
+async def has_mx(domain: str) -> bool:
+    """Whether `domain` accepts mail, from the process-wide cache when possible."""
+    cached = _mx_cache.get(domain)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+    result = await _check_mx(domain)
+    ttl = MX_TTL if result is not None else MX_FAILURE_TTL
+    _mx_cache[domain] = (bool(result), time.monotonic() + ttl)
+    return bool(result)
+
+
+async def _check_mx(domain: str) -> bool | None:
+    """Check if a domain has MX records using dnspython. None if the
+    lookup failed without an answer either way."""
     try:
-        return await loop.run_in_executor(None, lambda: _resolve_mx(domain))
+        # Concurrent jobs checking the same domain share one lookup
+        return await flights.do(("mx", domain), lambda: executors.run("dns", _resolve_mx, domain))
     except Exception:
-        return False
+        return None
 
 
-def _resolve_mx(domain: str) -> bool:
-    """Synchronous MX record check."""
+def _resolve_mx(domain: str) -> bool | None:
+    """Synchronous MX record check. None if DNS gave no answer either way."""
     try:
         import dns.resolver
         answers = dns.resolver.resolve(domain, 'MX')
@@ -166,11 +200,12 @@ def _resolve_mx(domain: str) -> bool:
     except Exception:
         # Fallback to socket
         try:
-            import socket
             socket.getaddrinfo(domain, 25, socket.AF_INET, socket.SOCK_STREAM)
             return True
+        except socket.gaierror as e:
+            return False if e.errno in _NO_SUCH_HOST else None
         except Exception:
-            return False
+            return None
 
 
 async def guess_email(name: str, brokerage: str) -> str | None:
@@ -182,19 +217,12 @@ async def guess_email(name: str, brokerage: str) -> str | None:
     if not name or not brokerage:
         return None
 
-    domains = _find_domains(brokerage)
-
-    if not domains:
-        guessed = _guess_domain_from_name(brokerage)
-        if guessed:
-            domains = [guessed]
-
+    domains = domains_for(brokerage)
     if not domains:
         return None
 
     for domain in domains:
-        has_mx = await _check_mx(domain)
-        if has_mx:
+        if await has_mx(domain):
             patterns = _generate_patterns(name, domain)
             if patterns:
                 return patterns[0]
@@ -208,21 +236,11 @@ async def guess_batch(
 ) -> dict[int, str]:
     """Guess emails for a batch of agents. Returns {row_index: email}."""
     results: dict[int, str] = {}
-    mx_cache: dict[str, bool] = {}
 
     for agent in agents:
-        domains = _find_domains(agent.brokerage)
-        if not domains:
-            guessed = _guess_domain_from_name(agent.brokerage)
-            if guessed:
-                domains = [guessed]
-
         email = None
-        for domain in domains:
-            if domain not in mx_cache:
-                mx_cache[domain] = await _check_mx(domain)
-
-            if mx_cache[domain]:
+        for domain in domains_for(agent.brokerage):
+            if await has_mx(domain):
                 patterns = _generate_patterns(agent.name, domain)
                 if patterns:
                     email = patterns[0]
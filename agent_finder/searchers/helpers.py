@@ -4,6 +4,7 @@ import re
 import random
 import asyncio
 import logging
+from typing import Callable, Iterator
 
 logger = logging.getLogger("agent_finder.searchers")
 
@@ -22,6 +23,25 @@ EMAIL_RE = re.compile(
     r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
 )
 
+# Phones and emails in one alternation so page text is scanned once.
+# The lookbehind keeps the email branch from being retried at every
+# position inside a word that already failed to match.
+CONTACT_RE = re.compile(
+    r'(?P<email>(?<![a-zA-Z0-9._%+-])[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
+    r'|'
+    r'(?<!\d)'
+    r'(?:\+?1[-.\s]?)?'
+    r'\(?(?P<area>[2-9]\d{2})\)?'
+    r'[-.\s]?'
+    r'(?P<mid>\d{3})'
+    r'[-.\s]?'
+    r'(?P<last>\d{4})'
+    r'(?!\d)',
+)
+
+# Asset filenames that look like emails (logo@2x.png, etc.)
+ASSET_SUFFIXES = (".png", ".jpg", ".gif", ".svg", ".css", ".js")
+
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
@@ -67,11 +87,115 @@ def extract_emails(text: str) -> list[str]:
     emails = []
     for match in EMAIL_RE.finditer(text):
         email = match.group().lower()
-        if not any(email.endswith(x) for x in [".png", ".jpg", ".gif", ".svg", ".css", ".js"]):
+        if not email.endswith(ASSET_SUFFIXES):
             emails.append(email)
     return emails
 
 
+def scan_contacts(
+    text: str,
+    max_phones: int | None = None,
+    max_emails: int | None = None,
+    stop_at_email: Callable[[str], bool] | None = None,
+) -> Iterator[tuple[str, str]]:
+    """Lazily yield ("phone", formatted) and ("email", address) pairs in page order.
+
+    Phones and emails come from a single pass over the text. Phones stop
+    being collected after `max_phones`; emails after `max_emails` or right
+    after an email for which `stop_at_email` returns True. Scanning ends as
+    soon as both sides are done.
+    """
+    phones_left = max_phones
+    emails_left = max_emails
+    emails_done = emails_left == 0
+
+    for match in CONTACT_RE.finditer(text):
+        email = match.group("email")
+        if email is not None:
+            if emails_done:
+                continue
+            email = email.lower()
+            if email.endswith(ASSET_SUFFIXES):
+                continue
+            yield "email", email
+            if emails_left is not None:
+                emails_left -= 1
+                emails_done = emails_left <= 0
+            if stop_at_email and stop_at_email(email):
+                emails_done = True
+        elif phones_left != 0:
+            yield "phone", f"({match.group('area')}) {match.group('mid')}-{match.group('last')}"
+            if phones_left is not None:
+                phones_left -= 1
+        if emails_done and phones_left == 0:
+            return
+
+
+def first_contact(
+    text: str,
+    want_phone: bool = True,
+    want_email: bool = True,
+    email_ok: Callable[[str], bool] | None = None,
+    prefer: Callable[[str], bool] | None = None,
+) -> tuple[str, str]:
+    """Return (first phone, best email) from page text, stopping early.
+
+    Only emails passing `email_ok` are considered. If `prefer` is given,
+    the first accepted email that also satisfies it wins and ends the scan;
+    otherwise the first accepted email is used.
+    """
+    def accepted(em: str) -> bool:
+        return email_ok is None or email_ok(em)
+
+    def final(em: str) -> bool:
+        return accepted(em) and (prefer is None or prefer(em))
+
+    phone = ""
+    email = ""
+    fallback = ""
+    for kind, value in scan_contacts(
+        text,
+        max_phones=1 if want_phone else 0,
+        max_emails=None if want_email else 0,
+        stop_at_email=final,
+    ):
+        if kind == "phone":
+            phone = value
+        elif final(value):
+            email = value
+        elif not fallback and accepted(value):
+            fallback = value
+
+    return phone, email or fallback
+
+
+def name_in_email(email: str, agent_name: str) -> bool:
+    """True if any part of the agent's name appears in the email's local part."""
+    local = email.split("@")[0]
+    return any(p in local for p in agent_name.lower().split())
+
+
+NAME_SUFFIXES = {"mr", "mrs", "ms", "dr", "jr", "sr", "ii", "iii", "iv", "pa"}
+
+
+def name_key(name: str) -> str:
+    """Normalize a person's name (or URL slug) to "first-last" for index lookups.
+
+    Middle names, suffixes and id-like tokens are dropped, so "John A. Smith Jr"
+    and the slug "john-a-smith-12345" both become "john-smith".
+    """
+    parts = []
+    for raw in re.split(r"[\s_-]+", name.lower()):
+        if any(c.isdigit() for c in raw):
+            continue
+        part = re.sub(r"[^a-z]", "", raw)
+        if part and part not in NAME_SUFFIXES:
+            parts.append(part)
+    if len(parts) < 2:
+        return ""
+    return f"{parts[0]}-{parts[-1]}"
+
+
 async def random_delay(min_sec: float = 3.0, max_sec: float = 7.0):
     delay = random.uniform(min_sec, max_sec)
     await asyncio.sleep(delay)
@@ -1,6 +1,7 @@
 """Realtor.com agent profile scraper.
 
-Searches by agent name + location instead of guessing URL slugs.
+Uses the exact profile URL from the sitemap index when available,
+otherwise tries name + location slug patterns.
 Extracts phone/email from profile pages.
 """
 
@@ -12,13 +13,23 @@ import httpx
 from bs4 import BeautifulSoup
 
 from ..models import AgentRow, ContactResult, ContactStatus
-from .helpers import get_headers, extract_phones, extract_emails
+from ..http_cache import parse_once
+from ..metrics import timeouts
+from ..rate_limiter import request_slot, scheduler
+from ..retry import Deadline
+from ..single_flight import fetch, search_once
+from ..sitemap_index import REALTOR_DOMAIN, SitemapIndex
+from .helpers import get_headers, extract_phones, first_contact
 
 logger = logging.getLogger("agent_finder.searchers.realtor")
 
+REALTOR_URL = "https://www.realtor.com"
 RATE_LIMIT = 2.5
 MAX_CONCURRENT = 2
-TIMEOUT = 15.0
+TIMEOUT = 15.0          # per page fetch, until adaptive timeouts take over
+AGENT_TIMEOUT = 30.0    # per agent (all URL strategies)
+
+scheduler.configure(REALTOR_DOMAIN, rate=MAX_CONCURRENT / RATE_LIMIT, burst=MAX_CONCURRENT)
 
 
 def _slugify(text: str) -> str:
@@ -31,6 +42,7 @@ def _slugify(text: str) -> str:
 async def search_realtor(
     agent: AgentRow,
     client: httpx.AsyncClient,
+    sitemap: SitemapIndex | None = None,
 ) -> ContactResult:
     """Search Realtor.com for an agent's profile."""
     result = ContactResult(agent=agent, source="realtor")
@@ -40,27 +52,34 @@ async def search_realtor(
     if not name_slug:
         return result
 
+    urls = []
+    # Strategy 0: Exact profile URL from the sitemap index
+    if sitemap:
+        url = sitemap.lookup(REALTOR_DOMAIN, agent.name, agent.city)
+        if url:
+            urls.append(url)
     # Strategy 1: Name + city + state URL pattern
     if agent.city and agent.state:
         city_slug = _slugify(agent.city)
         state = agent.state.strip().upper()[:2]
-        url = f"https://www.realtor.com/realestateagents/{name_slug}_{city_slug}_{state}"
-        phone, email = await _fetch_and_parse(client, url, headers, agent.name)
+        urls.append(f"{REALTOR_URL}/realestateagents/{name_slug}_{city_slug}_{state}")
+    # Strategy 2: Name-only URL pattern
+    urls.append(f"{REALTOR_URL}/realestateagents/{name_slug}")
+
+    failure = ""
+    for url in urls:
+        phone, email, error = await _fetch_and_parse(client, url, headers, agent.name)
         if phone or email:
             result.phone = phone
             result.email = email
             result.status = ContactStatus.FOUND
             return result
+        failure = error or failure
 
-    # Strategy 2: Name-only URL pattern
-    url = f"https://www.realtor.com/realestateagents/{name_slug}"
-    phone, email = await _fetch_and_parse(client, url, headers, agent.name)
-    if phone or email:
-        result.phone = phone
-        result.email = email
-        result.status = ContactStatus.FOUND
-        return result
-
+    if failure:
+        # Still failing after retries: not evidence the agent isn't listed
+        result.status = ContactStatus.ERROR
+        result.error_message = failure
     return result
 
 
@@ -69,16 +88,23 @@ async def _fetch_and_parse(
     url: str,
     headers: dict,
     agent_name: str,
-) -> tuple[str, str]:
-    """Fetch a URL and parse for phone/email."""
+) -> tuple[str, str, str]:
+    """Fetch a URL and parse for phone/email.
+
+    Returns (phone, email, failure); failure is set when the page couldn't
+    be fetched, as opposed to a 404 or a page without contact details.
+    """
     try:
-        resp = await client.get(url, headers=headers, timeout=TIMEOUT)
-        if resp.status_code != 200:
-            return "", ""
-        return _parse_profile(resp.text, agent_name)
+        resp = await fetch(client, url, kind="profile", headers=headers, timeout=TIMEOUT)
     except Exception as e:
         logger.debug("Realtor fetch failed for %s: %s", url, e)
-        return "", ""
+        return "", "", f"{type(e).__name__}: {e}"
+    if resp.status_code >= 500 or resp.status_code == 429:
+        return "", "", f"HTTP {resp.status_code}"
+    if resp.status_code != 200:
+        return "", "", ""
+    phone, email = parse_once(resp, agent_name, lambda html: _parse_profile(html, agent_name))
+    return phone, email, ""
 
 
 def _parse_profile(html: str, agent_name: str) -> tuple[str, str]:
@@ -104,18 +130,15 @@ def _parse_profile(html: str, agent_name: str) -> tuple[str, str]:
     # Fallback: full page text
     if not phone or not email:
         text = soup.get_text(separator=" ")
-        if not phone:
-            phones = extract_phones(text)
-            if phones:
-                phone = phones[0]
-        if not email:
-            all_emails = extract_emails(text)
-            skip_domains = {"realtor.com", "move.com"}
-            for em in all_emails:
-                domain = em.split("@")[1] if "@" in em else ""
-                if domain not in skip_domains:
-                    email = em
-                    break
+        skip_domains = {"realtor.com", "move.com"}
+        text_phone, text_email = first_contact(
+            text,
+            want_phone=not phone,
+            want_email=not email,
+            email_ok=lambda em: em.split("@")[1] not in skip_domains,
+        )
+        phone = phone or text_phone
+        email = email or text_email
 
     return phone, email
 
@@ -124,6 +147,7 @@ async def search_batch(
     agents: list[AgentRow],
     client: httpx.AsyncClient,
     on_result=None,
+    sitemap: SitemapIndex | None = None,
 ) -> list[ContactResult]:
     """Search a batch of agents on Realtor.com."""
     results: list[ContactResult] = []
@@ -132,25 +156,31 @@ async def search_batch(
     for batch_start in range(0, len(agents), MAX_CONCURRENT):
         batch = agents[batch_start : batch_start + MAX_CONCURRENT]
 
-        async def _search(a: AgentRow) -> ContactResult:
-            async with semaphore:
-                try:
-                    return await asyncio.wait_for(
-                        search_realtor(a, client), timeout=30.0
-                    )
-                except asyncio.TimeoutError:
-                    return ContactResult(agent=a, source="realtor")
-                except Exception:
-                    return ContactResult(agent=a, source="realtor")
-
-        batch_results = await asyncio.gather(*[_search(a) for a in batch])
+        async def _lookup(a: AgentRow) -> ContactResult:
+            with request_slot(REALTOR_DOMAIN):
+                async with semaphore:
+                    deadline = Deadline(timeouts.timeout(REALTOR_DOMAIN, "agent", AGENT_TIMEOUT))
+                    try:
+                        r = await deadline.run(search_realtor(a, client, sitemap))
+                        timeouts.observe(REALTOR_DOMAIN, "agent", deadline.elapsed)
+                        return r
+                    except asyncio.TimeoutError:
+                        timeouts.observe(REALTOR_DOMAIN, "agent", deadline.elapsed, timed_out=True)
+                        return ContactResult(
+                            agent=a, status=ContactStatus.ERROR, source="realtor", error_message="timeout",
+                        )
+                    except Exception as e:
+                        return ContactResult(
+                            agent=a, status=ContactStatus.ERROR, source="realtor", error_message=str(e),
+                        )
+
+        batch_results = await asyncio.gather(
+            *[search_once(REALTOR_DOMAIN, a, _lookup) for a in batch]
+        )
 
         for r in batch_results:
             results.append(r)
             if on_result:
                 on_result(r)
 
-        if batch_start + MAX_CONCURRENT < len(agents):
-            await asyncio.sleep(RATE_LIMIT)
-
     return results
@@ -0,0 +1,138 @@
+"""Process-wide coalescing of identical in-flight requests.
+
+Two jobs running at once often contain the same agent, and the cache is
+only written after a search finishes, so both would search for it. A
+single-flight group runs the first caller's work and has every later
+caller with the same key await that result instead of repeating the
+requests. Keys are the normalized agent key per source for searches and
+the URL for raw page fetches.
+
+Only results are shared between jobs. The work itself runs on the first
+caller's client and budgets and is cancelled with that caller, so it
+never outlives the job whose client it uses.
+"""
+
+import asyncio
+import dataclasses
+import logging
+import time
+from collections import Counter
+from typing import Awaitable, Callable, Hashable, TypeVar
+from urllib.parse import urlencode, urlparse
+
+import httpx
+
+from .metrics import timeouts
+from .models import AgentRow, ContactResult
+from .rate_limiter import scheduler
+from .retry import with_retries
+
+logger = logging.getLogger("agent_finder.single_flight")
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Share the result of one running call with every caller asking for the same key.
+
+    The call belongs to the caller that started it: it runs in that
+    caller's context (its client, request budget and retry budget) and
+    is cancelled with it. Later callers only ever get a finished result.
+    If the owner is cancelled first (its job was cancelled or ran out of
+    time), each waiting caller runs the call itself instead.
+    """
+
+    def __init__(self):
+        self._flights: dict[Hashable, asyncio.Task] = {}
+        self.stats: Counter = Counter()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._flights.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop() and not task.done():
+            self.stats["joined"] += 1
+            # Raises only if this caller is cancelled, not if the owner is
+            await asyncio.wait({task})
+            if not task.cancelled():
+                return task.result()
+            self.stats["retaken"] += 1
+            return await self.do(key, fn)
+
+        task = asyncio.ensure_future(fn())
+        self._flights[key] = task
+        task.add_done_callback(lambda t: self._forget(key, t))
+        self.stats["started"] += 1
+        # Awaited directly, so cancelling the owner cancels the work
+        return await task
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+
+    def __len__(self):
+        return len(self._flights)
+
+
+flights = SingleFlight()
+
+
+def agent_key(agent: AgentRow) -> str:
+    """Normalized (name, brokerage) key, as used for dedup and the cache."""
+    return f"{agent.name.strip().lower()}|{agent.brokerage.strip().lower()}"
+
+
+async def search_once(
+    source: str,
+    agent: AgentRow,
+    search: Callable[[AgentRow], Awaitable[ContactResult]],
+) -> ContactResult:
+    """Run `search(agent)` unless another job is already searching `source`
+    for the same agent, in which case share its result (or search after
+    all if that job is cancelled first).
+
+    Each caller gets its own copy of the result, pointing at its own agent
+    row, so it can be applied to that job's rows.
+    """
+    r = await flights.do((source, agent_key(agent)), lambda: search(agent))
+    return r if r.agent is agent else dataclasses.replace(r, agent=agent)
+
+
+async def fetch(
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict | None = None,
+    *,
+    kind: str = "page",
+    timeout: float = 15.0,
+    **kwargs,
+) -> httpx.Response:
+    """GET a page, sharing the response with concurrent requests for the same URL.
+
+    `timeout` is only the starting point: once the host has enough
+    history for this `kind` of request, its adaptive timeout is used.
+    Transient failures are retried (see retry.py). The body is read
+    before the response is shared; callers must treat it as read-only.
+    """
+    full_url = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+    host = urlparse(url).netloc
+
+    async def attempt() -> httpx.Response:
+        start = time.monotonic()
+        try:
+            resp = await client.get(
+                url, params=params, timeout=timeouts.timeout(host, kind, timeout), **kwargs,
+            )
+        except httpx.TimeoutException:
+            timeouts.observe(host, kind, time.monotonic() - start, timed_out=True)
+            raise
+        # Pages served from the HTTP cache without a request say nothing about the host
+        if resp.extensions.get("http_cache") not in ("hit", "negative_hit"):
+            timeouts.observe(host, kind, time.monotonic() - start - resp.extensions.get("slot_wait", 0.0))
+        return resp
+
+    async def get() -> httpx.Response:
+        # A retry takes a fresh slot from the site's request budget
+        return await with_retries(
+            host, attempt, before_retry=lambda: scheduler.acquire(host.removeprefix("www.")),
+        )
+
+    return await flights.do(("GET", full_url), get)
@@ -0,0 +1,279 @@
+"""Offline agent index built from franchise and Realtor.com sitemaps.
+
+Brokerage scrapers otherwise guess profile slugs from the agent's name,
+and every wrong guess costs a request and a 404. This downloads each
+site's agent sitemaps (plain or gzipped XML, parsed as a stream) and keeps
+a name-key -> profile URL map so scrapers can fetch the exact profile in
+one request.
+
+Build or refresh the index with:  python -m agent_finder.sitemap_index [domain ...]
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import re
+import sys
+import zlib
+from pathlib import Path
+from typing import Iterable, Iterator
+from urllib.parse import urlparse
+from xml.etree import ElementTree
+
+import httpx
+
+from .searchers.helpers import get_headers, name_key
+
+logger = logging.getLogger("agent_finder.sitemap_index")
+
+DATA_DIR = Path(__file__).parent / "data"
+INDEX_PATH = DATA_DIR / "sitemap_index.json.gz"
+
+REALTOR_DOMAIN = "realtor.com"
+
+# Agent profile URLs: the last path segment is the agent's slug
+AGENT_URL_RE = re.compile(
+    r"/(?:agent|agents|real-estate-agents|realestateagents|roster/agents)/([^/?#]+)/?$",
+    re.IGNORECASE,
+)
+MAX_URLS_PER_NAME = 5      # same-name agents kept for city disambiguation
+FETCH_TIMEOUT = 60.0
+
+
+class SitemapParser:
+    """Incremental sitemap parser fed with raw (optionally gzipped) chunks.
+
+    `feed` returns ("sitemap", url) for entries of a sitemap index and
+    ("url", url) for page entries, as soon as each element is complete.
+    """
+
+    def __init__(self):
+        self._inflate = None
+        self._sniffed = False
+        self._xml = ElementTree.XMLPullParser(events=("end",))
+
+    def feed(self, chunk: bytes) -> list[tuple[str, str]]:
+        if not chunk:
+            return []
+        if not self._sniffed:
+            self._sniffed = True
+            if chunk[:2] == b"\x1f\x8b":
+                self._inflate = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self._inflate:
+            chunk = self._inflate.decompress(chunk)
+        self._xml.feed(chunk)
+        return self._drain()
+
+    def close(self) -> list[tuple[str, str]]:
+        if self._inflate:
+            self._xml.feed(self._inflate.flush())
+        self._xml.close()
+        return self._drain()
+
+    def _drain(self) -> list[tuple[str, str]]:
+        found = []
+        for _, elem in self._xml.read_events():
+            tag = elem.tag.rsplit("}", 1)[-1]
+            if tag in ("sitemap", "url"):
+                loc = next((c.text for c in elem if c.tag.endswith("loc")), None)
+                if loc:
+                    found.append(("sitemap" if tag == "sitemap" else "url", loc.strip()))
+                elem.clear()
+        return found
+
+
+def iter_sitemap_locs(chunks: Iterable[bytes]) -> Iterator[tuple[str, str]]:
+    """Parse sitemap bytes (e.g. a local fixture read in blocks) lazily."""
+    parser = SitemapParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def agent_slug_key(url: str) -> str:
+    """Name key for an agent profile URL, or "" if it isn't one."""
+    m = AGENT_URL_RE.search(urlparse(url).path)
+    if not m:
+        return ""
+    # Realtor.com slugs look like "john-smith_austin_tx_123"
+    return name_key(m.group(1).split("_")[0])
+
+
+def _add_entry(entries: dict[str, list[str]], url: str) -> bool:
+    key = agent_slug_key(url)
+    if not key:
+        return False
+    # The full URL: sitemaps may use the bare host or another subdomain
+    urls = entries.setdefault(key, [])
+    url = url.split("#", 1)[0]
+    if url not in urls and len(urls) < MAX_URLS_PER_NAME:
+        urls.append(url)
+    return True
+
+
+def _lists_agents(sitemap_url: str) -> bool:
+    """Whether a sitemap is worth reading: it names agents, or it is a
+    site-wide index (sitemap.xml, sitemap_index.xml) that may link to them."""
+    if "agent" in sitemap_url.lower():
+        return True
+    name = urlparse(sitemap_url).path.rsplit("/", 1)[-1].lower()
+    return re.fullmatch(r"sitemap(?:[-_]?index)?\.xml(?:\.gz)?", name) is not None
+
+
+class SitemapIndex:
+    def __init__(self, path: Path = INDEX_PATH):
+        self.path = path
+        # domain -> name key -> [profile URLs]
+        self._data: dict[str, dict[str, list[str]]] = {}
+        self._load()
+
+    def _load(self):
+        if self.path.exists():
+            try:
+                with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                    self._data = json.load(f)
+                logger.info(
+                    "Sitemap index loaded: %d domains, %d names",
+                    len(self._data), sum(len(v) for v in self._data.values()),
+                )
+            except (OSError, EOFError, json.JSONDecodeError):
+                self._data = {}
+
+    def add(self, domain: str, url: str) -> bool:
+        return _add_entry(self._data.setdefault(domain, {}), url)
+
+    def replace_domain(self, domain: str, entries: dict[str, list[str]], keep_existing: bool = False):
+        """Set a domain's entries; with `keep_existing`, names missing from
+        `entries` keep their current URLs."""
+        if keep_existing:
+            entries = {**self._data.get(domain, {}), **entries}
+        self._data[domain] = entries
+
+    def lookup(self, domain: str, name: str, city: str = "") -> str | None:
+        """Exact profile URL for an agent on a domain, or None."""
+        urls = self._data.get(domain, {}).get(name_key(name))
+        if not urls:
+            return None
+        if city and len(urls) > 1:
+            city_slug = re.sub(r"[^a-z]+", "-", city.lower()).strip("-")
+            return next((u for u in urls if city_slug and city_slug in urlparse(u).path.lower()), urls[0])
+        return urls[0]
+
+    def __contains__(self, domain: str) -> bool:
+        return domain in self._data
+
+    def __len__(self):
+        return sum(len(v) for v in self._data.values())
+
+    def save(self):
+        try:
+            with gzip.open(self.path, "wt", encoding="utf-8") as f:
+                json.dump(self._data, f, separators=(",", ":"))
+            logger.info("Sitemap index saved: %d names", len(self))
+        except OSError as e:
+            logger.warning("Failed to save sitemap index: %s", e)
+
+
+async def _discover_sitemaps(client: httpx.AsyncClient, domain: str) -> list[str]:
+    """Agent sitemaps (or site-wide indexes) from robots.txt, falling back to /sitemap.xml."""
+    base = f"https://www.{domain}"
+    try:
+        resp = await client.get(f"{base}/robots.txt", headers=get_headers(), timeout=15.0)
+        if resp.status_code == 200:
+            found = [
+                line.split(":", 1)[1].strip()
+                for line in resp.text.splitlines()
+                if line.lower().startswith("sitemap:")
+            ]
+            # Listing, blog and page sitemaps can be huge and hold no agents
+            found = [url for url in found if _lists_agents(url)]
+            if found:
+                return found
+    except Exception as e:
+        logger.debug("robots.txt failed for %s: %s", domain, e)
+    return [f"{base}/sitemap.xml"]
+
+
+async def index_domain(client: httpx.AsyncClient, index: SitemapIndex, domain: str) -> int:
+    """Stream a domain's agent sitemaps into the index. Returns names indexed."""
+    entries: dict[str, list[str]] = {}
+    queue = await _discover_sitemaps(client, domain)
+    seen: set[str] = set()
+    profiles = 0
+    parsed = failed = 0
+
+    while queue:
+        sitemap_url = queue.pop(0)
+        if sitemap_url in seen:
+            continue
+        seen.add(sitemap_url)
+
+        parser = SitemapParser()
+        try:
+            async with client.stream(
+                "GET", sitemap_url, headers=get_headers(), timeout=FETCH_TIMEOUT,
+            ) as resp:
+                if resp.status_code != 200:
+                    logger.warning("Sitemap %s: HTTP %d", sitemap_url, resp.status_code)
+                    failed += 1
+                    continue
+                async for chunk in resp.aiter_raw():
+                    for kind, loc in parser.feed(chunk):
+                        profiles += _collect(kind, loc, entries, queue, seen)
+            for kind, loc in parser.close():
+                profiles += _collect(kind, loc, entries, queue, seen)
+            parsed += 1
+        except Exception as e:
+            logger.warning("Sitemap %s failed: %s", sitemap_url, e)
+            failed += 1
+
+    if not parsed:
+        # An outage must not wipe the domain's index
+        logger.warning("%s: no sitemap could be read; keeping the existing index", domain)
+        return 0
+    # Swap in the fresh map so removed agents drop out of the index; if
+    # some sitemaps failed, agents only they listed stay in
+    index.replace_domain(domain, entries, keep_existing=failed > 0)
+    logger.info("%s: %d agent profiles from %d sitemaps", domain, profiles, len(seen))
+    return profiles
+
+
+def _collect(
+    kind: str,
+    loc: str,
+    entries: dict[str, list[str]],
+    queue: list[str],
+    seen: set[str],
+) -> int:
+    if kind == "sitemap":
+        # Only follow child sitemaps that list agents, not listings/pages
+        if "agent" in loc.lower() and loc not in seen:
+            queue.append(loc)
+        return 0
+    return 1 if _add_entry(entries, loc) else 0
+
+
+def default_domains() -> list[str]:
+    """Every site a scraper can query: franchise scrapers, generic domains, Realtor.com."""
+    from .brokerages.generic import FRANCHISE_DOMAINS
+    from .pipeline import SCRAPER_CLASSES
+
+    domains = [urlparse(cls.base_url).netloc.removeprefix("www.") for cls in SCRAPER_CLASSES.values()]
+    domains += FRANCHISE_DOMAINS.values()
+    domains.append(REALTOR_DOMAIN)
+    return list(dict.fromkeys(domains))
+
+
+async def build_index(domains: list[str] | None = None) -> SitemapIndex:
+    index = SitemapIndex()
+    async with httpx.AsyncClient(follow_redirects=True) as client:
+        for domain in domains or default_domains():
+            await index_domain(client, index, domain)
+    index.save()
+    return index
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    asyncio.run(build_index(sys.argv[1:] or None))
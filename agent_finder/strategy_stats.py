@@ -0,0 +1,122 @@
+"""SQLite-backed hit statistics for brokerage URL strategies.
+
+Each brokerage scraper knows several ways to reach an agent (search page,
+slug profile, the generic scraper's search paths). This records, per site
+domain, how often each strategy produced a contact so scrapers can try the
+historical winner first and stop paying for strategies that never work.
+
+Every job and worker process adds its own counts to the shared table on
+save, so concurrent jobs don't overwrite each other's numbers.
+"""
+
+import logging
+import random
+import sqlite3
+from pathlib import Path
+
+logger = logging.getLogger("agent_finder.strategy_stats")
+
+MIN_TRIALS = 20        # attempts before a zero-hit strategy is dropped
+REPROBE_EVERY = 100    # still try a dropped strategy for 1 in N agents in case the site changed
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS strategy_stats (
+    domain   TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    hits     INTEGER NOT NULL,
+    PRIMARY KEY (domain, strategy)
+);
+"""
+
+
+class StrategyStats:
+    def __init__(self, path: Path):
+        self.path = path
+        # domain -> strategy -> [attempts, hits], as of the last load plus this job's counts
+        self._data: dict[str, dict[str, list[int]]] = {}
+        self._pending: dict[tuple[str, str], list[int]] = {}     # counts not saved yet
+        self._db = sqlite3.connect(str(path), timeout=10, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        self._load()
+
+    def _load(self):
+        try:
+            rows = self._db.execute("SELECT domain, strategy, attempts, hits FROM strategy_stats").fetchall()
+        except sqlite3.Error as e:
+            logger.warning("Failed to load strategy stats: %s", e)
+            return
+        self._data = {}
+        for domain, strategy, attempts, hits in rows:
+            self._data.setdefault(domain, {})[strategy] = [attempts, hits]
+        for (domain, strategy), (attempts, hits) in self._pending.items():
+            entry = self._entry(domain, strategy)
+            entry[0] += attempts
+            entry[1] += hits
+
+    def _entry(self, domain: str, strategy: str) -> list[int]:
+        return self._data.setdefault(domain, {}).setdefault(strategy, [0, 0])
+
+    @staticmethod
+    def _score(entry: list[int]) -> float:
+        attempts, hits = entry
+        # Laplace-smoothed hit rate: untried strategies start at 0.5
+        return (hits + 1) / (attempts + 2)
+
+    def order(self, domain: str, strategies: list[str]) -> list[str]:
+        """Return strategies best-first, without ones that never hit.
+
+        Ties keep the scraper's declared order. A dropped strategy is
+        still tried for a random 1 in REPROBE_EVERY agents in case the
+        site changed.
+        """
+        kept = []
+        for strategy in strategies:
+            attempts, hits = self._entry(domain, strategy)
+            if attempts >= MIN_TRIALS and hits == 0 and random.random() >= 1 / REPROBE_EVERY:
+                continue
+            kept.append(strategy)
+        kept.sort(key=lambda s: -self._score(self._entry(domain, s)))
+        return kept
+
+    def record(self, domain: str, strategy: str, hit: bool):
+        for entry in (self._entry(domain, strategy), self._pending.setdefault((domain, strategy), [0, 0])):
+            entry[0] += 1
+            if hit:
+                entry[1] += 1
+
+    def report(self) -> dict[str, list[dict]]:
+        """Per-domain strategy hit rates, best strategy first."""
+        report = {}
+        for domain, strategies in sorted(self._data.items()):
+            rows = []
+            for strategy, (attempts, hits) in strategies.items():
+                rows.append({
+                    "strategy": strategy,
+                    "attempts": attempts,
+                    "hits": hits,
+                    "hit_rate": round(hits / attempts * 100, 1) if attempts else 0,
+                    "dropped": attempts >= MIN_TRIALS and hits == 0,
+                })
+            rows.sort(key=lambda r: (-r["hit_rate"], -r["attempts"]))
+            report[domain] = rows
+        return report
+
+    def save(self):
+        """Add this job's unsaved counts to the table and pick up other jobs' counts."""
+        if not self._pending:
+            return
+        rows = [(domain, strategy, *counts) for (domain, strategy), counts in self._pending.items()]
+        try:
+            self._db.executemany(
+                """INSERT INTO strategy_stats (domain, strategy, attempts, hits) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(domain, strategy) DO UPDATE SET attempts = attempts + excluded.attempts,
+                       hits = hits + excluded.hits""",
+                rows,
+            )
+        except sqlite3.Error as e:
+            logger.warning("Failed to save strategy stats: %s", e)
+            return
+        self._pending.clear()
+        self._load()
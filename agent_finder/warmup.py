@@ -0,0 +1,191 @@
+"""DNS pre-resolution and connection warm-up for pipeline runs.
+
+Every run starts with a new HTTP client. Without warm-up, the first
+request to each host pays for the DNS lookup, the TCP connect and the
+TLS handshake, and the email phase then resolves the MX records of
+brokerage domains one at a time.
+
+Once the pipeline knows which hosts a run will hit, it resolves them all
+concurrently in the background. Addresses go into an in-process DNS
+cache that the HTTP transport connects through, and MX answers go into
+the email guesser's cache. Pooled connections are opened ahead of time
+with a HEAD request to the hosts a phase is about to use.
+"""
+
+import asyncio
+import logging
+import socket
+import threading
+import time
+from collections import Counter
+from functools import partial
+from urllib.parse import urlparse
+
+import httpcore
+import httpx
+
+from . import executors
+from .metrics import LatencyTracker
+from .rate_limiter import scheduler
+from .searchers.email_guesser import has_mx
+from .single_flight import flights
+
+logger = logging.getLogger("agent_finder.warmup")
+
+DNS_TTL = 300.0          # seconds a resolved address is reused
+WARM_TIMEOUT = 5.0       # seconds a warm-up request may take
+WARM_CONCURRENCY = 20    # lookups and connects in flight at once
+
+# First unit of work of each phase, and warm-up connects per host
+first_batch = LatencyTracker()
+connect_latency = LatencyTracker()
+
+
+class DnsCache:
+    """Resolved addresses per host, reused for DNS_TTL seconds."""
+
+    def __init__(self, ttl: float = DNS_TTL):
+        self.ttl = ttl
+        self.stats: Counter = Counter()
+        self._entries: dict[str, tuple[list[str], float]] = {}
+        self._lock = threading.Lock()
+
+    async def resolve(self, host: str) -> list[str]:
+        with self._lock:
+            entry = self._entries.get(host)
+        if entry and entry[1] > time.monotonic():
+            self.stats["hit"] += 1
+            return entry[0]
+        self.stats["miss"] += 1
+        # A request racing the warm-up joins its lookup
+        return await flights.do(("dns", host), lambda: self._lookup(host))
+
+    async def _lookup(self, host: str) -> list[str]:
+        infos = await executors.run("dns", socket.getaddrinfo, host, None, 0, socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._entries[host] = (addresses, time.monotonic() + self.ttl)
+        return addresses
+
+    def report(self) -> dict:
+        with self._lock:
+            cached = sum(1 for _, expires in self._entries.values() if expires > time.monotonic())
+        return {"cached_hosts": cached, **self.stats}
+
+
+dns = DnsCache()
+
+
+class CachedDnsBackend(httpcore.AsyncNetworkBackend):
+    """Network backend that connects to addresses from the DNS cache.
+
+    TLS still verifies against the host name, which httpcore passes
+    separately when it starts the handshake.
+    """
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend):
+        self._backend = backend
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = await dns.resolve(host)
+        except OSError:
+            addresses = []
+        # Let the underlying connect raise its usual error if nothing resolved
+        addresses = addresses or [host]
+        error: Exception | None = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        raise error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float):
+        await self._backend.sleep(seconds)
+
+
+def http_transport(limits: httpx.Limits) -> httpx.AsyncHTTPTransport:
+    """A pooled transport whose connections resolve hosts through `dns`.
+
+    httpx has no option for the pool's network backend, so the pool is
+    built here with the settings httpx would use and set as the
+    transport's `_pool`. httpx is pinned in requirements.txt, and the
+    check fails at startup rather than silently bypassing the DNS cache
+    if that internal changes.
+    """
+    transport = httpx.AsyncHTTPTransport(limits=limits)
+    if not isinstance(getattr(transport, "_pool", None), httpcore.AsyncConnectionPool):
+        raise RuntimeError(
+            f"httpx {httpx.__version__} doesn't keep its connection pool in _pool; "
+            "update warmup.http_transport"
+        )
+    transport._pool = httpcore.AsyncConnectionPool(
+        ssl_context=httpx.create_ssl_context(),
+        max_connections=limits.max_connections,
+        max_keepalive_connections=limits.max_keepalive_connections,
+        keepalive_expiry=limits.keepalive_expiry,
+        network_backend=CachedDnsBackend(httpcore.AnyIOBackend()),
+    )
+    return transport
+
+
+async def _gather_limited(calls):
+    semaphore = asyncio.Semaphore(WARM_CONCURRENCY)
+
+    async def limited(call):
+        async with semaphore:
+            await call()
+
+    await asyncio.gather(*(limited(call) for call in calls), return_exceptions=True)
+
+
+async def _prefetch(hosts: set[str], mail_domains: set[str]):
+    start = time.monotonic()
+    await _gather_limited(
+        [partial(dns.resolve, host) for host in hosts]
+        + [partial(has_mx, domain) for domain in mail_domains]
+    )
+    logger.debug(
+        "Resolved %d hosts and %d mail domains in %.2fs",
+        len(hosts), len(mail_domains), time.monotonic() - start,
+    )
+
+
+def prefetch(urls: list[str], mail_domains: set[str]) -> asyncio.Task:
+    """Resolve the hosts of `urls` and the MX records of `mail_domains` in the background."""
+    hosts = {urlparse(url).hostname for url in urls if urlparse(url).hostname}
+    return asyncio.ensure_future(_prefetch(hosts, mail_domains))
+
+
+async def _connect(client: httpx.AsyncClient, url: str):
+    host = urlparse(url).netloc
+    # The HEAD is a request like any other to the site's budget
+    await scheduler.acquire(host.removeprefix("www."))
+    start = time.monotonic()
+    try:
+        await client.head(url, timeout=WARM_TIMEOUT)
+        connect_latency.record(host, time.monotonic() - start)
+    except Exception as e:
+        logger.debug("Warm-up of %s failed: %s", host, e)
+
+
+def connect(client: httpx.AsyncClient, urls: list[str]) -> asyncio.Task:
+    """Open pooled connections to `urls` in the background, one HEAD each."""
+    return asyncio.ensure_future(
+        _gather_limited([partial(_connect, client, url) for url in dict.fromkeys(urls)])
+    )
+
+
+def report() -> dict:
+    return {
+        "first_batch": first_batch.report(),
+        "connect": connect_latency.report(),
+        "dns": dns.report(),
+    }
@@ -0,0 +1,211 @@
+"""Worker processes that run queued jobs outside the web process.
+
+With AGENT_FINDER_WORKERS=N (N > 0) the web process only queues jobs in
+the job store. N worker processes claim them, each running the async
+pipeline in its own event loop, and send progress back to the web process
+over a multiprocessing queue. A worker that dies has its job re-queued and
+is restarted; the job resumes from its checkpoint. The default of 0 runs
+jobs inside the web process.
+
+The web process keeps LOOKUP_SHARE of every source's request budget for
+/api/lookup, and the workers split the rest between their jobs.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from .job_runner import execute_job
+from .job_store import JobStore
+from .rate_limiter import job_share, scheduler
+
+logger = logging.getLogger("agent_finder.worker")
+
+WORKERS = int(os.environ.get("AGENT_FINDER_WORKERS", "0"))
+LOOKUP_SHARE = 0.1           # of each source's budget, kept by the web process for lookups
+POLL_INTERVAL = 1.0          # seconds between queue checks when idle
+WATCH_INTERVAL = 0.5         # cancel checks and progress flushes while running
+PROGRESS_INTERVAL = 0.1      # min seconds between forwarded progress events
+HEALTH_CHECK_EVERY = 5.0
+STOP_TIMEOUT = 30.0
+
+
+# ── Worker process side ──
+
+class _Forwarder:
+    """Send a job's events to the web process, thinning out progress bursts."""
+
+    def __init__(self, job_id: str, events):
+        self.job_id = job_id
+        self.events = events
+        self.pending: dict | None = None
+        self.sent_at = 0.0
+
+    def __call__(self, event: dict):
+        if event.get("type") == "progress":
+            now = time.monotonic()
+            if now - self.sent_at < PROGRESS_INTERVAL:
+                self.pending = event
+                return
+            self.sent_at = now
+            self.pending = None
+        else:
+            self.flush()
+        self.events.put((self.job_id, event))
+
+    def flush(self):
+        if self.pending:
+            self.events.put((self.job_id, self.pending))
+            self.pending = None
+            self.sent_at = time.monotonic()
+
+
+def _capacity(job_id: str, running: dict[str, int]) -> float:
+    """This job's weighted fraction of the source budgets the workers share."""
+    weights = {jid: job_share(jid, total).weight for jid, total in running.items()}
+    return (1.0 - LOOKUP_SHARE) * weights.get(job_id, 1.0) / (sum(weights.values()) or 1.0)
+
+
+async def _watch(store: JobStore, job_id: str, task: asyncio.Task, send: _Forwarder):
+    """Cancel the job when the web process cancels or deletes it, and keep
+    this process's share of the source budgets in step with the other workers."""
+    while not task.done():
+        await asyncio.sleep(WATCH_INTERVAL)
+        send.flush()
+        job = await asyncio.to_thread(store.get, job_id)
+        if not job or job["status"] == "cancelled":
+            task.cancel()
+            return
+        running = await asyncio.to_thread(store.running_totals)
+        scheduler.set_capacity(_capacity(job_id, running))
+
+
+async def _serve(worker_id: int, store: JobStore, data_dir: Path, events):
+    stopping = False
+    current: asyncio.Task | None = None
+
+    def on_term():
+        nonlocal stopping
+        stopping = True
+        if current:
+            current.cancel()
+
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, on_term)
+    except NotImplementedError:
+        pass  # Windows: terminate() kills the worker; its job is re-queued at next start
+
+    while not stopping:
+        job = await asyncio.to_thread(store.claim, worker_id)
+        if not job:
+            await asyncio.sleep(POLL_INTERVAL)
+            continue
+
+        logger.info("Worker %d running job %s", worker_id, job["job_id"])
+        send = _Forwarder(job["job_id"], events)
+        running = await asyncio.to_thread(store.running_totals)
+        scheduler.set_capacity(_capacity(job["job_id"], running))
+        current = asyncio.create_task(execute_job(
+            job, store, data_dir, send, shutting_down=lambda: stopping,
+        ))
+        watcher = asyncio.create_task(_watch(store, job["job_id"], current, send))
+        try:
+            await current
+        except asyncio.CancelledError:
+            pass
+        watcher.cancel()
+        current = None
+
+
+def worker_main(worker_id: int, db_path: str, data_dir: str, events):
+    logging.basicConfig(level=logging.INFO, format=f"[worker {worker_id}] %(name)s: %(message)s")
+    store = JobStore(Path(db_path))
+    try:
+        asyncio.run(_serve(worker_id, store, Path(data_dir), events))
+    finally:
+        store.close()
+
+
+# ── Web process side ──
+
+class WorkerPool:
+    """Starts the worker processes and relays their events to the event loop."""
+
+    def __init__(
+        self,
+        size: int,
+        store: JobStore,
+        data_dir: Path,
+        on_event: Callable[[str, dict], None],
+    ):
+        self.size = size
+        self.store = store
+        self.data_dir = data_dir
+        self.on_event = on_event
+        self._ctx = multiprocessing.get_context("spawn")
+        self._events = self._ctx.Queue()
+        self._procs: list = []
+        self._stopped = threading.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _spawn(self, worker_id: int):
+        proc = self._ctx.Process(
+            target=worker_main,
+            args=(worker_id, str(self.store.path), str(self.data_dir), self._events),
+            name=f"agent-finder-worker-{worker_id}",
+            daemon=True,
+        )
+        proc.start()
+        return proc
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        # Lookups run here; the workers' capacities leave this share free
+        scheduler.set_capacity(LOOKUP_SHARE)
+        self._procs = [self._spawn(i) for i in range(self.size)]
+        threading.Thread(target=self._pump, name="worker-events", daemon=True).start()
+        logger.info("Started %d job workers", self.size)
+
+    def _pump(self):
+        checked_at = time.monotonic()
+        while not self._stopped.is_set():
+            try:
+                job_id, event = self._events.get(timeout=1.0)
+                self._loop.call_soon_threadsafe(self.on_event, job_id, event)
+            except queue.Empty:
+                pass
+            except (EOFError, OSError):
+                return
+            if time.monotonic() - checked_at >= HEALTH_CHECK_EVERY:
+                checked_at = time.monotonic()
+                self._restart_dead()
+
+    def _restart_dead(self):
+        for i, proc in enumerate(self._procs):
+            if proc.is_alive() or self._stopped.is_set():
+                continue
+            requeued = self.store.requeue(worker=i)
+            logger.warning(
+                "Worker %d exited with code %s; restarting (%d job(s) re-queued)",
+                i, proc.exitcode, requeued,
+            )
+            self._procs[i] = self._spawn(i)
+
+    def stop(self):
+        """SIGTERM every worker (each checkpoints its job) and wait for them."""
+        self._stopped.set()
+        for proc in self._procs:
+            if proc.is_alive():
+                proc.terminate()
+        deadline = time.monotonic() + STOP_TIMEOUT
+        for proc in self._procs:
+            proc.join(max(0.0, deadline - time.monotonic()))
+            if proc.is_alive():
+                proc.kill()
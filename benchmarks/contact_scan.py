@@ -0,0 +1,88 @@
+"""Micro-benchmark: first_contact / scan_contacts against the two-pass helpers.
+
+Runs on the get_text() of real pages, as the scrapers' text fallbacks do:
+
+    python -m benchmarks.contact_scan page.html https://www.example.com/agents/jane-doe --name "Jane Doe"
+
+Arguments are saved HTML files or URLs. Without any, a synthetic page is
+used, which is only useful as a smoke test: real pages put contacts in
+very different places.
+"""
+
+import argparse
+import random
+import timeit
+from pathlib import Path
+
+import httpx
+from bs4 import BeautifulSoup
+
+from agent_finder.searchers.helpers import (
+    extract_emails, extract_phones, first_contact, get_headers, name_in_email, scan_contacts,
+)
+
+WORDS = "home listing agent realtor contact search property bedroom bath price tour school".split()
+
+
+def _synthetic() -> str:
+    rng = random.Random(1)
+    chunks = []
+    for i in range(40_000):
+        chunks.append(rng.choice(WORDS))
+        if i % 900 == 0:
+            chunks.append(f"({rng.randint(200, 999)}) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}")
+        if i % 1500 == 0:
+            chunks.append(rng.choice(["info@kw.com", "logo@2x.png", "jane.doe@kw.com", "office@kw.com"]))
+    return " ".join(chunks)
+
+
+def _page_text(source: str) -> str:
+    if source.startswith(("http://", "https://")):
+        html = httpx.get(source, headers=get_headers(), follow_redirects=True, timeout=30).text
+    else:
+        html = Path(source).read_text(encoding="utf-8", errors="replace")
+    return BeautifulSoup(html, "html.parser").get_text(separator=" ")
+
+
+def _best_ms(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1000
+
+
+def bench(label: str, text: str, name: str, number: int):
+    def two_pass():
+        phones = extract_phones(text)
+        emails = extract_emails(text)
+        preferred = next((e for e in emails if name_in_email(e, name)), "")
+        return (phones[0] if phones else ""), preferred or (emails[0] if emails else "")
+
+    def single_pass():
+        return first_contact(text, prefer=lambda e: name_in_email(e, name))
+
+    def full_scan():
+        return list(scan_contacts(text))
+
+    print(f"{label}: {len(text) // 1024} KB of text")
+    print(f"  results: two-pass {two_pass()}  single-pass {single_pass()}")
+    for fn_label, fn in (
+        ("extract_phones + extract_emails", two_pass),
+        ("first_contact (stops early)", single_pass),
+        ("list(scan_contacts) full pass", full_scan),
+    ):
+        print(f"  {fn_label:34s} {_best_ms(fn, number):8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pages", nargs="*", help="saved HTML files or URLs")
+    parser.add_argument("--name", default="Jane Doe", help="agent name a preferred email must match")
+    parser.add_argument("--number", type=int, default=20, help="calls per timing run")
+    args = parser.parse_args()
+
+    if not args.pages:
+        bench("synthetic page", _synthetic(), args.name, args.number)
+    for source in args.pages:
+        bench(source, _page_text(source), args.name, args.number)
+
+
+if __name__ == "__main__":
+    main()
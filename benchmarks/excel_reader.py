@@ -0,0 +1,87 @@
+"""Benchmark: Excel upload parsing, direct vs. the old temporary-CSV round trip.
+
+Builds a synthetic workbook (or uses one given with --file) and reports
+wall time and tracemalloc peak (from a second run) for each path:
+
+    python -m benchmarks.excel_reader --rows 100000
+
+The baseline is the pre-streaming reader: every row is written to a
+temporary CSV with DictWriter and then parsed again with read_csv.
+"""
+
+import argparse
+import csv
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import openpyxl
+
+from agent_finder.input_handler import iter_excel, read_csv, read_excel
+
+
+def temp_csv_read_excel(file_path: str):
+    """The old read_excel: openpyxl -> temporary CSV -> read_csv."""
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    rows = wb.active.iter_rows(values_only=True)
+    headers = [str(h).strip() if h else "" for h in next(rows)]
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8") as tmp:
+        writer = csv.DictWriter(tmp, fieldnames=headers)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(dict(zip(headers, (str(v).strip() if v is not None else "" for v in row))))
+    wb.close()
+    try:
+        return read_csv(tmp.name)
+    finally:
+        Path(tmp.name).unlink(missing_ok=True)
+
+
+def build_workbook(path: Path, rows: int):
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Listings")
+    ws.append(
+        ["Street Address", "City", "State", "Postal Code", "List Price", "Agent Name", "Broker"]
+        + [f"Col{i}" for i in range(10)]
+    )
+    for i in range(rows):
+        ws.append(
+            [f"{i} Main St", "Austin", "TX", 78701, 350_000 + i, f"Agent {i}" if i % 50 else None,
+             "Keller Williams"]
+            + [i * j for j in range(10)]
+        )
+    wb.save(path)
+
+
+def measure(label: str, fn, path: str):
+    # Timed without tracemalloc, which slows the paths unevenly
+    start = time.perf_counter()
+    fn(path)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {label:32s} {elapsed:7.2f} s   peak {peak / 1e6:7.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--file", help="existing .xlsx to read instead of a synthetic one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if not path:
+            path = str(Path(tmp) / "upload.xlsx")
+            build_workbook(Path(path), args.rows)
+        print(f"{path}: {Path(path).stat().st_size / 1e6:.1f} MB")
+        measure("old read_excel (temp CSV)", temp_csv_read_excel, path)
+        measure("read_excel (list)", read_excel, path)
+        measure("iter_excel (streamed)", lambda p: sum(1 for _ in iter_excel(p)), path)
+
+
+if __name__ == "__main__":
+    main()
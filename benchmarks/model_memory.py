@@ -0,0 +1,125 @@
+"""Benchmark: memory of a large upload's models, slotted vs. the old dataclasses.
+
+Writes a synthetic CSV upload (7 mapped columns plus --extra other
+columns) and measures with tracemalloc what its AgentRows and their
+ContactResults hold:
+
+    python -m benchmarks.model_memory --rows 100000 --extra 40
+
+The baseline rebuilds the old models: plain dataclasses with a
+`__dict__`, and a per-row extra_columns dict parsed with DictReader.
+"""
+
+import argparse
+import csv
+import gc
+import random
+import tempfile
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from agent_finder.input_handler import iter_csv
+from agent_finder.models import ContactResult, ContactStatus
+
+MAPPED = ["Agent Name", "Brokerage", "Address", "City", "State", "Zip", "List Price"]
+
+
+@dataclass
+class OldAgentRow:
+    name: str
+    brokerage: str
+    address: str = ""
+    city: str = ""
+    state: str = ""
+    zip_code: str = ""
+    list_price: str = ""
+    row_index: int = 0
+    extra_columns: dict = field(default_factory=dict)
+
+
+@dataclass
+class OldContactResult:
+    agent: OldAgentRow
+    phone: str = ""
+    email: str = ""
+    source: str = ""
+    status: ContactStatus = ContactStatus.NOT_FOUND
+    error_message: str = ""
+
+
+def old_rows(path: str) -> list[OldAgentRow]:
+    rows = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for i, raw in enumerate(csv.DictReader(f)):
+            values = {k: (v or "").strip() for k, v in raw.items()}
+            rows.append(OldAgentRow(
+                name=values.pop("Agent Name"),
+                brokerage=values.pop("Brokerage"),
+                address=values.pop("Address"),
+                city=values.pop("City"),
+                state=values.pop("State"),
+                zip_code=values.pop("Zip"),
+                list_price=values.pop("List Price"),
+                row_index=i,
+                extra_columns=values,
+            ))
+    return rows
+
+
+def write_upload(path: Path, rows: int, extra: int):
+    rng = random.Random(1)
+    statuses = ["Active", "Pending", "Sold", "Withdrawn"]
+    types = ["Single Family", "Condo", "Townhouse", "Multi-Family"]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(MAPPED + [f"Extra {i}" for i in range(extra)])
+        for i in range(rows):
+            mapped = [f"Agent {i}", "Keller Williams", f"{i} Main St", "Austin", "TX", "78701", str(300_000 + i)]
+            # Half categorical, half unique values, as in a typical MLS export
+            extras = [
+                rng.choice(statuses if j % 4 else types) if j % 2 else str(rng.randint(0, 10**6))
+                for j in range(extra)
+            ]
+            writer.writerow(mapped + extras)
+
+
+def measure(label: str, build):
+    gc.collect()
+    tracemalloc.start()
+    rows, results = build()
+    rows_mb = tracemalloc.get_traced_memory()[0] / 1e6
+    del results
+    gc.collect()
+    results_mb = rows_mb - tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    print(f"  {label:8s} AgentRows {rows_mb - results_mb:7.1f} MB   ContactResults {results_mb:6.1f} MB"
+          f"   total {rows_mb:7.1f} MB")
+    del rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--extra", type=int, default=40, help="unmapped columns per row")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "upload.csv"
+        write_upload(path, args.rows, args.extra)
+        print(f"{args.rows} rows x {len(MAPPED) + args.extra} columns, {path.stat().st_size / 1e6:.1f} MB CSV")
+
+        def old():
+            rows = old_rows(str(path))
+            return rows, [OldContactResult(agent=a, status=ContactStatus.FOUND) for a in rows]
+
+        def new():
+            rows = list(iter_csv(str(path)))
+            return rows, [ContactResult(agent=a, status=ContactStatus.FOUND) for a in rows]
+
+        measure("old", old)
+        measure("slotted", new)
+
+
+if __name__ == "__main__":
+    main()
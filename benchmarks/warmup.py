@@ -0,0 +1,130 @@
+"""Benchmark: first-request and email-phase latency with and without warm-up.
+
+Against real sites (network needed):
+
+    python -m benchmarks.warmup https://www.remax.com https://www.kw.com
+
+Without URLs, a local HTTP server stands in for a site. Its new
+connections cost --connect-ms and its DNS lookups an extra --dns-ms,
+so the effect of each warm-up step can be seen offline. The email
+phase is always a local run: 200 agents over 40 synthetic mail domains
+whose MX lookups take --dns-ms, cold vs. prefetched.
+"""
+
+import argparse
+import asyncio
+import socket
+import statistics
+import time
+
+import httpx
+
+from agent_finder import warmup
+from agent_finder.models import AgentRow
+from agent_finder.searchers import email_guesser
+
+
+def _slow_dns(delay: float):
+    """Add `delay` seconds to every getaddrinfo."""
+    getaddrinfo = socket.getaddrinfo
+
+    def slow_getaddrinfo(*args, **kwargs):
+        time.sleep(delay)
+        return getaddrinfo(*args, **kwargs)
+
+    socket.getaddrinfo = slow_getaddrinfo
+
+
+def _fake_mx(delay: float):
+    """MX lookups of the synthetic mail domains take `delay` and succeed."""
+
+    def resolve_mx(domain: str) -> bool:
+        time.sleep(delay)
+        return True
+
+    email_guesser._resolve_mx = resolve_mx
+
+
+async def _serve(connect_delay: float) -> tuple[asyncio.AbstractServer, str]:
+    async def handle(reader, writer):
+        # Stands in for the TCP and TLS handshakes of a new connection
+        await asyncio.sleep(connect_delay)
+        while True:
+            data = b""
+            while b"\r\n\r\n" not in data:
+                chunk = await reader.read(4096)
+                if not chunk:
+                    writer.close()
+                    return
+                data += chunk
+            body = b"" if data.startswith(b"HEAD") else b"ok"
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n" + body)
+            await writer.drain()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, f"http://localhost:{server.sockets[0].getsockname()[1]}/"
+
+
+async def first_request(url: str, mode: str) -> float:
+    """Seconds for the first GET to `url` after warm-up `mode`."""
+    warmup.dns._entries.clear()
+    async with httpx.AsyncClient(
+        transport=warmup.http_transport(httpx.Limits(keepalive_expiry=30.0)), follow_redirects=True,
+    ) as client:
+        if mode in ("prefetch", "prefetch+connect"):
+            await warmup.prefetch([url], set())
+        if mode == "prefetch+connect":
+            await warmup.connect(client, [url])
+        start = time.perf_counter()
+        await client.get(url)
+        return time.perf_counter() - start
+
+
+async def email_phase() -> tuple[float, float, float]:
+    agents = [
+        AgentRow(name=f"Pat Lee{i}", brokerage=f"Smalltown {chr(97 + i % 20)}{chr(97 + i // 20 % 2)} Homes", row_index=i)
+        for i in range(200)
+    ]
+    email_guesser._mx_cache.clear()
+    start = time.perf_counter()
+    await email_guesser.guess_batch(agents)
+    cold = time.perf_counter() - start
+
+    email_guesser._mx_cache.clear()
+    start = time.perf_counter()
+    await warmup.prefetch([], {d for a in agents for d in email_guesser.domains_for(a.brokerage)})
+    prefetch = time.perf_counter() - start
+    start = time.perf_counter()
+    await email_guesser.guess_batch(agents)
+    return cold, prefetch, time.perf_counter() - start
+
+
+async def main(args):
+    _fake_mx(args.dns_ms / 1000)
+    server = None
+    urls = args.urls
+    if not urls:
+        _slow_dns(args.dns_ms / 1000)
+        server, url = await _serve(args.connect_ms / 1000)
+        urls = [url]
+
+    for url in urls:
+        print(url)
+        for mode in ("cold", "prefetch", "prefetch+connect"):
+            times = [await first_request(url, mode) for _ in range(args.repeat)]
+            print(f"  first request, {mode:17s} median {statistics.median(times) * 1000:7.0f} ms")
+
+    cold, prefetch, warm = await email_phase()
+    print(f"email phase, cold MX:            {cold * 1000:7.0f} ms")
+    print(f"email phase, after MX prefetch:  {warm * 1000:7.0f} ms  (prefetch ran {prefetch * 1000:.0f} ms in the background)")
+    if server:
+        server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("urls", nargs="*", help="site URLs to measure instead of the local server")
+    parser.add_argument("--dns-ms", type=float, default=50.0, help="simulated DNS and MX lookup time")
+    parser.add_argument("--connect-ms", type=float, default=100.0, help="local server's connection setup")
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
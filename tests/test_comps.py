@@ -0,0 +1,72 @@
+"""Comp selection for /api/comps."""
+
+from datetime import date, timedelta
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("homeharvest")
+
+from agent_finder import comps  # noqa: E402
+
+TODAY = date(2026, 6, 1)
+
+
+def _sales(*days_ago: int | None, list_price: float = 300_000) -> pd.DataFrame:
+    return pd.DataFrame({
+        "full_street_line": [f"{i} Main St" for i in range(len(days_ago))],
+        "city": "Austin",
+        "list_price": list_price,
+        "sold_price": list_price * 0.95,
+        "days_on_market": 30,
+        "last_sold_date": [
+            None if d is None else (TODAY - timedelta(days=d)).isoformat() for d in days_ago
+        ],
+    })
+
+
+def test_scrape_asks_for_newest_sales_first(monkeypatch):
+    calls = []
+    monkeypatch.setattr(comps, "scrape_property", lambda **kw: calls.append(kw))
+
+    comps._scrape("78701")
+
+    assert calls[0]["sort_by"] == "sold_date"
+    assert calls[0]["sort_direction"] == "desc"
+    assert calls[0]["limit"] == comps.SCRAPE_LIMIT
+
+
+def test_narrowest_window_with_enough_sales():
+    chosen = comps.select_comps(_sales(10, 20, 200, 30, 300), TODAY)
+
+    assert list(chosen["address"]) == ["0 Main St, Austin", "1 Main St, Austin", "3 Main St, Austin"]
+
+
+def test_capped_at_max_comps_newest_first():
+    chosen = comps.select_comps(_sales(*range(80, 0, -10)), TODAY)
+
+    assert len(chosen) == comps.MAX_COMPS
+    assert chosen["age_days"].is_monotonic_increasing
+
+
+def test_widest_window_when_none_has_enough():
+    chosen = comps.select_comps(_sales(10, 200), TODAY)
+
+    assert len(chosen) == 2
+
+
+def test_undated_sales_only_count_for_twelve_months():
+    chosen = comps.select_comps(_sales(10, None, None, 20), TODAY)
+
+    # 2 dated sales are short of MIN_COMPS in every narrow window
+    assert len(chosen) == 4
+    assert chosen["age_days"].isna().sum() == 2
+
+
+def test_sales_without_list_price_are_dropped():
+    df = pd.concat([_sales(10, 20, 30), _sales(5, list_price=0)], ignore_index=True)
+
+    response = comps._response(comps.select_comps(df, TODAY))
+
+    assert len(response["comps"]) == 3
+    assert response["avgPctUnderList"] == 5.0
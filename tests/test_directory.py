@@ -0,0 +1,37 @@
+"""Local agent directory: fuzzy lookup and saves shared between jobs."""
+
+from agent_finder import directory
+from agent_finder.directory import AgentDirectory
+from agent_finder.models import AgentRow, ContactResult, ContactStatus
+
+
+def _found(name: str, phone: str, brokerage: str = "RE/MAX", state: str = "TX") -> ContactResult:
+    agent = AgentRow(name=name, brokerage=brokerage, state=state)
+    return ContactResult(agent=agent, phone=phone, status=ContactStatus.FOUND)
+
+
+def test_lookup_tolerates_a_misspelled_half(tmp_path):
+    d = AgentDirectory(tmp_path / "directory.json")
+    d.add(_found("Jonathan Richardson", "(512) 555-0101"))
+    d.add(_found("Jonathan Robertson", "(512) 555-0102"))
+
+    first_typo, _ = d.lookup(AgentRow(name="Jonathon Richardson", brokerage="RE/MAX Austin", state="TX"))
+    last_typo, _ = d.lookup(AgentRow(name="Jonathan Richardsen", brokerage="Remax", state="TX"))
+
+    assert first_typo.phone == last_typo.phone == "(512) 555-0101"
+
+
+def test_concurrent_saves_keep_every_record(tmp_path, monkeypatch):
+    path = tmp_path / "directory.json"
+    first, second = AgentDirectory(path), AgentDirectory(path)
+    first.add(_found("Amy Alpha", "(512) 555-0201"))
+    second.add(_found("Bob Beta", "(512) 555-0202"))
+
+    first.save()
+    monkeypatch.setattr(directory, "FOLD_BYTES", 1)
+    second.save()   # folds the journal into the snapshot
+
+    assert not directory.journal.size(path)
+    reloaded = AgentDirectory(path)
+    assert len(reloaded) == 2
+    assert reloaded.lookup(AgentRow(name="Amy Alpha", brokerage="RE/MAX", state="TX"))[0]
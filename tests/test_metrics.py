@@ -0,0 +1,33 @@
+"""Adaptive per-host timeouts."""
+
+from agent_finder.metrics import TIMEOUT_MIN_SAMPLES, AdaptiveTimeouts
+
+
+def test_default_until_enough_samples():
+    t = AdaptiveTimeouts()
+    for _ in range(TIMEOUT_MIN_SAMPLES - 1):
+        t.observe("kw.com", "agent", 0.4)
+
+    assert t.timeout("kw.com", "agent", 15.0) == 15.0
+
+
+def test_timeout_follows_observed_latency():
+    t = AdaptiveTimeouts()
+    for _ in range(TIMEOUT_MIN_SAMPLES):
+        t.observe("kw.com", "agent", 0.4)
+
+    assert t.timeout("kw.com", "agent", 15.0) < 15.0
+    assert t.report()["kw.com agent"]["p50_ms"] == 400
+
+
+def test_report_lists_host_with_only_timeouts():
+    t = AdaptiveTimeouts()
+    t.observe("dead.example", "agent", 15.0, timed_out=True)
+    t.observe("dead.example", "agent", 15.0, timed_out=True)
+
+    assert t.report() == {
+        "dead.example agent": {
+            "samples": 0, "p50_ms": None, "p99_ms": None, "timeout_s": None, "timed_out": 2,
+        },
+    }
+    assert t.timeout("dead.example", "agent", 15.0) == 15.0
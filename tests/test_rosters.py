@@ -0,0 +1,62 @@
+"""Office roster mode of the brokerage scrapers."""
+
+import asyncio
+
+import httpx
+
+from agent_finder.brokerages.remax import ReMaxBrokerageScraper
+from agent_finder.models import AgentRow
+from agent_finder.strategy_stats import MIN_TRIALS, StrategyStats
+
+AGENTS = [
+    ("Ann Archer", "RE/MAX Capital City"),
+    ("Ben Baker", "RE/MAX Capital City"),
+    ("Cal Carter", "RE/MAX Hill Country"),
+    ("Dee Dalton", "RE/MAX Hill Country"),
+]
+
+ROSTER = "".join(
+    f'<div class="card"><h3>{name}</h3><a href="tel:512555010{i}">Call</a></div>'
+    for i, (name, _) in enumerate(AGENTS)
+)
+
+
+def _search(stats=None):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path == "/real-estate-agents/austin-tx":
+            return httpx.Response(200, text=ROSTER)
+        return httpx.Response(404)
+
+    agents = [
+        AgentRow(name=name, brokerage=brokerage, city="Austin", state="TX", row_index=i)
+        for i, (name, brokerage) in enumerate(AGENTS)
+    ]
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            scraper = ReMaxBrokerageScraper(client, stats=stats)
+            scraper.rate_limit = 0
+            return await scraper.search_batch(agents)
+
+    return asyncio.run(run()), requests
+
+
+def test_offices_sharing_a_city_roster_fetch_it_once():
+    results, requests = _search()
+
+    assert requests == ["/real-estate-agents/austin-tx"]
+    assert [r.phone for r in results] == [f"(512) 555-010{i}" for i in range(4)]
+
+
+def test_roster_mode_dropped_where_it_never_hits(tmp_path, monkeypatch):
+    stats = StrategyStats(tmp_path / "strategy_stats.db")
+    for _ in range(MIN_TRIALS):
+        stats.record("remax.com", "roster", hit=False)
+    monkeypatch.setattr("random.random", lambda: 0.5)
+
+    _, requests = _search(stats)
+
+    assert "/real-estate-agents/austin-tx" not in requests
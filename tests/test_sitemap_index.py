@@ -0,0 +1,103 @@
+"""Sitemap indexing against the fixture site in fixtures/sitemaps."""
+
+import asyncio
+import gzip
+from pathlib import Path
+
+import httpx
+
+from agent_finder.sitemap_index import SitemapIndex, index_domain, iter_sitemap_locs
+
+FIXTURES = Path(__file__).parent / "fixtures" / "sitemaps"
+DOMAIN = "example-realty.com"
+
+
+def _site(failing: set[str] = frozenset(), requested: list | None = None) -> httpx.MockTransport:
+    """The fixture site; paths in `failing` answer 503."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if requested is not None:
+            requested.append(request.url.path)
+        name = request.url.path.rsplit("/", 1)[-1]
+        if request.url.path in failing or "*" in failing:
+            return httpx.Response(503)
+        path = FIXTURES / name.removesuffix(".gz")
+        if not path.exists():
+            return httpx.Response(404)
+        body = gzip.compress(path.read_bytes()) if name.endswith(".gz") else path.read_bytes()
+        # Streamed, as the indexer reads it with aiter_raw
+        return httpx.Response(200, stream=httpx.ByteStream(body))
+
+    return httpx.MockTransport(handler)
+
+
+def _index(
+    tmp_path: Path,
+    failing: set[str] = frozenset(),
+    index: SitemapIndex | None = None,
+    requested: list | None = None,
+):
+    index = index or SitemapIndex(tmp_path / "index.json.gz")
+
+    async def run():
+        async with httpx.AsyncClient(transport=_site(failing, requested)) as client:
+            return await index_domain(client, index, DOMAIN)
+
+    return asyncio.run(run()), index
+
+
+def test_parses_plain_and_gzipped_sitemaps_in_blocks():
+    data = (FIXTURES / "agents-1.xml").read_bytes()
+    blocks = [gzip.compress(data)[i:i + 16] for i in range(0, len(gzip.compress(data)), 16)]
+    plain = list(iter_sitemap_locs([data]))
+    assert list(iter_sitemap_locs(blocks)) == plain
+    assert ("url", "https://www.example-realty.com/agents/jane-doe") in plain
+
+
+def test_index_domain_follows_agent_sitemaps(tmp_path):
+    profiles, index = _index(tmp_path)
+
+    assert profiles == 4
+    assert index.lookup(DOMAIN, "Jane Doe") == "https://www.example-realty.com/agents/jane-doe"
+    # Sitemaps on the bare host keep their host
+    assert index.lookup(DOMAIN, "Maria Garcia") == "https://example-realty.com/agents/maria-garcia"
+    # Same-name agents from both sitemaps are kept
+    assert len(index) == 3
+
+
+def test_only_agent_sitemaps_are_read(tmp_path):
+    requested = []
+
+    _index(tmp_path, requested=requested)
+
+    assert "/sitemaps/agents-1.xml" in requested
+    assert "/sitemaps/listings-1.xml" not in requested
+
+
+def test_outage_keeps_existing_index(tmp_path):
+    _, index = _index(tmp_path)
+
+    profiles, index = _index(tmp_path, failing={"*"}, index=index)
+
+    assert profiles == 0
+    assert index.lookup(DOMAIN, "Jane Doe") is not None
+    assert len(index) == 3
+
+
+def test_failed_child_sitemap_keeps_its_agents(tmp_path):
+    _, index = _index(tmp_path)
+
+    profiles, index = _index(tmp_path, failing={"/sitemaps/agents-2.xml.gz"}, index=index)
+
+    assert profiles == 2
+    assert index.lookup(DOMAIN, "Maria Garcia") is not None
+
+
+def test_full_refresh_drops_removed_agents(tmp_path):
+    index = SitemapIndex(tmp_path / "index.json.gz")
+    index.add(DOMAIN, "https://www.example-realty.com/agents/gone-agent")
+
+    _, index = _index(tmp_path, index=index)
+
+    assert index.lookup(DOMAIN, "Gone Agent") is None
+    assert index.lookup(DOMAIN, "Jane Doe") is not None
@@ -0,0 +1,31 @@
+"""Brokerage URL strategy stats shared between jobs."""
+
+from agent_finder.strategy_stats import MIN_TRIALS, StrategyStats
+
+
+def test_concurrent_jobs_add_up(tmp_path):
+    path = tmp_path / "strategy_stats.db"
+    first, second = StrategyStats(path), StrategyStats(path)
+    for _ in range(3):
+        first.record("kw.com", "slug", hit=True)
+    for _ in range(2):
+        second.record("kw.com", "slug", hit=False)
+
+    first.save()
+    second.save()
+    first.save()    # nothing new: must not add its counts twice
+
+    (row,) = StrategyStats(path).report()["kw.com"]
+    assert (row["attempts"], row["hits"]) == (5, 3)
+
+
+def test_never_hitting_strategy_is_dropped(tmp_path, monkeypatch):
+    stats = StrategyStats(tmp_path / "strategy_stats.db")
+    for _ in range(MIN_TRIALS):
+        stats.record("kw.com", "search", hit=False)
+    stats.record("kw.com", "slug", hit=True)
+
+    monkeypatch.setattr("random.random", lambda: 0.5)
+    assert stats.order("kw.com", ["search", "slug"]) == ["slug"]
+    monkeypatch.setattr("random.random", lambda: 0.0)
+    assert stats.order("kw.com", ["search", "slug"]) == ["slug", "search"]